@@ -0,0 +1,170 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple, Union
+
+EVIL_ROLES = ["evil", "assassin", "morgana", "mordred", "oberon"]
+
+
+class Agent(ABC):
+    """Per-seat decision maker. Seats without an agent are played by the LLM inside AvalonGame."""
+
+    @abstractmethod
+    def discuss(self, game, player, quest_num: int, messages: list) -> str:
+        ...
+
+    @abstractmethod
+    def propose_team(self, game, player, team_size: int) -> Tuple[List[str], str]:
+        ...
+
+    @abstractmethod
+    def vote(self, game, player, team_members: List[str]) -> Tuple[str, str]:
+        ...
+
+    @abstractmethod
+    def mission_action(self, game, player, team_members: List[str]) -> str:
+        ...
+
+    @abstractmethod
+    def evil_discussion(self, game, player) -> str:
+        ...
+
+    @abstractmethod
+    def assassin_guess(self, game, player) -> Tuple[str, str]:
+        ...
+
+
+class HeuristicAgent(Agent):
+    """Fast rule-based player: trusts mission results, uses its role knowledge, never calls the API."""
+
+    def __init__(self, suspicion_threshold: float = 0.5, evil_blend_prob: float = 0.3):
+        self.suspicion_threshold = suspicion_threshold
+        self.evil_blend_prob = evil_blend_prob
+
+    def known_evil(self, game, player) -> List[str]:
+        if player.role == "merlin":
+            return list(player.special_knowledge)
+        if player.role in EVIL_ROLES and player.role != "oberon":
+            return [player.name] + list(player.special_knowledge)
+        if player.role == "oberon":
+            return [player.name]
+        return []
+
+    def suspicion(self, game, player) -> Dict[str, float]:
+        """Share of FAIL cards attributable to each player from public mission results."""
+        scores = {p.name: 0.0 for p in game.players}
+        for mission in game.missions:
+            if not mission.fail_count:
+                continue
+            team = mission.proposals[mission.final_team_index].team_members
+            others = [name for name in team if name != player.name]
+            if not others:
+                continue
+            # Good players know their own card was a success, so blame falls on the rest
+            share = mission.fail_count / (len(others) if player.role not in EVIL_ROLES else len(team))
+            for name in others:
+                scores[name] = scores.get(name, 0.0) + share
+        for name in self.known_evil(game, player):
+            if name != player.name:
+                scores[name] = scores.get(name, 0.0) + 10.0
+        scores[player.name] = -1.0
+        return scores
+
+    def _rng(self, game):
+        return getattr(game, "rng", random)
+
+    def discuss(self, game, player, quest_num: int, messages: list) -> str:
+        scores = self.suspicion(game, player)
+        others = sorted((n for n in scores if n != player.name), key=lambda n: scores[n])
+
+        if player.role in EVIL_ROLES:
+            # Deflect onto a player who is not a known teammate
+            teammates = self.known_evil(game, player)
+            target = next((n for n in reversed(others) if n not in teammates), others[-1])
+            return f"I'm not fully comfortable with {target} yet; I'd rather see a team built around people with clean records."
+
+        if not game.missions:
+            return f"No information yet, so I'm happy to start with a small team and see how {others[0]} and {others[1]} vote."
+
+        trusted, suspect = others[0], others[-1]
+        if scores[suspect] > self.suspicion_threshold:
+            return f"{suspect} has been on failed missions, so I'd keep them off; {trusted} looks safest to me."
+        return f"Nothing conclusive so far. I'd back a team with {trusted} on it."
+
+    def propose_team(self, game, player, team_size: int) -> Tuple[List[str], str]:
+        scores = self.suspicion(game, player)
+        teammates = self.known_evil(game, player)
+
+        if player.role in EVIL_ROLES:
+            # Put exactly one evil player (ourselves) on the team and fill with the most trusted others
+            candidates = sorted((n for n in scores if n not in teammates), key=lambda n: scores[n])
+            team = [player.name] + candidates[:team_size - 1]
+            return team, "These players have the cleanest records so far."
+
+        ranked = sorted(scores, key=lambda n: scores[n])
+        team = ranked[:team_size]
+        return team, "I picked myself and the players with the fewest failed missions."
+
+    def vote(self, game, player, team_members: List[str]) -> Tuple[str, str]:
+        scores = self.suspicion(game, player)
+        teammates = self.known_evil(game, player)
+
+        if player.role in EVIL_ROLES and player.role != "oberon":
+            if any(name in teammates for name in team_members):
+                return "approve", "This team looks reasonable to me."
+            if self._rng(game).random() < self.evil_blend_prob:
+                return "approve", "I can live with this team."
+            return "reject", "I'm not convinced by this lineup."
+
+        worst = max(scores.get(name, 0.0) for name in team_members)
+        if worst > self.suspicion_threshold:
+            return "reject", "Someone on this team has been on a failed mission."
+        return "approve", "No red flags on this team."
+
+    def mission_action(self, game, player, team_members: List[str]) -> str:
+        if player.is_good:
+            return "success"
+        # Avoid double fails when the team holds several evil players who know each other
+        teammates = [n for n in team_members if n in self.known_evil(game, player)]
+        if teammates and sorted(teammates)[0] != player.name:
+            return "success"
+        return "fail"
+
+    def assassin_guess(self, game, player) -> Tuple[str, str]:
+        """Guess the good player whose votes best tracked the hidden truth."""
+        evil_names = {p.name for p in game.players if not p.is_good}
+        good_names = [p.name for p in game.players if p.is_good]
+        accuracy = {name: 0 for name in good_names}
+
+        for mission in game.missions:
+            for proposal in mission.proposals:
+                dirty = any(name in evil_names for name in proposal.team_members)
+                for vote in proposal.votes:
+                    if vote.player in accuracy and (vote.vote == "reject") == dirty:
+                        accuracy[vote.player] += 1
+
+        guess = max(good_names, key=lambda n: accuracy[n])
+        return guess, f"{guess}'s votes avoided our teams more consistently than anyone else's."
+
+    def evil_discussion(self, game, player) -> str:
+        guess, reasoning = self.assassin_guess(game, player)
+        return f"My read is {guess}. {reasoning}"
+
+
+# Agent kinds a seat can be given; a plain list of names means "heuristic" for each
+AGENT_KINDS = {"heuristic": HeuristicAgent}
+
+
+def build_agents(players: Union[List[str], Dict[str, str]], seat_names: List[str]) -> Dict[str, Agent]:
+    """One agent per named seat. `players` is a list of seat names or a {name: kind} dict.
+
+    Raises ValueError for a name that is not a seat in this game or an unknown kind, rather than
+    quietly leaving the LLM in that seat.
+    """
+    kinds = dict(players) if isinstance(players, dict) else {name: "heuristic" for name in players}
+    unknown = [name for name in kinds if name not in seat_names]
+    if unknown:
+        raise ValueError(f"Unknown player(s) {', '.join(unknown)} for heuristic seats (players: {', '.join(seat_names)})")
+    bad_kinds = sorted({kind for kind in kinds.values() if kind not in AGENT_KINDS})
+    if bad_kinds:
+        raise ValueError(f"Unknown agent kind(s) {', '.join(bad_kinds)} (choose from {', '.join(AGENT_KINDS)})")
+    return {name: AGENT_KINDS[kind]() for name, kind in kinds.items()}
@@ -0,0 +1,294 @@
+import os
+import re
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from dataset_loader import find_game_files, find_memory_files, load_game
+
+# Trait words counted in player_observations (role-conditional reputation)
+TRAITS = [
+    "subtle", "straightforward", "aggressive", "cautious", "analytical", "consistent", "inconsistent",
+    "quiet", "vocal", "logical", "reliable", "trustworthy", "suspicious", "deceptive", "manipulative",
+    "defensive", "passive", "careful", "transparent", "honest", "strategic", "calm", "evasive", "assertive"
+]
+# Reputation = positive minus negative trait mentions in earlier games' observations
+POSITIVE_TRAITS = {"straightforward", "consistent", "logical", "reliable", "trustworthy", "transparent", "honest", "calm", "analytical", "careful"}
+NEGATIVE_TRAITS = {"inconsistent", "suspicious", "deceptive", "manipulative", "defensive", "evasive"}
+
+TRAIT_PATTERNS = [re.compile(rf"\b{trait}\b", re.IGNORECASE) for trait in TRAITS]
+TRAIT_SIGN = np.array([1 if t in POSITIVE_TRAITS else -1 if t in NEGATIVE_TRAITS else 0 for t in TRAITS])
+
+# Dataset folder each README headline was measured on; the default run restricts the metric to it
+README_SUBSETS = {
+    "team_pick_by_reputation": "1_cross_game_learning_50g",
+    "assassination_by_reasoning": "4_reasoning_comparison",
+}
+
+
+def tournament_of(path: str) -> str:
+    """Folder a game or memory file belongs to; individual_games/ files belong to the tournament above."""
+    folder = os.path.dirname(os.path.abspath(path))
+    if os.path.basename(folder) == "individual_games":
+        folder = os.path.dirname(folder)
+    return folder
+
+
+def game_number_of(path: str) -> Optional[int]:
+    match = re.search(r"game_(\d+)\.json$", path)
+    return int(match.group(1)) if match else None
+
+
+def trait_vector(text: str) -> List[int]:
+    return [1 if pattern.search(text) else 0 for pattern in TRAIT_PATTERNS]
+
+
+def observation_rows(tournament: str, reflections: List[dict]) -> List[list]:
+    """[tournament, game_number, reflector, subject, traits...] per observation."""
+    rows = []
+    for reflection in reflections:
+        for subject, text in (reflection.get("player_observations") or {}).items():
+            rows.append([tournament, reflection["game_number"], reflection["player_name"], subject] + trait_vector(text or ""))
+    return rows
+
+
+def extract_game(path: str) -> dict:
+    """Runs in a worker process: reduce one game file to the flat rows the metrics need."""
+    game = load_game(path)
+    tournament = tournament_of(path)
+    game_number = game_number_of(path)
+    players = {p["name"]: p for p in game["players"]}
+
+    picks = []
+    for mission in game["missions"]:
+        for proposal in mission["proposals"]:
+            team = set(proposal["team_members"])
+            for name in players:
+                if name != proposal["leader"]:
+                    picks.append([name, 1 if name in team else 0])
+
+    assassin = game.get("assassin_phase")
+    config = game.get("config") or {}
+    return {
+        "path": path,
+        "tournament": tournament,
+        "game_number": game_number,
+        "reasoning_effort": config.get("reasoning_effort"),
+        "assassin_correct": None if not assassin else bool(assassin["correct"]),
+        "teams": {name: p["is_good"] for name, p in players.items()},
+        "picks": picks,
+        "observations": observation_rows(tournament, game.get("post_game_reflections") or [])
+    }
+
+
+def extract_memories(path: str) -> dict:
+    data = load_game(path)
+    reflections = [r for memory in data["player_memories"].values() for r in memory["reflections"]]
+    return {"tournament": tournament_of(path), "observations": observation_rows(tournament_of(path), reflections)}
+
+
+def team_pick_by_reputation(games: List[dict], observations: List[list]) -> dict:
+    """Pick rate (teams proposed by other leaders) of players whose reputation going into the game was
+    above vs below that game's median."""
+    if not observations:
+        return {"high_rate": None, "low_rate": None, "lift": None, "high_slots": 0, "low_slots": 0}
+
+    tournaments = np.array([row[0] for row in observations])
+    numbers = np.array([row[1] for row in observations])
+    subjects = np.array([row[3] for row in observations])
+    scores = np.array([row[4:] for row in observations]) @ TRAIT_SIGN
+
+    high_picked = high_slots = low_picked = low_slots = 0
+    for game in games:
+        if game["game_number"] is None or not game["picks"]:
+            continue
+        earlier = (tournaments == game["tournament"]) & (numbers < game["game_number"])
+        if not earlier.any():
+            continue
+        names = list(game["teams"])
+        reputation = np.array([scores[earlier & (subjects == name)].sum() for name in names])
+        median = np.median(reputation)
+        level = dict(zip(names, np.sign(reputation - median)))
+
+        picks = np.array([[level[name], picked] for name, picked in game["picks"]])
+        high = picks[:, 0] > 0
+        low = picks[:, 0] < 0
+        high_picked += int(picks[high, 1].sum())
+        high_slots += int(high.sum())
+        low_picked += int(picks[low, 1].sum())
+        low_slots += int(low.sum())
+
+    high_rate = high_picked / high_slots if high_slots else None
+    low_rate = low_picked / low_slots if low_slots else None
+    return {
+        "high_rate": high_rate,
+        "low_rate": low_rate,
+        "lift": high_rate / low_rate - 1 if high_rate is not None and low_rate else None,
+        "high_slots": high_slots,
+        "low_slots": low_slots
+    }
+
+
+def assassination_by_reasoning(games: List[dict]) -> Dict[str, dict]:
+    rows = [(g["reasoning_effort"] or "unknown", g["assassin_correct"]) for g in games if g["assassin_correct"] is not None]
+    if not rows:
+        return {}
+    efforts = np.array([effort for effort, _ in rows])
+    correct = np.array([c for _, c in rows], dtype=float)
+    result = {}
+    for effort in np.unique(efforts):
+        mask = efforts == effort
+        result[str(effort)] = {
+            "correct": int(correct[mask].sum()),
+            "total": int(mask.sum()),
+            "accuracy": float(correct[mask].mean())
+        }
+    return result
+
+
+def role_conditional_mentions(games: List[dict], observations: List[list]) -> dict:
+    """Trait mentions per observed player, split by the team that player was on in the reflected game."""
+    teams = {(g["tournament"], g["game_number"]): g["teams"] for g in games}
+    rows = [row for row in observations if row[3] in teams.get((row[0], row[1]), {})]
+    if not rows:
+        return {"by_player": {}, "trait_totals": {}}
+
+    subjects = np.array([row[3] for row in rows])
+    is_good = np.array([teams[(row[0], row[1])][row[3]] for row in rows])
+    traits = np.array([row[4:] for row in rows])
+
+    by_player = {}
+    for subject in np.unique(subjects):
+        mask = subjects == subject
+        good_counts = traits[mask & is_good].sum(axis=0)
+        evil_counts = traits[mask & ~is_good].sum(axis=0)
+        by_player[str(subject)] = {
+            TRAITS[i]: {"good": int(good_counts[i]), "evil": int(evil_counts[i])}
+            for i in np.argsort(-(good_counts + evil_counts)) if good_counts[i] + evil_counts[i] > 0
+        }
+    totals = traits.sum(axis=0)
+    return {
+        "by_player": by_player,
+        "trait_totals": {TRAITS[i]: int(totals[i]) for i in np.argsort(-totals) if totals[i] > 0}
+    }
+
+
+def in_subset(tournament: str, subset: str) -> bool:
+    return subset in tournament.split(os.sep)
+
+
+def analyze(paths: List[str], workers: Optional[int] = None, readme_subsets: bool = False) -> dict:
+    """All metrics over every file under `paths`, or with `readme_subsets` each headline metric over
+    only the dataset folder the README measured it on (README_SUBSETS)."""
+    game_files = list(find_game_files(paths))
+    memory_files = list(find_memory_files(paths))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        games = list(pool.map(extract_game, game_files, chunksize=8))
+        memories = list(pool.map(extract_memories, memory_files))
+
+    # Reflections live in tournament game files; player_memories.json fills in any that are missing
+    observations = [row for g in games for row in g["observations"]]
+    covered = {(row[0], row[1]) for row in observations}
+    for memory in memories:
+        observations += [row for row in memory["observations"] if (row[0], row[1]) not in covered]
+
+    pick_games, pick_observations, assassin_games = games, observations, games
+    if readme_subsets:
+        subset = README_SUBSETS["team_pick_by_reputation"]
+        pick_games = [g for g in games if in_subset(g["tournament"], subset)]
+        pick_observations = [row for row in observations if in_subset(row[0], subset)]
+        assassin_games = [g for g in games if in_subset(g["tournament"], README_SUBSETS["assassination_by_reasoning"])]
+
+    return {
+        "inputs": {
+            "game_files": len(game_files),
+            "memory_files": len(memory_files),
+            "observations": len(observations),
+            "tournaments": len({g["tournament"] for g in games})
+        },
+        "subsets": README_SUBSETS if readme_subsets else None,
+        "team_pick_by_reputation": team_pick_by_reputation(pick_games, pick_observations),
+        "assassination_by_reasoning": assassination_by_reasoning(assassin_games),
+        "role_conditional_mentions": role_conditional_mentions(games, observations)
+    }
+
+
+def main():
+    """
+    python analytics.py [paths...] [--output report.json] [--workers N] [--pooled]
+
+    Recomputes the README's findings over any game/memory files: team-pick rate by
+    reputation, assassination accuracy by reasoning effort, and role-conditional trait
+    mentions in player observations. Without paths it reads dataset/ and computes each
+    headline on the folder the README used (README_SUBSETS); --pooled uses every game.
+    Explicit paths are always pooled.
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    paths = []
+    output_file = None
+    workers = None
+    pooled = "--pooled" in args
+    args = [a for a in args if a != "--pooled"]
+    i = 0
+    while i < len(args):
+        if args[i] == "--output" and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 2
+        elif args[i] == "--workers" and i + 1 < len(args):
+            workers = int(args[i + 1])
+            i += 2
+        else:
+            paths.append(args[i])
+            i += 1
+    readme_subsets = not paths and not pooled
+    if not paths:
+        paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset")]
+
+    start_time = time.time()
+    report = analyze(paths, workers, readme_subsets)
+    elapsed = time.time() - start_time
+
+    inputs = report["inputs"]
+    print(f"Analyzed {inputs['game_files']} games, {inputs['observations']} observations "
+          f"from {inputs['tournaments']} folders in {elapsed:.2f}s\n")
+    if report["subsets"]:
+        print("Headlines on the README's subsets (--pooled for all games): "
+              + ", ".join(f"{metric} from {subset}" for metric, subset in report["subsets"].items()) + "\n")
+
+    picks = report["team_pick_by_reputation"]
+    if picks["lift"] is not None:
+        print("TEAM PICKS BY REPUTATION:")
+        print(f"  High reputation: {picks['high_rate']:.1%} of {picks['high_slots']} slots")
+        print(f"  Low reputation:  {picks['low_rate']:.1%} of {picks['low_slots']} slots")
+        print(f"  Lift: {picks['lift']:+.0%}\n")
+
+    if report["assassination_by_reasoning"]:
+        print("ASSASSINATION ACCURACY BY REASONING EFFORT:")
+        for effort, stats in report["assassination_by_reasoning"].items():
+            print(f"  {effort}: {stats['correct']}/{stats['total']} ({stats['accuracy']:.0%})")
+        print()
+
+    mentions = report["role_conditional_mentions"]
+    if mentions["by_player"]:
+        print("MOST MENTIONED TRAITS (times when good / when evil):")
+        for player, traits in sorted(mentions["by_player"].items()):
+            top = list(traits.items())[:3]
+            print(f"  {player}: " + ", ".join(f"{t} {c['good']}/{c['evil']}" for t, c in top))
+
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📁 Report saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import time
+from math import comb
+from itertools import combinations
+from functools import lru_cache
+from typing import Dict, List, Optional
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from rules import ROLE_CONFIGS
+from schema import BeliefSnapshot
+from dataset_loader import find_game_files, load_game
+
+EVIL_ROLES = ["evil", "assassin", "morgana", "mordred", "oberon"]
+
+
+@dataclass
+class BeliefModel:
+    """Behaviour assumed by the ideal observer. Good players can never play FAIL."""
+    evil_fail_prob: float = 0.8
+    evil_approve_dirty: float = 0.85
+    evil_approve_clean: float = 0.35
+    merlin_approve_clean: float = 0.8
+    merlin_approve_dirty: float = 0.2
+    good_approve: float = 0.6
+
+
+@lru_cache(maxsize=None)
+def enumerate_assignments(num_players: int) -> tuple:
+    """All hidden states an observer can distinguish for a ROLE_CONFIGS entry.
+
+    A state is (evil set, Merlin, Mordred). Mordred only matters because Merlin
+    cannot see them; the other good/evil roles do not change mission or vote
+    likelihoods, so they are not enumerated separately. 10 players -> 5040 rows.
+
+    Returns (evil, merlin, hidden) where evil and hidden are bool arrays of shape
+    (assignments, players) and merlin is an int array of seat indices.
+    """
+    roles = ROLE_CONFIGS[num_players]["roles"]
+    num_evil = sum(1 for r in roles if r in EVIL_ROLES)
+    has_mordred = "mordred" in roles
+
+    rows = []
+    for evil_seats in combinations(range(num_players), num_evil):
+        good_seats = [i for i in range(num_players) if i not in evil_seats]
+        mordred_options = evil_seats if has_mordred else (-1,)
+        for merlin_seat in good_seats:
+            for mordred_seat in mordred_options:
+                rows.append((evil_seats, merlin_seat, mordred_seat))
+
+    evil = np.zeros((len(rows), num_players), dtype=bool)
+    hidden = np.zeros((len(rows), num_players), dtype=bool)
+    merlin = np.empty(len(rows), dtype=np.int64)
+    for idx, (evil_seats, merlin_seat, mordred_seat) in enumerate(rows):
+        evil[idx, list(evil_seats)] = True
+        merlin[idx] = merlin_seat
+        if mordred_seat >= 0:
+            hidden[idx, mordred_seat] = True
+
+    for arr in (evil, hidden, merlin):
+        arr.setflags(write=False)
+    return evil, merlin, hidden
+
+
+class BeliefTracker:
+    """Posterior over role assignments given only public information (votes and mission results)."""
+
+    def __init__(self, player_names: List[str], model: BeliefModel = None):
+        self.player_names = list(player_names)
+        self.num_players = len(self.player_names)
+        self.model = model or BeliefModel()
+        self.seat = {name: i for i, name in enumerate(self.player_names)}
+        self.evil, self.merlin, self.hidden = enumerate_assignments(self.num_players)
+        self.is_merlin = self.merlin[:, None] == np.arange(self.num_players)[None, :]
+        self.log_posterior = np.full(len(self.merlin), -np.log(len(self.merlin)))
+
+    def _team_mask(self, team_members: List[str]) -> np.ndarray:
+        mask = np.zeros(self.num_players, dtype=bool)
+        for name in team_members:
+            if name in self.seat:
+                mask[self.seat[name]] = True
+        return mask
+
+    def _apply(self, log_likelihood: np.ndarray):
+        log_posterior = self.log_posterior + log_likelihood
+        peak = log_posterior.max()
+        if not np.isfinite(peak):
+            # Observation inconsistent with every assignment (e.g. malformed log); keep the prior
+            return
+        log_posterior -= peak + np.log(np.exp(log_posterior - peak).sum())
+        self.log_posterior = log_posterior
+
+    def update_votes(self, team_members: List[str], votes: Dict[str, str]):
+        team = self._team_mask(team_members)
+        dirty = (self.evil & team).any(axis=1)
+        visible_dirty = (self.evil & ~self.hidden & team).any(axis=1)
+
+        m = self.model
+        p_approve = np.where(
+            self.evil,
+            np.where(dirty, m.evil_approve_dirty, m.evil_approve_clean)[:, None],
+            m.good_approve
+        )
+        merlin_p = np.where(visible_dirty, m.merlin_approve_dirty, m.merlin_approve_clean)
+        p_approve = np.where(self.is_merlin, merlin_p[:, None], p_approve)
+
+        voted = np.zeros(self.num_players, dtype=bool)
+        approved = np.zeros(self.num_players, dtype=bool)
+        for name, vote in votes.items():
+            if name in self.seat:
+                voted[self.seat[name]] = True
+                approved[self.seat[name]] = vote == "approve"
+
+        p_observed = np.where(approved, p_approve, 1.0 - p_approve)
+        self._apply(np.log(p_observed[:, voted]).sum(axis=1))
+
+    def update_mission(self, team_members: List[str], fail_count: int):
+        team = self._team_mask(team_members)
+        evil_on_team = (self.evil & team).sum(axis=1)
+        p = self.model.evil_fail_prob
+
+        # Binomial(evil_on_team, fail_count); impossible when more fails than evil members
+        log_choose = np.array([
+            np.log(comb(n, fail_count)) if n >= fail_count else -np.inf
+            for n in range(self.num_players + 1)
+        ])
+        log_likelihood = log_choose[evil_on_team] + fail_count * np.log(p) + (evil_on_team - fail_count) * np.log1p(-p)
+        self._apply(log_likelihood)
+
+    def evil_probabilities(self) -> Dict[str, float]:
+        weights = np.exp(self.log_posterior)
+        marginals = weights @ self.evil
+        return {name: float(marginals[i]) for i, name in enumerate(self.player_names)}
+
+    def merlin_probabilities(self) -> Dict[str, float]:
+        weights = np.exp(self.log_posterior)
+        marginals = np.bincount(self.merlin, weights=weights, minlength=self.num_players)
+        return {name: float(marginals[i]) for i, name in enumerate(self.player_names)}
+
+    def entropy_bits(self) -> float:
+        weights = np.exp(self.log_posterior)
+        nonzero = weights[weights > 0]
+        return float(-(nonzero * np.log2(nonzero)).sum())
+
+    def snapshot(self, global_turn_id: int, mission_number: int, proposal_id: Optional[int], event: str) -> BeliefSnapshot:
+        return BeliefSnapshot(
+            global_turn_id=global_turn_id,
+            mission_number=mission_number,
+            proposal_id=proposal_id,
+            event=event,
+            evil_probability=self.evil_probabilities(),
+            merlin_probability=self.merlin_probabilities(),
+            entropy_bits=self.entropy_bits()
+        )
+
+    def get_context_string(self) -> str:
+        evil_probs = self.evil_probabilities()
+        context = "\nPUBLIC-INFORMATION ESTIMATE (ideal observer using only votes and mission results):\n"
+        for name in self.player_names:
+            context += f"  {name}: {evil_probs[name]*100:.0f}% likely evil\n"
+        return context
+
+
+def annotate_game(game: dict, model: BeliefModel = None) -> List[BeliefSnapshot]:
+    """Replay a saved game dict through the tracker and return the per-turn posteriors."""
+    tracker = BeliefTracker([p["name"] for p in game["players"]], model=model)
+    snapshots = []
+    turn_id = -1
+
+    for mission in game["missions"]:
+        for msg in mission["discussion"]:
+            turn_id = max(turn_id, msg.get("global_turn_id", turn_id))
+
+        for proposal in mission["proposals"]:
+            if proposal["votes"]:
+                tracker.update_votes(
+                    proposal["team_members"],
+                    {v["player"]: v["vote"] for v in proposal["votes"]}
+                )
+                snapshots.append(tracker.snapshot(turn_id, mission["mission_number"], proposal["proposal_id"], "vote"))
+
+        if mission["mission_result"] is not None:
+            final_proposal = mission["proposals"][mission["final_team_index"]]
+            tracker.update_mission(final_proposal["team_members"], mission["fail_count"] or 0)
+            snapshots.append(tracker.snapshot(turn_id, mission["mission_number"], None, "mission"))
+
+    return snapshots
+
+
+def main():
+    """Annotate saved games with observer posteriors: python belief_tracker.py [paths...] [--output FILE]"""
+    paths = []
+    output_file = None
+
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        if args[i] == "--output" and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 2
+            continue
+        paths.append(args[i])
+        i += 1
+
+    if not paths:
+        paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset")]
+
+    start_time = time.time()
+    results = {}
+    merlin_ranks = []
+    for path in find_game_files(paths):
+        game = load_game(path)
+        snapshots = annotate_game(game)
+        results[path] = [asdict(s) for s in snapshots]
+
+        if snapshots and game.get("assassin_phase"):
+            merlin = next(p["name"] for p in game["players"] if p["role"] == "merlin")
+            final = snapshots[-1].merlin_probability
+            merlin_ranks.append(sorted(final, key=final.get, reverse=True).index(merlin) + 1)
+    elapsed = time.time() - start_time
+
+    print(f"Annotated {len(results)} games in {elapsed:.2f}s")
+    if merlin_ranks:
+        top1 = sum(1 for r in merlin_ranks if r == 1)
+        print(f"  Observer ranks true Merlin first in {top1}/{len(merlin_ranks)} assassin phases")
+
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump(results, f)
+        print(f"\n📁 Posteriors saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
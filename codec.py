@@ -0,0 +1,255 @@
+import sys
+import json
+import time
+import typing
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from schema import GameState, PlayerReflection
+
+# Version 1: first versioned layout. Files without schema_version are version 0 (the published dataset)
+SCHEMA_VERSION = 1
+
+COMPACT_SEPARATORS = (",", ":")
+
+_encoders: Dict[type, Callable] = {}
+_decoders: Dict[type, Callable] = {}
+
+
+def _identity(value):
+    return value
+
+
+def _value_codecs(tp) -> Tuple[Callable, Callable]:
+    """(encode, decode) for one annotated type; plain JSON values pass through untouched."""
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    if origin is typing.Union and type(None) in args:
+        inner = [a for a in args if a is not type(None)][0]
+        enc, dec = _value_codecs(inner)
+        if enc is _identity and dec is _identity:
+            return _identity, _identity
+        return (lambda v: None if v is None else enc(v)), (lambda v: None if v is None else dec(v))
+    if origin in (list, List):
+        enc, dec = _value_codecs(args[0]) if args else (_identity, _identity)
+        if enc is _identity and dec is _identity:
+            return list, list
+        return (lambda v: [enc(x) for x in v]), (lambda v: [dec(x) for x in v])
+    if origin in (dict, Dict):
+        enc, dec = _value_codecs(args[1]) if args else (_identity, _identity)
+        if enc is _identity and dec is _identity:
+            return dict, dict
+        return (lambda v: {k: enc(x) for k, x in v.items()}), (lambda v: {k: dec(x) for k, x in v.items()})
+    if is_dataclass(tp):
+        return (lambda v: _encoder(tp)(v)), (lambda v: _decoder(tp)(v))
+    return _identity, _identity
+
+
+def _encoder(cls) -> Callable:
+    encoder = _encoders.get(cls)
+    if encoder is None:
+        hints = typing.get_type_hints(cls)
+        plan = []
+        for f in fields(cls):
+            enc = _value_codecs(hints[f.name])[0]
+            plan.append((f.name, None if enc is _identity else enc))
+
+        def encoder(obj):
+            out = {}
+            for name, enc in plan:
+                value = getattr(obj, name)
+                out[name] = value if enc is None or value is None else enc(value)
+            return out
+        _encoders[cls] = encoder
+    return encoder
+
+
+def _decoder(cls) -> Callable:
+    decoder = _decoders.get(cls)
+    if decoder is None:
+        hints = typing.get_type_hints(cls)
+        plan = []
+        for f in fields(cls):
+            if f.default is not MISSING:
+                default = lambda d=f.default: d
+            elif f.default_factory is not MISSING:
+                default = f.default_factory
+            else:
+                default = None
+            dec = _value_codecs(hints[f.name])[1]
+            plan.append((f.name, None if dec is _identity else dec, default))
+
+        def decoder(data):
+            kwargs = {}
+            for name, dec, default in plan:
+                if name in data:
+                    value = data[name]
+                    kwargs[name] = value if dec is None or value is None else dec(value)
+                elif default is not None:
+                    kwargs[name] = default()
+                else:
+                    raise ValueError(f"{cls.__name__} is missing required field '{name}'")
+            return cls(**kwargs)
+        _decoders[cls] = decoder
+    return decoder
+
+
+def encode(obj) -> Any:
+    """Dataclass (or list of them) -> JSON-ready dicts in one pass."""
+    if isinstance(obj, list):
+        return [encode(item) for item in obj]
+    return _encoder(type(obj))(obj)
+
+
+def decode(cls, data: dict):
+    """JSON dict -> typed dataclass, nested dataclasses included. Unknown keys are ignored."""
+    return _decoder(cls)(data)
+
+
+def _upgrade_game(data: dict) -> dict:
+    """Fill what older (version 0) game files lack so they decode like current ones."""
+    if data.get("schema_version", 0) < 1:
+        config = data.get("config") or {}
+        if "num_players" not in config:
+            data = {**data, "config": {**config, "num_players": len(data["players"])}}
+    return data
+
+
+def encode_game(game_state, reflections: list = None) -> dict:
+    """Game file layout: schema_version, the GameState fields and, for tournament games, post_game_reflections."""
+    data = {"schema_version": SCHEMA_VERSION}
+    data.update(encode(game_state))
+    if reflections:
+        data["post_game_reflections"] = encode(reflections)
+    return data
+
+
+def decode_game(data: dict) -> tuple:
+    """(GameState, [PlayerReflection]) from a game file's dict, any schema version."""
+    data = _upgrade_game(data)
+    reflections = [decode(PlayerReflection, r) for r in data.get("post_game_reflections") or []]
+    return decode(GameState, data), reflections
+
+
+def load_game(path: str) -> tuple:
+    with open(path) as f:
+        return decode_game(json.load(f))
+
+
+def load_memories(path: str) -> dict:
+    """player_memories.json -> {name: PlayerMemory}"""
+    from multi_game_runner import PlayerMemory
+
+    with open(path) as f:
+        data = json.load(f)
+    return {name: decode(PlayerMemory, memory) for name, memory in data["player_memories"].items()}
+
+
+def dumps(data, compact: bool = False) -> str:
+    if compact:
+        return json.dumps(data, separators=COMPACT_SEPARATORS)
+    return json.dumps(data, indent=2)
+
+
+def write_json(filename: str, data, compact: bool = False):
+    with open(filename, 'w') as f:
+        f.write(dumps(data, compact))
+
+
+def main():
+    """
+    python codec.py [paths...] [--repeat 3]
+
+    Loads every game file under the paths (default: dataset/) into typed dataclasses, then times
+    the previous save path (asdict + convert_to_dict + json.dump indent=2) against this codec.
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    import io
+    import os
+    from dataclasses import asdict
+    from dataset_loader import find_game_files
+
+    repeat = 3
+    paths = []
+    i = 0
+    while i < len(args):
+        if args[i] == "--repeat" and i + 1 < len(args):
+            repeat = int(args[i + 1])
+            i += 2
+        else:
+            paths.append(args[i])
+            i += 1
+    if not paths:
+        paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset")]
+
+    raw = []
+    for path in find_game_files(paths):
+        with open(path) as f:
+            raw.append(f.read())
+
+    start_time = time.time()
+    games = [decode_game(json.loads(text)) for text in raw]
+    print(f"Parsed and decoded {len(games)} games into typed dataclasses in {time.time() - start_time:.2f}s\n")
+
+    def convert_to_dict(obj):
+        if hasattr(obj, '__dataclass_fields__'):
+            return {k: convert_to_dict(v) for k, v in asdict(obj).items()}
+        elif isinstance(obj, list):
+            return [convert_to_dict(item) for item in obj]
+        else:
+            return obj
+
+    def previous_encode(game, reflections):
+        data = convert_to_dict(game)
+        if reflections:
+            data["post_game_reflections"] = [asdict(r) for r in reflections]
+        return data
+
+    def previous_save(game, reflections):
+        out = io.StringIO()
+        json.dump(previous_encode(game, reflections), out, indent=2)
+        return out.getvalue()
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs = [fn(game, reflections) for game, reflections in games]
+            best = min(best, time.perf_counter() - start)
+        return best, outputs
+
+    encoded = [encode_game(game, reflections) for game, reflections in games]
+    rows = [
+        ("encode: previous (asdict + convert_to_dict)", best_of(previous_encode)),
+        ("encode: codec", best_of(encode_game)),
+        ("save: previous (+ json.dump indent=2)", best_of(previous_save)),
+        ("save: codec, indent=2", best_of(lambda g, r: dumps(encode_game(g, r)))),
+        ("save: codec, compact", best_of(lambda g, r: dumps(encode_game(g, r), compact=True))),
+    ]
+    decode_seconds = min(_timed(lambda: [decode_game(data) for data in encoded]) for _ in range(repeat))
+    rows.append(("decode: codec (dict -> dataclasses)", (decode_seconds, None)))
+
+    print(f"{len(games)} games, best of {repeat}:")
+    baseline = {"encode": rows[0][1][0], "save": rows[2][1][0]}
+    for label, (seconds, outputs) in rows:
+        kind = label.split(":")[0]
+        line = f"  {label}: {seconds * 1000:.0f} ms"
+        if kind in baseline:
+            line += f" ({baseline[kind] / seconds:.1f}x)"
+        if kind == "save":
+            line += f", {sum(len(text) for text in outputs) / 1e6:.1f} MB"
+        print(line)
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import json
+from typing import Iterator, List
+
+
+def find_game_files(paths: List[str]) -> Iterator[str]:
+    """Yield every individual game file (game_XX.json) under the given files or folders."""
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.startswith("game_") and name.endswith(".json") and not name.endswith(".trace.json"):
+                    yield os.path.join(root, name)
+
+
+def find_memory_files(paths: List[str]) -> Iterator[str]:
+    """Yield every player_memories.json under the given folders."""
+    for path in paths:
+        if os.path.isfile(path):
+            if os.path.basename(path) == "player_memories.json":
+                yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            if "player_memories.json" in files:
+                yield os.path.join(root, "player_memories.json")
+
+
+def load_game(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,123 @@
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist, mean, stdev
+from typing import List, Optional, Tuple
+
+METRICS = ["good_win_rate", "assassin_success", "memory_gap"]
+PROPORTION_METRICS = ["good_win_rate", "assassin_success"]
+
+
+@dataclass
+class StoppingDecision:
+    stop: bool
+    games_played: int
+    observations: int
+    estimate: Optional[float]
+    interval: Optional[Tuple[float, float]]
+    reason: str
+
+
+@dataclass
+class StoppingRule:
+    """Sequential test on a tournament metric, checked after every game.
+
+    method="ci" stops once the `confidence` interval of the metric is at most `ci_width` wide.
+    method="sprt" runs Wald's sequential probability ratio test of p0 against p1 (proportion
+    metrics only) and stops when either hypothesis is accepted at the given alpha/beta.
+    Nothing stops before `min_games`; the runner's num_games remains the hard cap.
+    memory_gap intervals use a standard deviation of at least `sd_floor`, so a run of identical
+    per-game gaps (sample deviation 0) cannot produce a zero-width interval and stop at min_games.
+    """
+    metric: str = "good_win_rate"
+    method: str = "ci"
+    ci_width: float = 0.2
+    confidence: float = 0.95
+    p0: float = 0.4
+    p1: float = 0.6
+    alpha: float = 0.05
+    beta: float = 0.2
+    min_games: int = 10
+    sd_floor: float = 0.25
+    history: List[StoppingDecision] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        if self.metric not in METRICS:
+            raise ValueError(f"Unknown stopping metric '{self.metric}' (choose from {', '.join(METRICS)})")
+        if self.method not in ("ci", "sprt"):
+            raise ValueError(f"Unknown stopping method '{self.method}' (choose 'ci' or 'sprt')")
+        if self.method == "sprt" and self.metric not in PROPORTION_METRICS:
+            raise ValueError(f"SPRT needs a proportion metric ({', '.join(PROPORTION_METRICS)})")
+        if self.method == "sprt" and not 0 < self.p0 < self.p1 < 1:
+            raise ValueError("SPRT needs 0 < p0 < p1 < 1")
+
+    def observations(self, games: list, memory_players: List[str], llm_players: List[str]) -> List[float]:
+        """One value per game (multi_game_runner.GameSummary) that informs the metric; games without
+        an assassin phase are skipped, etc."""
+        if self.metric == "good_win_rate":
+            return [1.0 if g.winner == "good" else 0.0 for g in games]
+        if self.metric == "assassin_success":
+            return [1.0 if g.assassin_correct else 0.0 for g in games if g.assassin_correct is not None]
+
+        # memory_gap: per game, win rate of memory-enabled seats minus that of memory-less LLM seats
+        gaps = []
+        for g in games:
+            won = {name: ((name in g.good_players) == (g.winner == "good")) for name in g.roles}
+            with_memory = [won[p] for p in memory_players if p in won]
+            without_memory = [won[p] for p in llm_players if p in won and p not in memory_players]
+            if with_memory and without_memory:
+                gaps.append(mean(with_memory) - mean(without_memory))
+        return gaps
+
+    def _interval(self, values: List[float]) -> Tuple[float, Tuple[float, float]]:
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        n = len(values)
+        estimate = mean(values)
+        if self.metric in PROPORTION_METRICS:
+            # Wilson score interval; stays sensible at 0/n and n/n
+            denom = 1 + z * z / n
+            centre = (estimate + z * z / (2 * n)) / denom
+            half = z * math.sqrt(estimate * (1 - estimate) / n + z * z / (4 * n * n)) / denom
+            return estimate, (centre - half, centre + half)
+        half = z * max(stdev(values), self.sd_floor) / math.sqrt(n) if n > 1 else float("inf")
+        return estimate, (estimate - half, estimate + half)
+
+    def check(self, games: list, memory_players: List[str], llm_players: List[str]) -> StoppingDecision:
+        values = self.observations(games, memory_players, llm_players)
+        games_played = len(games)
+        estimate, interval = self._interval(values) if values else (None, None)
+
+        stop = False
+        if self.method == "ci":
+            if interval is not None:
+                width = interval[1] - interval[0]
+                reason = f"{self.confidence:.0%} CI width {width:.3f} (target {self.ci_width:.3f})"
+                if self.metric not in PROPORTION_METRICS and len(values) > 1 and stdev(values) < self.sd_floor:
+                    reason += f"; sd floored at {self.sd_floor}"
+                stop = width <= self.ci_width
+            else:
+                reason = "no observations yet"
+        else:
+            successes = sum(values)
+            llr = (successes * math.log(self.p1 / self.p0)
+                   + (len(values) - successes) * math.log((1 - self.p1) / (1 - self.p0)))
+            upper = math.log((1 - self.beta) / self.alpha)
+            lower = math.log(self.beta / (1 - self.alpha))
+            reason = f"log-likelihood ratio {llr:.3f} (accept p1 >= {upper:.3f}, accept p0 <= {lower:.3f})"
+            if llr >= upper:
+                stop, reason = True, reason + f"; accepted p1={self.p1}"
+            elif llr <= lower:
+                stop, reason = True, reason + f"; accepted p0={self.p0}"
+
+        if stop and games_played < self.min_games:
+            stop = False
+            reason += f"; waiting for {self.min_games} games"
+        decision = StoppingDecision(stop, games_played, len(values), estimate, interval, reason)
+        self.history.append(decision)
+        return decision
+
+    def describe(self) -> str:
+        if self.method == "ci":
+            rule = f"stop when the {self.confidence:.0%} CI is <= {self.ci_width} wide"
+        else:
+            rule = f"SPRT p0={self.p0} vs p1={self.p1}, alpha={self.alpha}, beta={self.beta}"
+        return f"{self.metric}: {rule} (after at least {self.min_games} games)"
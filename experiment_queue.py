@@ -0,0 +1,337 @@
+import os
+import sys
+import json
+import time
+import socket
+import sqlite3
+import threading
+import itertools
+import multiprocessing
+from typing import Dict, List, Optional
+
+DEFAULT_DB = "experiments.db"
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+# Matrix that regenerates the published dataset/ folders
+DATASET_MATRIX = {
+    "output_root": "dataset_regenerated",
+    "experiments": [
+        {
+            "name": "1_cross_game_learning_50g",
+            "mode": "tournament",
+            "num_players": [5],
+            "reasoning_effort": ["low"],
+            "memory_players": [None],
+            "num_games": 50,
+            "output": ""
+        },
+        {
+            "name": "2_tournaments_by_player_count",
+            "mode": "tournament",
+            "num_players": [5, 6, 7, 8, 9, 10],
+            "reasoning_effort": ["low"],
+            "memory_players": [None],
+            "num_games": 10,
+            "output": "{num_players}p"
+        },
+        {
+            "name": "3_individual_games_by_player_count",
+            "mode": "individual",
+            "num_players": [5, 6, 7, 8, 9, 10],
+            "reasoning_effort": ["low"],
+            "memory_players": [None],
+            "num_games": 10,
+            "output": "{num_players}p"
+        },
+        {
+            "name": "4_reasoning_comparison",
+            "mode": "tournament",
+            "num_players": [5],
+            "reasoning_effort": ["low", "medium", "high"],
+            "memory_players": [None],
+            "num_games": 6,
+            "output": "{reasoning_effort}"
+        }
+    ]
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT UNIQUE NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_expires);
+"""
+
+
+def expand_matrix(matrix: dict) -> List[dict]:
+    """Cartesian product of every experiment's axes -> one job per tournament or game set."""
+    jobs = []
+    output_root = matrix.get("output_root", "experiments_output")
+    for experiment in matrix["experiments"]:
+        axes = {
+            "num_players": experiment.get("num_players", [5]),
+            "reasoning_effort": experiment.get("reasoning_effort", [None]),
+            "memory_players": experiment.get("memory_players", [None]),
+            "repeat": list(range(experiment.get("repeats", 1)))
+        }
+        for values in itertools.product(*axes.values()):
+            params = dict(zip(axes.keys(), values))
+            params["name"] = experiment["name"]
+            params["mode"] = experiment.get("mode", "tournament")
+            params["num_games"] = experiment.get("num_games", 10)
+            params["model"] = experiment.get("model")
+
+            template = experiment.get("output", "{num_players}p_{reasoning_effort}")
+            if experiment.get("repeats", 1) > 1:
+                template += "_r{repeat}"
+            label = template.format(**params)
+            params["output_dir"] = os.path.join(output_root, experiment["name"], label)
+            jobs.append(params)
+    return jobs
+
+
+class JobQueue:
+    """Lease-based job queue in a single SQLite file, safe to share between processes and hosts."""
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        self.db_path = db_path
+        # Rollback journal (not WAL) so the file also works on shared network filesystems
+        self.conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, jobs: List[dict], max_attempts: int = MAX_ATTEMPTS) -> int:
+        """Add jobs that are not already queued. Returns how many were new."""
+        now = time.time()
+        added = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        for params in jobs:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_key, params, max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (params["output_dir"], json.dumps(params), max_attempts, now, now)
+            )
+            added += cursor.rowcount
+        self.conn.execute("COMMIT")
+        return added
+
+    def claim(self, worker_id: str, lease_seconds: int = LEASE_SECONDS) -> Optional[dict]:
+        """Atomically take the oldest pending job, or a running job whose lease has expired."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        # A worker that died on its last attempt leaves an expired lease behind
+        self.conn.execute(
+            "UPDATE jobs SET status = 'failed', last_error = COALESCE(last_error, 'lease expired'), updated_at = ? "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now)
+        )
+        row = self.conn.execute(
+            "SELECT id, params FROM jobs "
+            "WHERE attempts < max_attempts AND (status = 'pending' OR (status = 'running' AND lease_expires < ?)) "
+            "ORDER BY id LIMIT 1",
+            (now,)
+        ).fetchone()
+        if row is None:
+            self.conn.execute("COMMIT")
+            return None
+        self.conn.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+            (worker_id, now + lease_seconds, now, row["id"])
+        )
+        self.conn.execute("COMMIT")
+        job = json.loads(row["params"])
+        job["job_id"] = row["id"]
+        return job
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int = LEASE_SECONDS):
+        now = time.time()
+        self.conn.execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (now + lease_seconds, now, job_id, worker_id)
+        )
+
+    def complete(self, job_id: int, worker_id: str):
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', lease_expires = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (time.time(), job_id, worker_id)
+        )
+
+    def fail(self, job_id: int, worker_id: str, error: str):
+        """Return the job to the queue, or mark it failed once its attempts are used up."""
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+            "last_error = ?, lease_expires = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (error, time.time(), job_id, worker_id)
+        )
+
+    def has_unfinished(self) -> bool:
+        row = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'running')").fetchone()
+        return row[0] > 0
+
+    def status_counts(self) -> Dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        self.conn.close()
+
+
+def run_job(job: dict):
+    """Run one tournament, or one set of independent games, into job['output_dir']."""
+    os.makedirs(job["output_dir"], exist_ok=True)
+
+    if job["mode"] == "tournament":
+        from multi_game_runner import MultiGameRunner
+        runner = MultiGameRunner(
+            num_games=job["num_games"],
+            num_players=job["num_players"],
+            model=job.get("model"),
+            reasoning_effort=job.get("reasoning_effort"),
+            memory_enabled_players=job.get("memory_players"),
+            tournament_dir=job["output_dir"]
+        )
+        # A retried job (crashed worker or expired lease) continues after the games already on disk
+        runner.resume()
+        runner.run_tournament()
+        return
+
+    from main import AvalonGame, MODEL, REASONING_EFFORT
+    for i in range(job["num_games"]):
+        output_file = os.path.join(job["output_dir"], f"game_{i:02d}.json")
+        if os.path.exists(output_file):
+            # Independent games resume where a crashed attempt stopped
+            continue
+        game = AvalonGame(
+            num_players=job["num_players"],
+            model=job.get("model") or MODEL,
+            reasoning_effort=job.get("reasoning_effort") or REASONING_EFFORT
+        )
+        game_state = game.play_game()
+        game.save_game(game_state, output_file)
+
+
+def worker_loop(db_path: str, lease_seconds: int = LEASE_SECONDS, poll_seconds: float = 5.0):
+    queue = JobQueue(db_path)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"Worker {worker_id} started on {db_path}")
+
+    while True:
+        job = queue.claim(worker_id, lease_seconds)
+        if job is None:
+            if not queue.has_unfinished():
+                break
+            # Other workers hold the remaining jobs; wait in case a lease expires
+            time.sleep(poll_seconds)
+            continue
+
+        print(f"\n[{worker_id}] Job {job['job_id']}: {job['output_dir']}")
+
+        # Keep the lease alive from a separate connection while the job runs
+        stop = threading.Event()
+
+        def keep_alive():
+            hb_queue = JobQueue(db_path)
+            while not stop.wait(lease_seconds / 3):
+                hb_queue.heartbeat(job["job_id"], worker_id, lease_seconds)
+            hb_queue.close()
+
+        heartbeat = threading.Thread(target=keep_alive, daemon=True)
+        heartbeat.start()
+        try:
+            run_job(job)
+            queue.complete(job["job_id"], worker_id)
+            print(f"[{worker_id}] Job {job['job_id']} done")
+        except Exception as e:
+            queue.fail(job["job_id"], worker_id, repr(e))
+            print(f"[{worker_id}] Job {job['job_id']} failed: {e}")
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    queue.close()
+    # multiprocessing workers exit without running atexit handlers
+    import metrics
+    metrics.flush(final=True)
+    print(f"Worker {worker_id}: no jobs left")
+
+
+def main():
+    """
+    python experiment_queue.py enqueue [matrix.json] [--db FILE]
+    python experiment_queue.py work [--db FILE] [--workers N]
+    python experiment_queue.py run [matrix.json] [--db FILE] [--workers N]
+    python experiment_queue.py status [--db FILE]
+
+    --metrics-port N serves Prometheus metrics aggregated over all workers (see metrics.py).
+
+    Without a matrix file, the matrix that regenerates dataset/ is used.
+    """
+    if len(sys.argv) < 2 or sys.argv[1] not in ("enqueue", "work", "run", "status"):
+        print(main.__doc__)
+        return
+
+    command = sys.argv[1]
+    db_path = DEFAULT_DB
+    num_workers = 1
+    matrix_file = None
+    metrics_port = None
+
+    args = sys.argv[2:]
+    i = 0
+    while i < len(args):
+        if args[i] == "--db" and i + 1 < len(args):
+            db_path = args[i + 1]
+            i += 2
+        elif args[i] == "--workers" and i + 1 < len(args):
+            num_workers = int(args[i + 1])
+            i += 2
+        elif args[i] == "--metrics-port" and i + 1 < len(args):
+            metrics_port = int(args[i + 1])
+            i += 2
+        else:
+            matrix_file = args[i]
+            i += 1
+
+    queue = JobQueue(db_path)
+
+    if command in ("enqueue", "run"):
+        if matrix_file:
+            with open(matrix_file) as f:
+                matrix = json.load(f)
+        else:
+            matrix = DATASET_MATRIX
+        jobs = expand_matrix(matrix)
+        added = queue.enqueue(jobs)
+        print(f"Queued {added} new jobs ({len(jobs) - added} already in {db_path})")
+
+    if command in ("work", "run"):
+        if not os.environ.get("OPENAI_API_KEY"):
+            print("Error: OPENAI_API_KEY environment variable not set!")
+            return
+        if metrics_port:
+            import metrics
+            metrics.serve(metrics_port)
+        workers = [multiprocessing.Process(target=worker_loop, args=(db_path,)) for _ in range(num_workers)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+    print("\nJOB STATUS:")
+    for status, count in sorted(queue.status_counts().items()):
+        print(f"  {status}: {count}")
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import gzip
+import shutil
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from dataset_loader import load_game
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, "dataset")
+OUTPUT_PATH = os.path.join(BASE_DIR, "frontend", "public", "data")
+
+# (source folder under dataset/, viewer path, display name, players, reasoning, has memory)
+VIEWER_DATASETS = (
+    [("1_cross_game_learning_50g", "A_cross_game_learning", "A: Cross-Game Learning", 5, "low", True)]
+    + [(f"2_tournaments_by_player_count/{pc}p", f"B_tournament_{pc}p", f"B: Tournament {pc}p", pc, "low", True)
+       for pc in range(5, 11)]
+    + [(f"3_individual_games_by_player_count/{pc}p", f"C_individual_{pc}p", f"C: Individual {pc}p", pc, "low", False)
+       for pc in range(5, 11)]
+    + [(f"4_reasoning_comparison/{level}", f"D_reasoning_{level}", f"D: Reasoning {level}", 5, level, True)
+       for level in ("low", "medium", "high")]
+)
+
+# Fields moved out of the game shard into the reasoning sidecar
+SIDECAR_FIELDS = ("reasoning_content",)
+
+
+def split_sidecar(obj) -> Tuple[object, Optional[object]]:
+    """Strip SIDECAR_FIELDS from a game dict. Returns (stripped, sidecar).
+
+    The sidecar mirrors the game's shape (same keys, same list positions) but only holds the
+    stripped fields, so the viewer can deep-merge it back into the shard when it needs them.
+    Branches with nothing stripped are None.
+    """
+    if isinstance(obj, dict):
+        stripped, sidecar = {}, {}
+        for key, value in obj.items():
+            if key in SIDECAR_FIELDS:
+                if value is not None:
+                    sidecar[key] = value
+                continue
+            stripped[key], side = split_sidecar(value)
+            if side is not None:
+                sidecar[key] = side
+        return stripped, sidecar or None
+    if isinstance(obj, list):
+        pairs = [split_sidecar(item) for item in obj]
+        sides = [side for _, side in pairs]
+        return [s for s, _ in pairs], sides if any(side is not None for side in sides) else None
+    return obj, None
+
+
+def write_json(path: str, data, compress: bool = True) -> int:
+    """Write minified JSON plus precompressed .gz (and .br when brotli is installed). Returns raw bytes."""
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(raw)
+    if compress:
+        with open(path + ".gz", "wb") as f:
+            f.write(gzip.compress(raw, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(raw))
+    return len(raw)
+
+
+def load_source(src_dir: str) -> Tuple[List[dict], Optional[dict]]:
+    """Games (in tournament order) and player memories for one dataset folder."""
+    all_games_path = os.path.join(src_dir, "all_games.json")
+    if os.path.exists(all_games_path):
+        games = load_game(all_games_path)["games"]
+    else:
+        games = [load_game(os.path.join(src_dir, name)) for name in sorted(os.listdir(src_dir))
+                 if name.startswith("game_") and name.endswith(".json")]
+
+    memories_path = os.path.join(src_dir, "player_memories.json")
+    memories = load_game(memories_path) if os.path.exists(memories_path) else None
+    return games, memories
+
+
+def export_dataset(games: List[dict], memories: Optional[dict], dest_dir: str, compress: bool = True) -> Dict[str, int]:
+    """Write index.json, games/<n>.json, reasoning/<n>.json and reflections/<n>.json for one tournament.
+
+    Files are keyed by game number (1-based tournament order) rather than game_id, which only has
+    one-second resolution and can repeat for games started together.
+    """
+    for sub in ("games", "reasoning", "reflections"):
+        os.makedirs(os.path.join(dest_dir, sub), exist_ok=True)
+    sizes = defaultdict(int)
+
+    reflections_by_game = defaultdict(list)
+    if memories:
+        for memory in memories["player_memories"].values():
+            for reflection in memory["reflections"]:
+                reflections_by_game[reflection["game_number"]].append(reflection)
+
+    index = []
+    for game_number, game in enumerate(games, 1):
+        game = {k: v for k, v in game.items() if k != "post_game_reflections"}
+        shard, sidecar = split_sidecar(game)
+
+        sizes["games"] += write_json(os.path.join(dest_dir, "games", f"{game_number}.json"), shard, compress)
+        if sidecar:
+            sizes["reasoning"] += write_json(os.path.join(dest_dir, "reasoning", f"{game_number}.json"), sidecar, compress)
+        if reflections_by_game.get(game_number):
+            sizes["reflections"] += write_json(os.path.join(dest_dir, "reflections", f"{game_number}.json"),
+                                               reflections_by_game[game_number], compress)
+
+        index.append({
+            "id": game["game_id"],
+            "winner": game["winner"],
+            "players": len(game["players"]),
+            "reasoning": bool(sidecar),
+            "reflections": bool(reflections_by_game.get(game_number))
+        })
+
+    sizes["index"] = write_json(os.path.join(dest_dir, "index.json"), index, compress)
+    return sizes
+
+
+def main():
+    """
+    python export_viewer.py [--dataset DIR] [--output DIR] [--no-compress]
+
+    Writes the game viewer's data folder (default frontend/public/data): a minified
+    tournaments.json, and per tournament a minified index.json, one shard per game under
+    games/<n>.json, reasoning_content sidecars under reasoning/<n>.json, and each game's
+    reflections under reflections/<n>.json (replacing player_memories.json), each with a
+    precompressed .gz (and .br when brotli is installed). npm run dev/build and the Pages
+    deploy run this before Next.js, which copies the folder into the static site as is.
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    dataset_path = DATASET_PATH
+    output_path = OUTPUT_PATH
+    for i, arg in enumerate(args):
+        if arg == "--dataset" and i + 1 < len(args):
+            dataset_path = args[i + 1]
+        elif arg == "--output" and i + 1 < len(args):
+            output_path = args[i + 1]
+    compress = "--no-compress" not in args
+
+    if os.path.exists(output_path):
+        shutil.rmtree(output_path)
+    os.makedirs(output_path)
+
+    tournaments = []
+    totals = defaultdict(int)
+    for src, path, name, players, reasoning, has_memory in VIEWER_DATASETS:
+        src_dir = os.path.join(dataset_path, src)
+        if not os.path.isdir(src_dir):
+            continue
+        games, memories = load_source(src_dir)
+        sizes = export_dataset(games, memories if has_memory else None,
+                               os.path.join(output_path, "datasets", path), compress)
+        for key, size in sizes.items():
+            totals[key] += size
+
+        tournaments.append({
+            "name": f"{name} ({len(games)} games)",
+            "path": f"datasets/{path}",
+            "players": players,
+            "games": len(games),
+            "reasoning": reasoning,
+            "hasMemory": has_memory and memories is not None
+        })
+        print(f"{name}: {len(games)} games")
+
+    write_json(os.path.join(output_path, "tournaments.json"), tournaments, compress)
+
+    total_games = sum(t["games"] for t in tournaments)
+    print(f"\n{'='*40}")
+    print(f"Exported {len(tournaments)} tournaments, {total_games} games to {output_path}")
+    for key in ("index", "games", "reasoning", "reflections"):
+        print(f"  {key:<12} {totals[key] / 1024:>9.1f} KB")
+    if total_games:
+        print(f"  Average game shard: {totals['games'] / total_games / 1024:.1f} KB")
+    if compress and brotli is None:
+        print("  (install brotli for .br variants; .gz written)")
+
+
+if __name__ == "__main__":
+    main()
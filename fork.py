@@ -0,0 +1,199 @@
+import os
+import re
+import sys
+import json
+from typing import Dict, Optional
+
+from main import AvalonGame, Mission, ROLE_CONFIGS, MODEL, REASONING_EFFORT, parse_route
+from codec import decode, decode_game
+
+
+def fork_game(game: dict, global_turn_id: int, proposal_id: Optional[int] = None, approve: bool = False,
+              game_class=AvalonGame, **game_kwargs) -> AvalonGame:
+    """Rebuild a saved game's state just before `global_turn_id` and return a game ready to resume.
+
+    global_turn_id picks a discussion or evil-discussion message; everything before it is kept and
+    the rest is played live by `play_game()`. With `proposal_id`, the whole discussion of that
+    message's mission is kept along with the proposals before `proposal_id`; with `approve` the
+    recorded proposal `proposal_id` is also kept but treated as approved, so the mission executes
+    with that team.
+    """
+    num_players = len(game["players"])
+    config = game.get("config") or {}
+    game_kwargs.setdefault("model", config.get("model", MODEL))
+    game_kwargs.setdefault("reasoning_effort", config.get("reasoning_effort", REASONING_EFFORT))
+    game_kwargs.setdefault("routing", config.get("routing"))
+    game_kwargs.setdefault("time_budget", config.get("time_budget"))
+    game_kwargs.setdefault("token_budget", config.get("token_budget"))
+    game_kwargs.setdefault("prompt_token_cap", config.get("prompt_token_cap"))
+    game_kwargs.setdefault("session_mode", config.get("session_mode"))
+    forked = game_class(num_players=num_players, **game_kwargs)
+    forked.game_id = f"{game['game_id']}_fork{global_turn_id}"
+
+    saved, _ = decode_game(game)
+    forked.players = saved.players
+    forked.assassin_role = ROLE_CONFIGS[num_players].get("assassin_role", "assassin")
+    names = [p.name for p in forked.players]
+    missions = saved.missions
+
+    # Find the mission (or the assassin phase) containing the turn
+    target = None
+    for idx, mission in enumerate(missions):
+        if any(msg.global_turn_id == global_turn_id for msg in mission.discussion):
+            target = idx
+            break
+
+    if target is None:
+        evil_messages = saved.assassin_phase.evil_discussion if saved.assassin_phase else []
+        if not any(msg.global_turn_id == global_turn_id for msg in evil_messages):
+            raise ValueError(f"global_turn_id {global_turn_id} is not a discussion turn of {game['game_id']}")
+        if proposal_id is not None:
+            raise ValueError("proposal_id can only be used with a turn from a mission discussion")
+        kept_missions = missions
+        forked.resume_evil_discussion = [m for m in evil_messages if m.global_turn_id < global_turn_id]
+        forked.global_turn_counter = global_turn_id
+        last_leader = kept_missions[-1].proposals[kept_missions[-1].final_team_index].leader
+        forked.current_leader_idx = (names.index(last_leader) + 1) % num_players
+    else:
+        mission = missions[target]
+        kept_missions = missions[:target]
+
+        if proposal_id is None:
+            discussion = [m for m in mission.discussion if m.global_turn_id < global_turn_id]
+            proposals = []
+            leader = mission.proposals[0].leader
+            forked.global_turn_counter = global_turn_id
+        else:
+            if not 0 <= proposal_id < len(mission.proposals):
+                raise ValueError(f"Mission {mission.mission_number} has no proposal {proposal_id}")
+            discussion = mission.discussion
+            proposals = mission.proposals[:proposal_id]
+            leader = mission.proposals[proposal_id].leader
+            if approve:
+                chosen = mission.proposals[proposal_id]
+                chosen.vote_result = "approved"
+                proposals.append(chosen)
+            forked.global_turn_counter = max(m.global_turn_id for m in discussion) + 1
+
+        forked.current_leader_idx = names.index(leader)
+        forked.resume_mission = Mission(
+            mission_number=mission.mission_number,
+            proposals=proposals,
+            final_team_index=0,
+            discussion=discussion,
+            quest_actions=None,
+            mission_result=None,
+            fail_count=None
+        )
+
+    forked.missions = kept_missions
+    forked.good_wins = sum(1 for m in kept_missions if m.mission_result == "success")
+    forked.evil_wins = sum(1 for m in kept_missions if m.mission_result == "fail")
+    forked.quests_completed = len(kept_missions)
+
+    if forked.belief_tracking:
+        from belief_tracker import BeliefTracker
+        forked.belief_tracker = BeliefTracker(names)
+        for m in kept_missions:
+            for p in m.proposals:
+                if p.votes:
+                    forked.belief_tracker.update_votes(p.team_members, {v.player: v.vote for v in p.votes})
+            final = m.proposals[m.final_team_index]
+            forked.belief_tracker.update_mission(final.team_members, m.fail_count or 0)
+        if forked.resume_mission:
+            for p in forked.resume_mission.proposals:
+                if p.votes:
+                    forked.belief_tracker.update_votes(p.team_members, {v.player: v.vote for v in p.votes})
+
+    print(f"Forked {game['game_id']} at turn {global_turn_id}: {len(kept_missions)} missions kept, "
+          f"score Good {forked.good_wins} - Evil {forked.evil_wins}")
+    return forked
+
+
+def load_memories_before(memories_file: str, game_number: int) -> Dict:
+    """PlayerMemory objects as they were when game `game_number` of a tournament started."""
+    from multi_game_runner import PlayerMemory
+    from schema import PlayerReflection
+
+    with open(memories_file) as f:
+        data = json.load(f)
+
+    memories = {}
+    for name, memory in data["player_memories"].items():
+        reflections = [decode(PlayerReflection, r) for r in memory["reflections"] if r["game_number"] < game_number]
+        memories[name] = PlayerMemory(player_name=name, reflections=reflections)
+    return memories
+
+
+def main():
+    """
+    python fork.py <game.json> --turn N [--proposal K [--approve]] [--reasoning-effort high]
+                   [--route assassin_guess=high ...] [--memories player_memories.json] [--output forked.json]
+
+    With --memories (or when the game sits in a tournament's individual_games/ folder) the fork
+    runs as a LearningAvalonGame with each player's memory as of the start of that game.
+    """
+    args = sys.argv[1:]
+    if not args or "--turn" not in args:
+        print(main.__doc__)
+        return
+
+    if not os.environ.get("OPENAI_API_KEY"):
+        print("Error: OPENAI_API_KEY environment variable not set!")
+        return
+
+    game_file = args[0]
+    turn = None
+    proposal_id = None
+    approve = False
+    memories_file = None
+    output_file = None
+    game_kwargs = {}
+
+    for i, arg in enumerate(args):
+        if arg == "--turn" and i + 1 < len(args):
+            turn = int(args[i + 1])
+        elif arg == "--proposal" and i + 1 < len(args):
+            proposal_id = int(args[i + 1])
+        elif arg == "--approve":
+            approve = True
+        elif arg == "--memories" and i + 1 < len(args):
+            memories_file = args[i + 1]
+        elif arg == "--output" and i + 1 < len(args):
+            output_file = args[i + 1]
+        elif arg == "--model" and i + 1 < len(args):
+            game_kwargs["model"] = args[i + 1]
+        elif arg == "--reasoning-effort" and i + 1 < len(args):
+            game_kwargs["reasoning_effort"] = args[i + 1]
+        elif arg == "--seed" and i + 1 < len(args):
+            game_kwargs["seed"] = int(args[i + 1])
+        elif arg == "--route" and i + 1 < len(args):
+            key, route = parse_route(args[i + 1])
+            game_kwargs.setdefault("routing", {})[key] = route
+
+    with open(game_file) as f:
+        game = json.load(f)
+
+    if memories_file is None:
+        candidate = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(game_file))), "player_memories.json")
+        if os.path.basename(os.path.dirname(os.path.abspath(game_file))) == "individual_games" and os.path.exists(candidate):
+            memories_file = candidate
+
+    if memories_file:
+        from multi_game_runner import LearningAvalonGame
+        match = re.search(r"game_(\d+)\.json$", game_file)
+        game_number = int(match.group(1)) if match else 1
+        game_kwargs["player_memories"] = load_memories_before(memories_file, game_number)
+        forked = fork_game(game, turn, proposal_id, approve, game_class=LearningAvalonGame, **game_kwargs)
+    else:
+        forked = fork_game(game, turn, proposal_id, approve, **game_kwargs)
+
+    game_state = forked.play_game()
+
+    if output_file is None:
+        output_file = game_file.replace(".json", f"_fork{turn}.json")
+    forked.save_game(game_state, output_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 "use client";
 
-import { useState, useCallback, useEffect, Suspense } from "react";
+import { useState, useCallback, useEffect, useRef, Suspense } from "react";
 import { useSearchParams, useRouter } from "next/navigation";
 import Link from "next/link";
 import GameSelector from "@/components/GameSelector";
 import GameViewer from "@/components/GameViewer";
 import AutoPlayViewer from "@/components/AutoPlayViewer";
-import { Game, TournamentInfo, TournamentMemories } from "@/types/game";
+import {
+  Game,
+  Reflection,
+  TournamentInfo,
+  TournamentMemories,
+} from "@/types/game";
 import { getBasePath } from "@/lib/config";
+import { fetchGame, fetchMemories } from "@/lib/gameData";
 
 function HomeContent() {
   const searchParams = useSearchParams();
@@ -19,9 +25,15 @@ function HomeContent() {
   const [tournamentMemories, setTournamentMemories] =
     useState<TournamentMemories | null>(null);
   const [currentGameIndex, setCurrentGameIndex] = useState<number | null>(null);
-  const [cachedMemoryTournamentPath, setCachedMemoryTournamentPath] = useState<
+  const [selectedTournamentPath, setSelectedTournamentPath] = useState<
     string | null
   >(null);
+  const tournamentsRef = useRef<TournamentInfo[] | null>(null);
+  // Reflections already fetched for the current tournament, by game number
+  const memoryCacheRef = useRef<{
+    path: string;
+    reflections: Map<number, Reflection[]>;
+  } | null>(null);
 
   // Get initial indices from URL
   const initialTournamentIndex = searchParams.get("tournament")
@@ -42,6 +54,43 @@ function HomeContent() {
     [router],
   );
 
+  const loadTournaments = useCallback(async (basePath: string) => {
+    if (!tournamentsRef.current) {
+      const res = await fetch(`${basePath}/data/tournaments.json`);
+      tournamentsRef.current = await res.json();
+    }
+    return tournamentsRef.current!;
+  }, []);
+
+  // Memories shown with game `gameIndex` (0-based): reflections from the games before it
+  const loadMemories = useCallback(
+    async (basePath: string, tournament: TournamentInfo, gameIndex: number) => {
+      if (!tournament.hasMemory) {
+        setTournamentMemories(null);
+        return;
+      }
+      if (memoryCacheRef.current?.path !== tournament.path) {
+        memoryCacheRef.current = {
+          path: tournament.path,
+          reflections: new Map(),
+        };
+      }
+      try {
+        setTournamentMemories(
+          await fetchMemories(
+            basePath,
+            tournament.path,
+            gameIndex,
+            memoryCacheRef.current.reflections,
+          ),
+        );
+      } catch {
+        setTournamentMemories(null);
+      }
+    },
+    [],
+  );
+
   // Load game directly from URL params (for new tab / direct link / autoplay)
   useEffect(() => {
     if (
@@ -57,8 +106,7 @@ function HomeContent() {
 
     (async () => {
       try {
-        const tournamentsRes = await fetch(`${basePath}/data/tournaments.json`);
-        const tournaments: TournamentInfo[] = await tournamentsRes.json();
+        const tournaments = await loadTournaments(basePath);
 
         if (initialTournamentIndex >= tournaments.length) {
           setLoading(false);
@@ -76,34 +124,17 @@ function HomeContent() {
           return;
         }
 
-        const gameId = gameList[initialGameIndex].id;
-        const gamesRes = await fetch(
-          `${basePath}/data/${tournament.path}/all_games.json`,
-        );
-        const gamesData = await gamesRes.json();
-        const foundGame = gamesData.games.find(
-          (g: Game) => g.game_id === gameId,
+        const foundGame = await fetchGame(
+          basePath,
+          tournament.path,
+          initialGameIndex + 1,
         );
 
         if (foundGame) {
           setSelectedGame(foundGame);
           setCurrentGameIndex(initialGameIndex);
-
-          if (
-            tournament.hasMemory &&
-            cachedMemoryTournamentPath !== tournament.path
-          ) {
-            try {
-              const memRes = await fetch(
-                `${basePath}/data/${tournament.path}/player_memories.json`,
-              );
-              const memData: TournamentMemories = await memRes.json();
-              setTournamentMemories(memData);
-              setCachedMemoryTournamentPath(tournament.path);
-            } catch {
-              setTournamentMemories(null);
-            }
-          }
+          setSelectedTournamentPath(tournament.path);
+          await loadMemories(basePath, tournament, initialGameIndex);
         }
       } catch (error) {
         console.error("Failed to load game:", error);
@@ -115,12 +146,12 @@ function HomeContent() {
     initialTournamentIndex,
     initialGameIndex,
     selectedGame,
-    cachedMemoryTournamentPath,
+    loadTournaments,
+    loadMemories,
   ]);
 
   const handleSelectGame = async (
     tournamentPath: string,
-    gameId: string,
     tournamentIndex: number,
     gameIndex: number,
   ) => {
@@ -129,37 +160,20 @@ function HomeContent() {
     setCurrentGameIndex(gameIndex);
     try {
       const basePath = getBasePath();
-      const res = await fetch(
-        `${basePath}/data/${tournamentPath}/all_games.json`,
-      );
-      const data = await res.json();
-      const game = data.games.find((g: Game) => g.game_id === gameId);
+      const game = await fetchGame(basePath, tournamentPath, gameIndex + 1);
       if (game) {
         setSelectedGame(game);
+        setSelectedTournamentPath(tournamentPath);
       }
+      // Show the game right away; memories fill in when they arrive
+      setLoading(false);
 
-      // Load memories if this tournament has them and we haven't cached them
-      if (cachedMemoryTournamentPath !== tournamentPath) {
-        const tournamentsRes = await fetch(`${basePath}/data/tournaments.json`);
-        const tournaments: TournamentInfo[] = await tournamentsRes.json();
-        const tournament = tournaments[tournamentIndex];
-
-        if (tournament?.hasMemory) {
-          try {
-            const memRes = await fetch(
-              `${basePath}/data/${tournamentPath}/player_memories.json`,
-            );
-            const memData: TournamentMemories = await memRes.json();
-            setTournamentMemories(memData);
-            setCachedMemoryTournamentPath(tournamentPath);
-          } catch {
-            setTournamentMemories(null);
-            setCachedMemoryTournamentPath(null);
-          }
-        } else {
-          setTournamentMemories(null);
-          setCachedMemoryTournamentPath(null);
-        }
+      const tournaments = await loadTournaments(basePath);
+      const tournament = tournaments[tournamentIndex];
+      if (tournament) {
+        await loadMemories(basePath, tournament, gameIndex);
+      } else {
+        setTournamentMemories(null);
       }
     } catch (error) {
       console.error("Failed to load game:", error);
@@ -198,6 +212,7 @@ function HomeContent() {
               game={selectedGame}
               memories={tournamentMemories}
               gameIndex={currentGameIndex ?? undefined}
+              tournamentPath={selectedTournamentPath ?? undefined}
             />
           )
         ) : (
@@ -5,7 +5,7 @@ import { TournamentInfo } from "@/types/game";
 import { getBasePath } from "@/lib/config";
 
 interface GameSelectorProps {
-  onSelectGame: (tournamentPath: string, gameId: string, tournamentIndex: number, gameIndex: number) => void;
+  onSelectGame: (tournamentPath: string, tournamentIndex: number, gameIndex: number) => void;
   collapsed: boolean;
   onToggle: () => void;
   initialTournamentIndex: number | null;
@@ -75,8 +75,7 @@ export default function GameSelector({
           ) {
             initialLoadDone.current = true;
             setSelectedGameIndex(initialGameIndex);
-            const game = data[initialGameIndex];
-            onSelectGame(tournament.path, game.id, selectedTournamentIndex, initialGameIndex);
+            onSelectGame(tournament.path, selectedTournamentIndex, initialGameIndex);
           }
         });
     }
@@ -114,7 +113,7 @@ export default function GameSelector({
   const handleSelectGame = (gameIndex: number) => {
     if (selectedTournament && selectedTournamentIndex !== null) {
       setSelectedGameIndex(gameIndex);
-      onSelectGame(selectedTournament.path, games[gameIndex].id, selectedTournamentIndex, gameIndex);
+      onSelectGame(selectedTournament.path, selectedTournamentIndex, gameIndex);
     }
   };
 
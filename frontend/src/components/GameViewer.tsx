@@ -1,15 +1,27 @@
 "use client";
 
-import { useState, useMemo } from "react";
+import { useState, useMemo, useEffect } from "react";
 import { useSearchParams } from "next/navigation";
 import Link from "next/link";
 import { Game, Mission, TournamentMemories, Reflection } from "@/types/game";
 import PlayerCard from "./PlayerCard";
+import { getBasePath } from "@/lib/config";
+import { withReasoning } from "@/lib/gameData";
 
 interface GameViewerProps {
   game: Game;
   memories?: TournamentMemories | null;
   gameIndex?: number;
+  tournamentPath?: string;
+}
+
+function ReasoningNote({ text }: { text?: string | null }) {
+  if (!text) return null;
+  return (
+    <p className="mt-2 pl-2 border-l border-gray-300 text-xs text-gray-500 whitespace-pre-wrap">
+      {text}
+    </p>
+  );
 }
 
 type Phase =
@@ -21,9 +33,10 @@ type Phase =
   | "assassin";
 
 export default function GameViewer({
-  game,
+  game: loadedGame,
   memories,
   gameIndex,
+  tournamentPath,
 }: GameViewerProps) {
   const searchParams = useSearchParams();
   const [currentMission, setCurrentMission] = useState(0);
@@ -34,6 +47,48 @@ export default function GameViewer({
     string | null
   >(null);
 
+  // reasoning_content lives in a sidecar file, fetched the first time it is shown
+  const [showReasoning, setShowReasoning] = useState(false);
+  const [reasoningGame, setReasoningGame] = useState<Game | null>(null);
+  const [reasoningLoading, setReasoningLoading] = useState(false);
+
+  useEffect(() => {
+    setReasoningGame(null);
+    setShowReasoning(false);
+  }, [loadedGame]);
+
+  const game = showReasoning && reasoningGame ? reasoningGame : loadedGame;
+  const canLoadReasoning =
+    tournamentPath !== undefined && gameIndex !== undefined;
+
+  const toggleReasoning = async () => {
+    if (showReasoning) {
+      setShowReasoning(false);
+      return;
+    }
+    if (
+      !reasoningGame &&
+      tournamentPath !== undefined &&
+      gameIndex !== undefined
+    ) {
+      setReasoningLoading(true);
+      try {
+        setReasoningGame(
+          await withReasoning(
+            getBasePath(),
+            tournamentPath,
+            loadedGame,
+            gameIndex + 1,
+          ),
+        );
+      } catch {
+        setReasoningGame(loadedGame);
+      }
+      setReasoningLoading(false);
+    }
+    setShowReasoning(true);
+  };
+
   const hasMemories = memories && gameIndex !== undefined && gameIndex > 0;
 
   const getPlayerReflections = (playerName: string): Reflection[] => {
@@ -92,6 +147,20 @@ export default function GameViewer({
             </p>
           </div>
           <div className="flex items-center gap-2">
+            {canLoadReasoning && (
+              <button
+                onClick={toggleReasoning}
+                disabled={reasoningLoading}
+                className={`px-4 py-1.5 rounded-full text-sm font-semibold transition-colors font-display ${
+                  showReasoning
+                    ? "bg-gray-700 text-white hover:bg-gray-600"
+                    : "bg-gray-100 text-gray-700 hover:bg-gray-200"
+                }`}
+                title="Show the models' reasoning summaries"
+              >
+                {reasoningLoading ? "Loading..." : "Reasoning"}
+              </button>
+            )}
             {hasMemories && (
               <button
                 onClick={() => {
@@ -249,6 +318,7 @@ export default function GameViewer({
                     </span>
                   </div>
                   <p className="text-sm text-gray-700">{msg.content}</p>
+                  {showReasoning && <ReasoningNote text={msg.reasoning_content} />}
                 </div>
               );
             })}
@@ -299,6 +369,11 @@ export default function GameViewer({
                 <p className="text-sm text-gray-600 mb-3">
                   {proposal.reasoning}
                 </p>
+                {showReasoning && (
+                  <div className="mb-3">
+                    <ReasoningNote text={proposal.reasoning_content} />
+                  </div>
+                )}
                 <span
                   className={`px-2 py-1 rounded text-xs font-medium ${
                     proposal.vote_result === "approved"
@@ -369,6 +444,9 @@ export default function GameViewer({
                         </span>
                       </div>
                       <p className="text-sm text-gray-600">{vote.comment}</p>
+                      {showReasoning && (
+                        <ReasoningNote text={vote.reasoning_content} />
+                      )}
                     </div>
                   );
                 })}
@@ -459,6 +537,9 @@ export default function GameViewer({
                       </span>
                     </div>
                     <p className="text-sm text-gray-700">{msg.content}</p>
+                    {showReasoning && (
+                      <ReasoningNote text={msg.reasoning_content} />
+                    )}
                   </div>
                 );
               })}
@@ -481,6 +562,9 @@ export default function GameViewer({
                   </span>
                 </p>
                 <p className="text-gray-600">{game.assassin_phase.reasoning}</p>
+                {showReasoning && (
+                  <ReasoningNote text={game.assassin_phase.reasoning_content} />
+                )}
               </div>
               <span
                 className={`px-3 py-1 rounded text-sm font-medium ${
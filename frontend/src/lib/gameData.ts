@@ -0,0 +1,84 @@
+import { Game, Reflection, TournamentMemories } from "@/types/game";
+
+// Loads one game from the export_viewer.py layout: games/<n>.json, keyed by
+// 1-based game number.
+export async function fetchGame(
+  basePath: string,
+  tournamentPath: string,
+  gameNumber: number,
+): Promise<Game | undefined> {
+  const res = await fetch(
+    `${basePath}/data/${tournamentPath}/games/${gameNumber}.json`,
+  );
+  return res.ok ? res.json() : undefined;
+}
+
+// Reflections written after games 1..upToGame, shaped like player_memories.json,
+// from one reflections/<n>.json per game. `cache` (game number -> reflections)
+// keeps stepping through a tournament to one new file per game.
+export async function fetchMemories(
+  basePath: string,
+  tournamentPath: string,
+  upToGame: number,
+  cache: Map<number, Reflection[]>,
+): Promise<TournamentMemories> {
+  const missing: number[] = [];
+  for (let n = 1; n <= upToGame; n++) {
+    if (!cache.has(n)) missing.push(n);
+  }
+  await Promise.all(
+    missing.map(async (n) => {
+      const res = await fetch(
+        `${basePath}/data/${tournamentPath}/reflections/${n}.json`,
+      );
+      cache.set(n, res.ok ? await res.json() : []);
+    }),
+  );
+
+  const memories: TournamentMemories = {
+    session_id: tournamentPath,
+    num_games: upToGame,
+    player_memories: {},
+  };
+  for (let n = 1; n <= upToGame; n++) {
+    for (const reflection of cache.get(n) ?? []) {
+      const name = reflection.player_name;
+      memories.player_memories[name] ??= { player_name: name, reflections: [] };
+      memories.player_memories[name].reflections.push(reflection);
+    }
+  }
+  return memories;
+}
+
+function mergeSidecar(target: unknown, sidecar: unknown): void {
+  if (!sidecar || typeof sidecar !== "object" || !target) return;
+  if (Array.isArray(sidecar)) {
+    sidecar.forEach((side, i) => mergeSidecar((target as unknown[])[i], side));
+    return;
+  }
+  const obj = target as Record<string, unknown>;
+  for (const [key, side] of Object.entries(sidecar)) {
+    if (side !== null && typeof side === "object") {
+      mergeSidecar(obj[key], side);
+    } else {
+      obj[key] = side;
+    }
+  }
+}
+
+// Returns a copy of the game with reasoning_content filled in from its
+// reasoning/<n>.json sidecar, or the game unchanged when there is none.
+export async function withReasoning(
+  basePath: string,
+  tournamentPath: string,
+  game: Game,
+  gameNumber: number,
+): Promise<Game> {
+  const res = await fetch(
+    `${basePath}/data/${tournamentPath}/reasoning/${gameNumber}.json`,
+  );
+  if (!res.ok) return game;
+  const merged: Game = structuredClone(game);
+  mergeSidecar(merged, await res.json());
+  return merged;
+}
@@ -0,0 +1,363 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+
+from dataset_loader import find_game_files, load_game
+
+DEFAULT_DB = "avalon_games.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT UNIQUE NOT NULL,
+    collection TEXT NOT NULL,
+    game_number INTEGER,
+    game_id TEXT NOT NULL,
+    num_players INTEGER NOT NULL,
+    model TEXT,
+    reasoning_effort TEXT,
+    winner TEXT,
+    assassin TEXT,
+    assassin_guess TEXT,
+    assassin_correct INTEGER
+);
+CREATE TABLE IF NOT EXISTS players (
+    game INTEGER NOT NULL REFERENCES games(id),
+    name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    is_good INTEGER NOT NULL,
+    PRIMARY KEY (game, name)
+);
+CREATE TABLE IF NOT EXISTS missions (
+    game INTEGER NOT NULL REFERENCES games(id),
+    mission_number INTEGER NOT NULL,
+    num_proposals INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    result TEXT,
+    fail_count INTEGER,
+    PRIMARY KEY (game, mission_number)
+);
+CREATE TABLE IF NOT EXISTS proposals (
+    game INTEGER NOT NULL REFERENCES games(id),
+    mission_number INTEGER NOT NULL,
+    proposal_id INTEGER NOT NULL,
+    leader TEXT NOT NULL,
+    team TEXT NOT NULL,
+    reasoning TEXT,
+    vote_result TEXT,
+    PRIMARY KEY (game, mission_number, proposal_id)
+);
+CREATE TABLE IF NOT EXISTS votes (
+    game INTEGER NOT NULL REFERENCES games(id),
+    mission_number INTEGER NOT NULL,
+    proposal_id INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    role TEXT,
+    vote TEXT NOT NULL,
+    comment TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    game INTEGER NOT NULL REFERENCES games(id),
+    mission_number INTEGER,
+    phase TEXT NOT NULL,
+    global_turn_id INTEGER,
+    player TEXT NOT NULL,
+    role TEXT,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reflections (
+    game INTEGER NOT NULL REFERENCES games(id),
+    player TEXT NOT NULL,
+    role TEXT NOT NULL,
+    result TEXT NOT NULL,
+    self_assessment TEXT,
+    player_observations TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_games_winner ON games(winner);
+CREATE INDEX IF NOT EXISTS idx_games_players ON games(num_players);
+CREATE INDEX IF NOT EXISTS idx_players_role ON players(role, name);
+CREATE INDEX IF NOT EXISTS idx_missions_result ON missions(result);
+CREATE INDEX IF NOT EXISTS idx_votes_player ON votes(player, role);
+CREATE INDEX IF NOT EXISTS idx_votes_role ON votes(role);
+CREATE INDEX IF NOT EXISTS idx_votes_mission ON votes(game, mission_number);
+CREATE INDEX IF NOT EXISTS idx_messages_player ON messages(player, role);
+CREATE INDEX IF NOT EXISTS idx_messages_phase ON messages(phase, mission_number);
+CREATE INDEX IF NOT EXISTS idx_reflections_player ON reflections(player, role);
+"""
+
+
+@dataclass
+class GameRecord:
+    source: str
+    collection: str
+    game_number: Optional[int]
+    game_id: str
+    num_players: int
+    model: Optional[str]
+    reasoning_effort: Optional[str]
+    winner: Optional[str]
+
+
+@dataclass
+class VoteRecord:
+    source: str
+    mission_number: int
+    proposal_id: int
+    player: str
+    role: str
+    vote: str
+    comment: str
+    team: List[str]
+    vote_result: str
+
+
+@dataclass
+class MessageRecord:
+    source: str
+    mission_number: Optional[int]
+    phase: str
+    global_turn_id: Optional[int]
+    player: str
+    role: str
+    content: str
+
+
+@dataclass
+class AssassinationRecord:
+    source: str
+    assassin: str
+    guess: str
+    guess_role: str
+    correct: bool
+    merlin: str
+
+
+@dataclass
+class ReflectionRecord:
+    source: str
+    player: str
+    role: str
+    result: str
+    self_assessment: str
+    player_observations: Dict[str, str]
+
+
+class GameStore:
+    """Normalized SQLite copy of saved games and reflections, indexed by player, role, winner, mission and phase."""
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def has_source(self, source: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM games WHERE source = ?", (source,)).fetchone() is not None
+
+    def add_game(self, game: dict, source: str, reflections: List[dict] = None, commit: bool = True) -> bool:
+        """Insert one game dict (GameState layout). Returns False if the source was already imported."""
+        if self.has_source(source):
+            return False
+
+        collection = os.path.dirname(source)
+        if os.path.basename(collection) == "individual_games":
+            collection = os.path.dirname(collection)
+        match = re.search(r"game_(\d+)\.json$", source)
+        game_number = int(match.group(1)) if match else None
+
+        config = game.get("config") or {}
+        assassin_phase = game.get("assassin_phase")
+        cursor = self.conn.execute(
+            "INSERT INTO games (source, collection, game_number, game_id, num_players, model, reasoning_effort, "
+            "winner, assassin, assassin_guess, assassin_correct) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                source, collection, game_number, game["game_id"], len(game["players"]),
+                config.get("model"), config.get("reasoning_effort"), game.get("winner"),
+                assassin_phase["assassin"] if assassin_phase else None,
+                assassin_phase["guess"] if assassin_phase else None,
+                int(assassin_phase["correct"]) if assassin_phase else None
+            )
+        )
+        game_pk = cursor.lastrowid
+        roles = {p["name"]: p["role"] for p in game["players"]}
+
+        self.conn.executemany(
+            "INSERT INTO players VALUES (?, ?, ?, ?)",
+            [(game_pk, p["name"], p["role"], int(p["is_good"])) for p in game["players"]]
+        )
+
+        for mission in game["missions"]:
+            number = mission["mission_number"]
+            final_team = mission["proposals"][mission["final_team_index"]]["team_members"]
+            self.conn.execute(
+                "INSERT INTO missions VALUES (?, ?, ?, ?, ?, ?)",
+                (game_pk, number, len(mission["proposals"]), json.dumps(final_team),
+                 mission["mission_result"], mission["fail_count"])
+            )
+            for proposal in mission["proposals"]:
+                self.conn.execute(
+                    "INSERT INTO proposals VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (game_pk, number, proposal["proposal_id"], proposal["leader"],
+                     json.dumps(proposal["team_members"]), proposal["reasoning"], proposal["vote_result"])
+                )
+                self.conn.executemany(
+                    "INSERT INTO votes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(game_pk, number, proposal["proposal_id"], v["player"], roles.get(v["player"]), v["vote"], v["comment"])
+                     for v in proposal["votes"]]
+                )
+            self.conn.executemany(
+                "INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(game_pk, number, m["phase"], m.get("global_turn_id"), m["player"], roles.get(m["player"]), m["content"])
+                 for m in mission["discussion"]]
+            )
+
+        if assassin_phase:
+            self.conn.executemany(
+                "INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(game_pk, None, m.get("phase", "evil_discussion"), m.get("global_turn_id"), m["player"], roles.get(m["player"]), m["content"])
+                 for m in assassin_phase["evil_discussion"]]
+            )
+
+        reflections = reflections if reflections is not None else game.get("post_game_reflections", [])
+        self.conn.executemany(
+            "INSERT INTO reflections VALUES (?, ?, ?, ?, ?, ?)",
+            [(game_pk, r["player_name"], r["role_played"], r["game_result"], r["self_assessment"],
+              json.dumps(r["player_observations"])) for r in reflections]
+        )
+
+        if commit:
+            self.conn.commit()
+        return True
+
+    def import_paths(self, paths: List[str]) -> int:
+        added = 0
+        for path in find_game_files(paths):
+            if self.has_source(path):
+                continue
+            if self.add_game(load_game(path), source=path, commit=False):
+                added += 1
+        self.conn.commit()
+        return added
+
+    def games(self, winner: str = None, num_players: int = None, reasoning_effort: str = None, collection: str = None) -> List[GameRecord]:
+        sql = "SELECT source, collection, game_number, game_id, num_players, model, reasoning_effort, winner FROM games WHERE 1=1"
+        sql, params = _filters(sql, [], winner=winner, num_players=num_players, reasoning_effort=reasoning_effort, collection=collection)
+        return [GameRecord(*row) for row in self.conn.execute(sql + " ORDER BY id", params)]
+
+    def votes(self, player: str = None, role: str = None, vote: str = None, mission_number: int = None,
+              winner: str = None) -> List[VoteRecord]:
+        """e.g. store.votes(player="Bob", role="merlin")"""
+        sql = (
+            "SELECT g.source, v.mission_number, v.proposal_id, v.player, v.role, v.vote, v.comment, p.team, p.vote_result "
+            "FROM votes v JOIN games g ON g.id = v.game "
+            "JOIN proposals p ON p.game = v.game AND p.mission_number = v.mission_number AND p.proposal_id = v.proposal_id "
+            "WHERE 1=1"
+        )
+        sql, params = _filters(sql, [], **{"v.player": player, "v.role": role, "v.vote": vote,
+                                           "v.mission_number": mission_number, "g.winner": winner})
+        rows = self.conn.execute(sql + " ORDER BY v.game, v.mission_number, v.proposal_id", params)
+        return [VoteRecord(*row[:7], team=json.loads(row[7]), vote_result=row[8]) for row in rows]
+
+    def messages(self, player: str = None, role: str = None, phase: str = None, mission_number: int = None) -> List[MessageRecord]:
+        sql = (
+            "SELECT g.source, m.mission_number, m.phase, m.global_turn_id, m.player, m.role, m.content "
+            "FROM messages m JOIN games g ON g.id = m.game WHERE 1=1"
+        )
+        sql, params = _filters(sql, [], **{"m.player": player, "m.role": role, "m.phase": phase,
+                                           "m.mission_number": mission_number})
+        return [MessageRecord(*row) for row in self.conn.execute(sql + " ORDER BY m.game, m.global_turn_id", params)]
+
+    def assassinations(self, guess_role: str = None, correct: bool = None, num_players: int = None) -> List[AssassinationRecord]:
+        """e.g. store.assassinations(guess_role="good") for guesses that hit a plain good player"""
+        sql = (
+            "SELECT g.source, g.assassin, g.assassin_guess, gp.role, g.assassin_correct, mp.name "
+            "FROM games g "
+            "JOIN players gp ON gp.game = g.id AND gp.name = g.assassin_guess "
+            "JOIN players mp ON mp.game = g.id AND mp.role = 'merlin' "
+            "WHERE g.assassin IS NOT NULL"
+        )
+        sql, params = _filters(sql, [], **{"gp.role": guess_role, "g.num_players": num_players,
+                                           "g.assassin_correct": None if correct is None else int(correct)})
+        return [AssassinationRecord(row[0], row[1], row[2], row[3], bool(row[4]), row[5])
+                for row in self.conn.execute(sql + " ORDER BY g.id", params)]
+
+    def reflections(self, player: str = None, role: str = None, result: str = None) -> List[ReflectionRecord]:
+        sql = (
+            "SELECT g.source, r.player, r.role, r.result, r.self_assessment, r.player_observations "
+            "FROM reflections r JOIN games g ON g.id = r.game WHERE 1=1"
+        )
+        sql, params = _filters(sql, [], **{"r.player": player, "r.role": role, "r.result": result})
+        return [ReflectionRecord(*row[:5], player_observations=json.loads(row[5]))
+                for row in self.conn.execute(sql + " ORDER BY g.id", params)]
+
+
+def _filters(sql: str, params: list, **filters) -> tuple:
+    for column, value in filters.items():
+        if value is not None:
+            sql += f" AND {column} = ?"
+            params.append(value)
+    return sql, params
+
+
+def main():
+    """
+    python game_store.py import [paths...] [--db FILE]
+    python game_store.py votes|messages|assassinations|reflections|games [--field value ...] [--db FILE]
+
+    Example: python game_store.py votes --player Bob --role merlin
+    """
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return
+
+    command = sys.argv[1]
+    db_path = DEFAULT_DB
+    paths = []
+    filters = {}
+
+    args = sys.argv[2:]
+    i = 0
+    while i < len(args):
+        if args[i] == "--db" and i + 1 < len(args):
+            db_path = args[i + 1]
+            i += 2
+        elif args[i].startswith("--") and i + 1 < len(args):
+            value = args[i + 1]
+            filters[args[i][2:].replace("-", "_")] = int(value) if value.isdigit() else value
+            i += 2
+        else:
+            paths.append(args[i])
+            i += 1
+
+    store = GameStore(db_path)
+
+    if command == "import":
+        if not paths:
+            paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset")]
+        start_time = time.time()
+        added = store.import_paths(paths)
+        print(f"Imported {added} games into {db_path} ({time.time() - start_time:.2f}s)")
+    elif command in ("votes", "messages", "assassinations", "reflections", "games"):
+        if "correct" in filters:
+            filters["correct"] = str(filters["correct"]).lower() in ("1", "true", "yes")
+        start_time = time.time()
+        records = getattr(store, command)(**filters)
+        elapsed = time.time() - start_time
+        for record in records:
+            print(record)
+        print(f"\n{len(records)} {command} ({elapsed * 1000:.1f} ms)")
+    else:
+        print(main.__doc__)
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+import sys
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_CONCURRENCY = 16
+# Requests carrying this header always reach the upstream (hedged copies, see hedging.py)
+NO_COALESCE_HEADER = "X-Avalon-No-Coalesce"
+
+
+class GatewayError(Exception):
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class OpenAIUpstream:
+    """One pooled keep-alive client to the provider, shared by every request through the gateway."""
+
+    def __init__(self, http2: bool = True):
+        import openai
+        http_client = None
+        if http2:
+            try:
+                http_client = openai.DefaultHttpxClient(http2=True)
+            except ImportError:
+                print("HTTP/2 unavailable (install h2); using pooled HTTP/1.1 keep-alive connections")
+        self.client = openai.OpenAI(http_client=http_client)
+
+    def complete(self, body: dict) -> dict:
+        import openai
+        try:
+            response = self.client.chat.completions.create(**body)
+        except openai.APIStatusError as e:
+            raise GatewayError(str(e), e.status_code)
+        except openai.APIError as e:
+            raise GatewayError(str(e))
+        return response.model_dump()
+
+    def respond(self, body: dict) -> dict:
+        import openai
+        try:
+            response = self.client.responses.create(**body)
+        except openai.APIStatusError as e:
+            raise GatewayError(str(e), e.status_code)
+        except openai.APIError as e:
+            raise GatewayError(str(e))
+        return response.model_dump()
+
+
+class StandInUpstream:
+    """Offline upstream for tests: answers each Avalon prompt with a valid canned reply after `latency` seconds.
+
+    With `tail_alpha` the latency is `latency` times a Pareto(tail_alpha) draw instead, giving the
+    heavy tail of real reasoning calls (smaller alpha, heavier tail).
+
+    Its Responses API keeps each conversation under its response id, like the provider,
+    forgetting the oldest beyond `max_stored_responses` so expired-id fallbacks can be exercised.
+    """
+
+    def __init__(self, latency: float = 0.05, seed: int = 0, tail_alpha: Optional[float] = None,
+                 max_stored_responses: Optional[int] = None):
+        self.latency = latency
+        self.tail_alpha = tail_alpha
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.max_stored_responses = max_stored_responses
+        self.stored: "OrderedDict[str, list]" = OrderedDict()
+
+    def _reply(self, user_prompt: str) -> str:
+        with self.lock:
+            if "Propose a team of" in user_prompt:
+                size = int(user_prompt.split("Propose a team of ")[1].split()[0])
+                names = user_prompt.split("Available players: ")[1].split("\n")[0].split(", ")
+                return json.dumps({"team": self.rng.sample(names, size), "reasoning": "Stand-in team."})
+            if "Vote on this team" in user_prompt:
+                return json.dumps({"vote": self.rng.choice(["approve", "approve", "reject"]), "comment": "Stand-in vote."})
+            if "choose 'success' or 'fail'" in user_prompt:
+                return json.dumps({"action": self.rng.choice(["success", "fail"]), "reasoning": "Stand-in action."})
+            if "choose who you think is Merlin" in user_prompt:
+                return json.dumps({"guess": "", "reasoning": "Stand-in guess."})
+            if "player_observations" in user_prompt:
+                return json.dumps({"self_assessment": "Stand-in reflection.", "player_observations": {}})
+            return "I have nothing conclusive yet, let's watch the votes."
+
+    def complete(self, body: dict) -> dict:
+        if self.tail_alpha:
+            with self.lock:
+                delay = self.latency * self.rng.paretovariate(self.tail_alpha)
+        else:
+            delay = self.latency
+        time.sleep(delay)
+        messages = body.get("messages") or []
+        content = self._reply(messages[-1]["content"] if messages else "")
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-standin-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stand-in"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def respond(self, body: dict) -> dict:
+        """Responses API call (JSON shaped like the provider's) continuing `previous_response_id`."""
+        turn = body.get("input") or []
+        if isinstance(turn, str):
+            turn = [{"role": "user", "content": turn}]
+        previous_response_id = body.get("previous_response_id")
+        with self.lock:
+            if previous_response_id is not None and previous_response_id not in self.stored:
+                raise GatewayError(f"Previous response with id '{previous_response_id}' not found.", 400)
+            messages = (self.stored.get(previous_response_id) or []) + list(turn)
+        data = self.complete({"model": body.get("model"), "messages": messages})
+        content = data["choices"][0]["message"]["content"]
+        response_id = data["id"].replace("chatcmpl", "resp")
+        with self.lock:
+            self.stored[response_id] = messages + [{"role": "assistant", "content": content}]
+            while self.max_stored_responses is not None and len(self.stored) > self.max_stored_responses:
+                self.stored.popitem(last=False)
+        return {
+            "id": response_id,
+            "object": "response",
+            "created_at": data["created"],
+            "model": data["model"],
+            "status": "completed",
+            "output": [{
+                "type": "message",
+                "id": response_id.replace("resp", "msg"),
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": content, "annotations": []}]
+            }],
+            "usage": {
+                "input_tokens": data["usage"]["prompt_tokens"],
+                "output_tokens": data["usage"]["completion_tokens"],
+                "total_tokens": data["usage"]["total_tokens"]
+            }
+        }
+
+
+class StandInClient:
+    """In-process OpenAI-style client (client.chat.completions.create, client.responses.create)
+    answered by a StandInUpstream. `max_stored_responses` sets the upstream's response store size.
+    """
+
+    def __init__(self, upstream: Optional[StandInUpstream] = None, max_stored_responses: Optional[int] = None):
+        self.upstream = upstream or StandInUpstream()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.responses = SimpleNamespace(create=self.create_response)
+        if max_stored_responses is not None:
+            self.upstream.max_stored_responses = max_stored_responses
+
+    def create(self, **kwargs):
+        data = self.upstream.complete(kwargs)
+        choice = data["choices"][0]
+        return SimpleNamespace(
+            id=data["id"],
+            model=data["model"],
+            choices=[SimpleNamespace(index=0, message=SimpleNamespace(**choice["message"]), finish_reason=choice["finish_reason"])],
+            usage=SimpleNamespace(**data["usage"])
+        )
+
+    def create_response(self, model: str, input, previous_response_id: Optional[str] = None, reasoning: dict = None, **kwargs):
+        body = {"model": model, "input": input}
+        if previous_response_id is not None:
+            body["previous_response_id"] = previous_response_id
+        data = self.upstream.respond(body)
+        return SimpleNamespace(
+            id=data["id"],
+            model=data["model"],
+            output_text=data["output"][0]["content"][0]["text"],
+            usage=SimpleNamespace(input_tokens=data["usage"]["input_tokens"], output_tokens=data["usage"]["output_tokens"])
+        )
+
+class Gateway:
+    """Global concurrency cap, request-rate limit and in-flight coalescing in front of one upstream.
+
+    Identical request bodies that arrive while the first is still in flight wait for and share
+    its response rather than making a second upstream call. Responses API calls share the cap
+    and rate limit but are never coalesced: each one continues its own previous_response_id.
+    Neither are requests sent with NO_COALESCE_HEADER, such as hedged copies, which exist
+    precisely to make a second upstream call.
+    """
+
+    def __init__(self, upstream, max_concurrency: int = MAX_CONCURRENCY, requests_per_minute: Optional[float] = None,
+                 coalesce: bool = True):
+        self.upstream = upstream
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_start = 0.0
+        self.coalesce = coalesce
+        self.in_flight: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "upstream_calls": 0, "coalesced": 0, "uncoalesced": 0, "errors": 0, "active": 0,
+                      "rate_wait_seconds": 0.0}
+
+    def _wait_for_rate(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+            self.stats["rate_wait_seconds"] += start - now
+        time.sleep(start - now)
+
+    def _call_upstream(self, body: dict, call=None) -> dict:
+        with self.slots:
+            self._wait_for_rate()
+            with self.lock:
+                self.stats["upstream_calls"] += 1
+                self.stats["active"] += 1
+            try:
+                return (call or self.upstream.complete)(body)
+            finally:
+                with self.lock:
+                    self.stats["active"] -= 1
+
+    def respond(self, body: dict) -> dict:
+        """One Responses API call; not coalesced (it depends on the previous_response_id's state)."""
+        with self.lock:
+            self.stats["requests"] += 1
+        try:
+            return self._call_upstream(body, self.upstream.respond)
+        except Exception:
+            with self.lock:
+                self.stats["errors"] += 1
+            raise
+
+    def complete(self, body: dict, coalesce: bool = True) -> dict:
+        with self.lock:
+            self.stats["requests"] += 1
+            if self.coalesce and not coalesce:
+                self.stats["uncoalesced"] += 1
+
+        if not (self.coalesce and coalesce):
+            try:
+                return self._call_upstream(body)
+            except Exception:
+                with self.lock:
+                    self.stats["errors"] += 1
+                raise
+
+        key = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.in_flight[key] = future
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._call_upstream(body)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            with self.lock:
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {**self.stats, "max_concurrency": self.max_concurrency, "in_flight_keys": len(self.in_flight)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    gateway: Gateway = None
+
+    def _send(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+        if path.endswith("/chat/completions"):
+            coalesce = not self.headers.get(NO_COALESCE_HEADER)
+            call = lambda body: self.gateway.complete(body, coalesce)
+        elif path.endswith("/responses"):
+            call = self.gateway.respond
+        else:
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            self._send(200, call(body))
+        except GatewayError as e:
+            self._send(e.status_code, {"error": {"message": str(e)}})
+        except Exception as e:
+            self._send(502, {"error": {"message": repr(e)}})
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/stats", "/health"):
+            self._send(200, self.gateway.snapshot())
+        else:
+            self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_gateway(gateway: Gateway, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Serve `gateway` from a background thread. Point clients at http://host:port/v1 (OPENAI_BASE_URL)."""
+    handler = type("GatewayHandler", (_Handler,), {"gateway": gateway})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """
+    python gateway.py [--host 127.0.0.1] [--port 8765] [--max-concurrency 16] [--rpm N]
+                      [--no-coalesce] [--no-http2] [--stand-in [--latency 0.05] [--tail-alpha 1.5]]
+
+    Then run workers with OPENAI_BASE_URL=http://127.0.0.1:8765/v1 so every game and tournament
+    process shares this gateway's connection pool and limits. --stand-in answers offline.
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    max_concurrency = MAX_CONCURRENCY
+    rpm = None
+    latency = 0.05
+    tail_alpha = None
+    for i, arg in enumerate(args):
+        if arg == "--host" and i + 1 < len(args):
+            host = args[i + 1]
+        elif arg == "--port" and i + 1 < len(args):
+            port = int(args[i + 1])
+        elif arg == "--max-concurrency" and i + 1 < len(args):
+            max_concurrency = int(args[i + 1])
+        elif arg == "--rpm" and i + 1 < len(args):
+            rpm = float(args[i + 1])
+        elif arg == "--latency" and i + 1 < len(args):
+            latency = float(args[i + 1])
+        elif arg == "--tail-alpha" and i + 1 < len(args):
+            tail_alpha = float(args[i + 1])
+
+    if "--stand-in" in args:
+        upstream = StandInUpstream(latency=latency, tail_alpha=tail_alpha)
+    else:
+        upstream = OpenAIUpstream(http2="--no-http2" not in args)
+    gateway = Gateway(upstream, max_concurrency=max_concurrency, requests_per_minute=rpm,
+                      coalesce="--no-coalesce" not in args)
+    server = start_gateway(gateway, host, port)
+
+    print(f"Gateway listening on http://{host}:{port}/v1 "
+          f"({'stand-in' if '--stand-in' in args else 'OpenAI'} upstream, max {max_concurrency} concurrent"
+          f"{f', {rpm:g} req/min' if rpm else ''})")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"  {json.dumps(gateway.snapshot())}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import sys
+import time
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from statistics import quantiles
+from typing import Dict, Optional
+
+from gateway import NO_COALESCE_HEADER
+
+PERCENTILE = 0.9
+WINDOW = 50
+MIN_SAMPLES = 10
+
+
+def _tokens(response) -> int:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0
+    return (getattr(usage, "prompt_tokens", 0) or 0) + (getattr(usage, "completion_tokens", 0) or 0)
+
+
+class Hedger:
+    """Hedged chat calls: if a call outlives the `percentile` latency of recent calls in its phase,
+    an identical request is sent and whichever answers first is used.
+
+    The sync OpenAI client cannot abort a request in flight, so the slower copy is abandoned:
+    its result is discarded and its tokens are counted as wasted once it finishes. Share one
+    Hedger across the games of a tournament so the latency history carries over.
+    """
+
+    def __init__(self, percentile: float = PERCENTILE, window: int = WINDOW, min_samples: int = MIN_SAMPLES,
+                 max_workers: int = 16):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "hedged": 0, "hedge_won": 0, "wasted_tokens": 0})
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self.lock = threading.Lock()
+
+    def delay(self, phase: str) -> Optional[float]:
+        """Seconds to wait before hedging a call in `phase`, or None until enough latencies are known."""
+        with self.lock:
+            history = list(self.latencies[phase])
+        if len(history) < self.min_samples:
+            return None
+        cut = round(self.percentile * 100)
+        return quantiles(history, n=100, method="inclusive")[cut - 1] if 0 < cut < 100 else max(history)
+
+    def _count(self, phase: str, game_stats: Optional[dict], key: str, amount: int = 1):
+        with self.lock:
+            self.stats[phase][key] += amount
+            if game_stats is not None:
+                game_stats[key] = game_stats.get(key, 0) + amount
+
+    def _waste(self, phase: str, game_stats: Optional[dict]):
+        def callback(future):
+            if future.exception() is None:
+                self._count(phase, game_stats, "wasted_tokens", _tokens(future.result()))
+        return callback
+
+    def create(self, client, phase: Optional[str], game_stats: Optional[dict] = None, **request):
+        """client.chat.completions.create(**request), hedged. `game_stats` collects the same counters per game."""
+        if hasattr(client, "record"):
+            # A replay.RecordingClient: hedge the client it wraps and record the winning answer once,
+            # so the trace replays without hedging
+            return client.record(lambda **r: self.create(client.inner, phase, game_stats, **r), **request)
+        phase = phase or "other"
+        self._count(phase, game_stats, "calls")
+        start_time = time.time()
+        hedge_after = self.delay(phase)
+
+        primary = self.executor.submit(client.chat.completions.create, **request)
+        pending = {primary}
+        if hedge_after is not None:
+            done, _ = wait(pending, timeout=hedge_after)
+            if not done:
+                self._count(phase, game_stats, "hedged")
+                # Marked so a gateway (gateway.py) sends it upstream instead of coalescing it with the primary
+                pending.add(self.executor.submit(client.chat.completions.create, **request,
+                                                 extra_headers={NO_COALESCE_HEADER: "1"}))
+
+        # First successful answer wins; an error only counts once every copy has failed
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is not primary:
+                    self._count(phase, game_stats, "hedge_won")
+                for loser in pending:
+                    loser.add_done_callback(self._waste(phase, game_stats))
+                with self.lock:
+                    self.latencies[phase].append(time.time() - start_time)
+                return future.result()
+        raise error
+
+    def summary(self) -> Dict[str, dict]:
+        with self.lock:
+            return {phase: {**s, "hedge_rate": round(s["hedged"] / s["calls"], 3) if s["calls"] else 0.0}
+                    for phase, s in self.stats.items()}
+
+
+def main():
+    """
+    Benchmark against the heavy-tailed offline stand-in (no API calls):
+    python hedging.py [--games 5] [--percentile 0.9] [--latency 0.02] [--tail-alpha 1.5] [--gateway]
+
+    With --gateway the games call a local stand-in gateway through the OpenAI SDK, as workers do
+    with OPENAI_BASE_URL, and the gateway's counters show every hedge reaching the upstream.
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    num_games = 5
+    percentile = PERCENTILE
+    latency = 0.02
+    tail_alpha = 1.5
+    for i, arg in enumerate(args):
+        if arg == "--games" and i + 1 < len(args):
+            num_games = int(args[i + 1])
+        elif arg == "--percentile" and i + 1 < len(args):
+            percentile = float(args[i + 1])
+        elif arg == "--latency" and i + 1 < len(args):
+            latency = float(args[i + 1])
+        elif arg == "--tail-alpha" and i + 1 < len(args):
+            tail_alpha = float(args[i + 1])
+
+    import io
+    import contextlib
+    from gateway import Gateway, StandInClient, StandInUpstream, start_gateway
+    from main import AvalonGame
+
+    results = {}
+    gateways = {}
+    for label, hedger in (("no hedging", None), (f"hedged at p{percentile * 100:g}", Hedger(percentile=percentile))):
+        upstream = StandInUpstream(latency=latency, seed=0, tail_alpha=tail_alpha)
+        if "--gateway" in args:
+            import openai
+            gateway = gateways[label] = Gateway(upstream)
+            server = start_gateway(gateway, port=0)
+            client = openai.OpenAI(base_url=f"http://127.0.0.1:{server.server_address[1]}/v1", api_key="stand-in",
+                                   max_retries=0)
+        else:
+            client = StandInClient(upstream)
+        durations = []
+        for i in range(num_games):
+            game = AvalonGame(seed=i, llm_client=client, hedger=hedger)
+            start_time = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                game.play_game()
+            durations.append(time.time() - start_time)
+        results[label] = (durations, hedger)
+
+    print(f"{num_games} games per setting, stand-in latency {latency}s x Pareto({tail_alpha})\n")
+    for label, (durations, hedger) in results.items():
+        durations.sort()
+        print(f"{label}: mean {sum(durations) / len(durations):.2f}s/game, worst {durations[-1]:.2f}s")
+        if hedger:
+            totals = defaultdict(int)
+            for stats in hedger.summary().values():
+                for key in ("calls", "hedged", "hedge_won", "wasted_tokens"):
+                    totals[key] += stats[key]
+            print(f"  hedged {totals['hedged']}/{totals['calls']} calls ({totals['hedged'] / max(totals['calls'], 1):.1%}), "
+                  f"hedge answered first {totals['hedge_won']} times, {totals['wasted_tokens']} tokens wasted")
+        if label in gateways:
+            g = gateways[label].snapshot()
+            print(f"  gateway: {g['requests']} requests, {g['upstream_calls']} upstream calls, {g['coalesced']} coalesced, "
+                  f"{g['uncoalesced']} sent upstream uncoalesced")
+            if hedger and g["uncoalesced"] != totals["hedged"]:
+                print(f"  ⚠️  {totals['hedged']} hedges but only {g['uncoalesced']} bypassed coalescing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import subprocess
+from statistics import median
+from typing import Dict, List
+
+# Modules analysis tools, pool workers and tests start from; "openai" is the SDK itself for reference
+MODULES = ["rules", "schema", "codec", "main", "multi_game_runner", "belief_tracker", "analytics", "openai"]
+
+_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - start, 'openai' in sys.modules)\n"
+)
+
+
+def time_import(module: str, repeat: int = 5) -> Dict:
+    """Median wall time of `import module` in fresh interpreters, and whether it loaded the OpenAI SDK."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    env["PYTHONPATH"] = here + os.pathsep + env.get("PYTHONPATH", "")
+    samples = []
+    loads_sdk = False
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)], cwd=here, env=env,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            return {"module": module, "error": result.stderr.strip().splitlines()[-1]}
+        seconds, sdk = result.stdout.split()
+        samples.append(float(seconds))
+        loads_sdk = sdk == "True"
+    return {"module": module, "median_ms": round(median(samples) * 1000, 1), "loads_openai": loads_sdk}
+
+
+def main():
+    """
+    python import_benchmark.py [modules...] [--repeat 5] [--output startup.json]
+
+    Startup cost of the project's modules: each import is timed in a fresh interpreter without
+    OPENAI_API_KEY. Only the first real LLM call (main.get_client) should load the OpenAI SDK.
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    modules: List[str] = []
+    repeat = 5
+    output_file = None
+    i = 0
+    while i < len(args):
+        if args[i] == "--repeat" and i + 1 < len(args):
+            repeat = int(args[i + 1])
+            i += 2
+        elif args[i] == "--output" and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 2
+        else:
+            modules.append(args[i])
+            i += 1
+
+    results = [time_import(module, repeat) for module in modules or MODULES]
+    print(f"Import time, median of {repeat} fresh interpreters:")
+    for r in results:
+        if "error" in r:
+            print(f"  {r['module']:<18} failed: {r['error']}")
+        else:
+            sdk = "  (loads openai)" if r["loads_openai"] and r["module"] != "openai" else ""
+            print(f"  {r['module']:<18} {r['median_ms']:>7.1f} ms{sdk}")
+
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Results saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
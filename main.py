@@ -2,162 +2,168 @@ import os
 import json
 import random
 import time
+import threading
 from datetime import datetime
-from typing import List, Optional
-from dataclasses import dataclass, asdict
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import metrics
+from tracing import span, traced
+from prompts import Prompt
+from sessions import SessionManager
+from rules import MISSION_TEAM_SIZES, ROLE_CONFIGS
+from schema import (
+    Player, Message, TeamProposal, Vote, MissionAction, Proposal, Mission, AssassinPhase,
+    BeliefSnapshot, EffortDowngrade, PromptSize, GameConfig, GameState
+)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The shared OpenAI client, created on first use so importing this module never loads the SDK."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from openai import OpenAI
+            _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _client
+
+
+class LazyClient:
+    """Default llm_client: forwards to get_client(), so the SDK loads on the first real request."""
+
+    @property
+    def chat(self):
+        return get_client().chat
+
+    @property
+    def responses(self):
+        return get_client().responses
+
+
+client = LazyClient()
 
 MODEL = "gpt-5.1"
 REASONING_EFFORT = "low"
 NUM_MESSAGES_PER_PLAYER = 1
+DISCUSSION_MODE = "sequential"  # or "simultaneous": each round's speakers only see earlier rounds
+REASONING_EFFORTS = ["minimal", "low", "medium", "high"]
 
-MISSION_TEAM_SIZES = {
-    5: [2, 3, 2, 3, 3],
-    6: [2, 3, 4, 3, 4],
-    7: [2, 3, 3, 4, 4],
-    8: [3, 4, 4, 5, 5],
-    9: [3, 4, 4, 5, 5],
-    10: [3, 4, 4, 5, 5]
-}
+# Call sites a routing policy can send to a different model / reasoning effort
+ROUTED_PHASES = ["discussion", "proposal", "vote", "mission_action", "evil_discussion", "assassin_guess", "reflection"]
+# Calls a per-game budget never downgrades
+PROTECTED_PHASES = ["mission_action", "assassin_guess"]
+BUDGET_FLOOR = "low"  # lowest effort a budget downgrade goes to (gpt-5.1 has no "minimal")
 
-ROLE_CONFIGS = {
-    5: {
-        "roles": ["merlin", "good", "good", "assassin", "evil"],
-        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve"]
-    },
-    6: {
-        "roles": ["merlin", "percival", "good", "good", "morgana", "mordred"],
-        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank"],
-        "assassin_role": "mordred"
-    },
-    7: {
-        "roles": ["merlin", "percival", "good", "good", "morgana", "mordred", "oberon"],
-        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace"],
-        "assassin_role": "morgana"
-    },
-    8: {
-        "roles": ["merlin", "percival", "good", "good", "good", "morgana", "mordred", "assassin"],
-        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"]
-    },
-    9: {
-        "roles": ["merlin", "percival", "good", "good", "good", "good", "morgana", "mordred", "assassin"],
-        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry", "Iris"]
-    },
-    10: {
-        "roles": ["merlin", "percival", "good", "good", "good", "good", "morgana", "mordred", "oberon", "assassin"],
-        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry", "Iris", "Jack"]
-    }
-}
 
-@dataclass
-class Player:
-    name: str
-    role: str
-    is_good: bool
-    special_knowledge: List[str]
-    
-@dataclass
-class Message:
-    player: str
-    content: str
-    timestamp: int
-    global_turn_id: int
-    phase: str
-    thinking_time: float
-    reasoning_content: Optional[str] = None
-    
-@dataclass
-class TeamProposal:
-    leader: str
-    team_members: List[str]
-    reasoning: str
-    thinking_time: float
-    reasoning_content: Optional[str] = None
-    
-@dataclass
-class Vote:
-    player: str
-    vote: str
-    comment: str
-    thinking_time: float
-    reasoning_content: Optional[str] = None
-    
-@dataclass
-class MissionAction:
-    player: str
-    action: str
+def parse_route(spec: str) -> tuple[str, dict]:
+    """Parse a --route spec: 'assassin_guess=high', 'discussion=gpt-5-mini:minimal' or 'vote:merlin=medium'.
 
-@dataclass
-class Proposal:
-    proposal_id: int
-    leader: str
-    team_members: List[str]
-    reasoning: str
-    thinking_time: float
-    reasoning_content: Optional[str]
-    votes: List[Vote]
-    vote_result: str
-    
-@dataclass
-class Mission:
-    mission_number: int
-    proposals: List[Proposal]
-    final_team_index: int
-    discussion: List[Message]
-    quest_actions: Optional[List[MissionAction]]
-    mission_result: Optional[str]
-    fail_count: Optional[int]
-    
-@dataclass
-class AssassinPhase:
-    assassin: str
-    evil_discussion: List[Message]
-    guess: str
-    reasoning: str
-    correct: bool
-    thinking_time: float
-    reasoning_content: Optional[str] = None
+    The key is a phase, 'phase:role', or '*:role'; the value is an effort, a model, or 'model:effort'.
+    """
+    key, value = spec.split("=", 1)
+    phase = key.split(":")[0]
+    if phase != "*" and phase not in ROUTED_PHASES:
+        raise ValueError(f"Unknown phase '{phase}' in route '{spec}' (choose from {', '.join(ROUTED_PHASES)})")
+    if value in REASONING_EFFORTS:
+        return key, {"reasoning_effort": value}
+    model, _, effort = value.partition(":")
+    route = {"model": model} if model else {}
+    if effort:
+        if effort not in REASONING_EFFORTS:
+            raise ValueError(f"Unknown reasoning effort '{effort}' in route '{spec}'")
+        route["reasoning_effort"] = effort
+    return key, route
 
-@dataclass
-class GameConfig:
-    model: str
-    reasoning_effort: str
-    mission_team_sizes: List[int]
-    num_messages_per_player: int
-    num_players: int
-    
-@dataclass
-class GameState:
-    game_id: str
-    config: GameConfig
-    players: List[Player]
-    missions: List[Mission]
-    winner: Optional[str]
-    assassin_phase: Optional[AssassinPhase]
+
+def resolve_route(routing: Optional[Dict[str, dict]], phase: Optional[str], role: Optional[str],
+                  model: str, reasoning_effort: str) -> tuple[str, str]:
+    """Model and effort for one call. The most specific entry wins: 'phase:role', then 'phase', then '*:role'."""
+    for key in (f"{phase}:{role}", phase, f"*:{role}"):
+        route = (routing or {}).get(key)
+        if route:
+            return route.get("model", model), route.get("reasoning_effort", reasoning_effort)
+    return model, reasoning_effort
+
+
+def budget_warning(reasoning_effort: str, routing: Optional[Dict[str, dict]], budget_floor: str = BUDGET_FLOOR) -> Optional[str]:
+    """Why a time/token budget could never lower any call's effort with these settings, or None.
+
+    budget_effort only steps down from efforts above the floor, and never in PROTECTED_PHASES, so
+    the budget is inert unless some non-protected phase runs above budget_floor.
+    """
+    if budget_floor not in REASONING_EFFORTS:
+        return f"unknown --budget-floor '{budget_floor}' (expected one of {', '.join(REASONING_EFFORTS)}); the budget will not lower any effort"
+    efforts = {reasoning_effort}
+    for key, route in (routing or {}).items():
+        if key.split(":")[0] not in PROTECTED_PHASES:
+            efforts.add(route.get("reasoning_effort", reasoning_effort))
+    floor = REASONING_EFFORTS.index(budget_floor)
+    if any(e in REASONING_EFFORTS and REASONING_EFFORTS.index(e) > floor for e in efforts):
+        return None
+    return (f"the budget cannot lower any effort: budget floor '{budget_floor}' is not below the effort of any "
+            f"non-protected phase ({', '.join(sorted(efforts))}); raise --reasoning-effort or lower --budget-floor")
 
 
 class AvalonGame:
-    def __init__(self, num_players: int = 5, model: str = MODEL, reasoning_effort: str = REASONING_EFFORT):
+    def __init__(self, num_players: int = 5, model: str = MODEL, reasoning_effort: str = REASONING_EFFORT, belief_tracking: bool = False, belief_hint: bool = False, heuristic_players: List[str] = None, discussion_mode: str = DISCUSSION_MODE, seed: Optional[int] = None, llm_client=None, routing: Optional[Dict[str, dict]] = None, time_budget: Optional[float] = None, token_budget: Optional[int] = None, budget_floor: str = BUDGET_FLOOR, hedger=None, prompt_token_cap: Optional[int] = None, session_mode: Optional[str] = None):
         self.game_id = f"avalon_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.model = model
         self.reasoning_effort = reasoning_effort
+        self.discussion_mode = discussion_mode
+        # Per-phase / per-role model and effort overrides (see resolve_route)
+        self.routing = routing or {}
+        self.routing_calls: Dict[str, dict] = {}
+        self.routing_lock = threading.Lock()
+        # Per-game wall-clock / token budget; low-stakes calls lose effort when the game runs behind
+        self.time_budget = time_budget
+        self.token_budget = token_budget
+        self.budget_floor = budget_floor
+        self.budget_start = time.time()
+        self.llm_calls = 0
+        self.tokens_used = 0
+        self.effort_downgrades: List[EffortDowngrade] = []
+        # Optional hedging.Hedger: duplicate calls that outlive recent latency and take the first answer
+        self.hedger = hedger
+        self.hedge_stats: Dict[str, int] = {}
+        # Estimated tokens per prompt section before every call; optional cap trims low-priority sections
+        self.prompt_token_cap = prompt_token_cap
+        self.prompt_sizes: List[PromptSize] = []
         self.num_players = num_players
         self.players: List[Player] = []
         self.missions: List[Mission] = []
-        self.current_leader_idx = random.randint(0, num_players - 1)
+        # All game randomness comes from one per-game RNG so a seed reproduces the game exactly
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.client = llm_client if llm_client is not None else client
+        # Opt-in per-player conversations that send only new context each turn (see sessions.py)
+        self.session_mode = session_mode
+        self.sessions = SessionManager(self.client, session_mode, prompt_token_cap) if session_mode else None
+        self.current_leader_idx = self.rng.randint(0, num_players - 1)
+        # Partially played mission / evil discussion to continue from (set by fork.py)
+        self.resume_mission: Optional[Mission] = None
+        self.resume_evil_discussion: Optional[List[Message]] = None
         self.good_wins = 0
         self.evil_wins = 0
         self.quests_completed = 0
         self.global_turn_counter = 0
+        # Ideal-observer posteriors over role assignments (see belief_tracker.py)
+        self.belief_tracking = belief_tracking or belief_hint
+        self.belief_hint = belief_hint
+        self.belief_tracker = None
+        self.belief_posteriors: List[BeliefSnapshot] = []
+        # Seats played by local rule-based agents instead of the LLM (see agents.py)
+        self.agents = {}
+        if heuristic_players:
+            from agents import build_agents
+            self.agents = build_agents(heuristic_players, ROLE_CONFIGS[num_players]["names"])
         
     def setup_game(self):
         config = ROLE_CONFIGS[self.num_players]
         player_names = config["names"]
         roles = config["roles"].copy()
-        random.shuffle(roles)
+        self.rng.shuffle(roles)
         
         # Determine who is the assassin
         assassin_role = config.get("assassin_role", "assassin")
@@ -184,6 +190,10 @@ class AvalonGame:
         # Store who the assassin is (for games where assassin is dual role)
         self.assassin_role = assassin_role
         
+        if self.belief_tracking:
+            from belief_tracker import BeliefTracker
+            self.belief_tracker = BeliefTracker([p.name for p in self.players])
+        
         for player in self.players:
             if player.role == "merlin":
                 player.special_knowledge = [p for p in evil_players if self.players[[pl.name for pl in self.players].index(p)].role != "mordred"]
@@ -197,12 +207,18 @@ class AvalonGame:
             elif player.role in ["evil", "assassin", "morgana", "mordred"]:
                 player.special_knowledge = [p for p in evil_players if p != player.name and self.players[[pl.name for pl in self.players].index(p)].role != "oberon"]
         
-        print(f"Game initialized: {self.game_id} ({self.num_players} players)")
+        print(f"Game initialized: {self.game_id} ({self.num_players} players, seed {self.seed})")
         for player in self.players:
             assassin_marker = " [ASSASSIN]" if player.role == self.assassin_role else ""
             print(f"  {player.name}: {player.role}{assassin_marker} (knows: {player.special_knowledge})")
     
     def get_player_context(self, player: Player, mission_num: int) -> str:
+        return self.player_context(player, mission_num).render()
+    
+    @traced("prompt")
+    def player_context(self, player: Player, mission_num: int) -> Prompt:
+        """The context every player prompt starts from, as named sections (see prompts.py)."""
+        prompt = Prompt()
         context = f"You are {player.name}, playing The Resistance: Avalon.\n\n"
         context += f"YOUR ROLE: {player.role.upper()}\n"
         
@@ -233,20 +249,23 @@ class AvalonGame:
             context += "Sabotage missions and deceive the good players!\n"
         else:
             context += "You are on the good team. Deduce who the evil players are and ensure missions succeed!\n"
+        prompt.add("role", context)
         
-        context += f"\nALL PLAYERS: {', '.join([p.name for p in self.players])}\n"
+        context = f"\nALL PLAYERS: {', '.join([p.name for p in self.players])}\n"
         
         # Calculate good vs evil count
         good_count = sum(1 for p in self.players if p.is_good)
         evil_count = len(self.players) - good_count
         context += f"TEAM COMPOSITION: {good_count} Good, {evil_count} Evil\n"
+        prompt.add("players", context)
         
-        context += f"\nQUEST {self.quests_completed + 1}/5 - Team size needed: {MISSION_TEAM_SIZES[self.num_players][self.quests_completed]}\n"
+        context = f"\nQUEST {self.quests_completed + 1}/5 - Team size needed: {MISSION_TEAM_SIZES[self.num_players][self.quests_completed]}\n"
         context += f"Score - Good: {self.good_wins}, Evil: {self.evil_wins}\n\n"
+        prompt.add("quest", context)
         
         # Add mission history
         if self.missions:
-            context += "PREVIOUS MISSIONS:\n"
+            context = "PREVIOUS MISSIONS:\n"
             for m in self.missions:
                 approved_proposal = m.proposals[m.final_team_index]
                 context += f"  Mission {m.mission_number}: Leader {approved_proposal.leader}, Team {approved_proposal.team_members}\n"
@@ -263,23 +282,124 @@ class AvalonGame:
                     context += f"    Result: {m.mission_result} ({m.fail_count} FAIL cards)\n"
                 else:
                     context += "    Result: Team proposal rejected, no quest\n"
+            prompt.add("previous_missions", context)
         
-        return context
+        if self.belief_hint and self.belief_tracker and self.missions:
+            prompt.add("belief_hint", self.belief_tracker.get_context_string())
+        
+        return prompt
+    
+    def route(self, phase: Optional[str], player: Optional[Player]) -> tuple[str, str]:
+        """Model and reasoning effort for a call, recording the choice in routing_calls."""
+        role = player.role if player else None
+        model, reasoning_effort = resolve_route(self.routing, phase, role, self.model, self.reasoning_effort)
+        with self.routing_lock:
+            entry = self.routing_calls.setdefault(f"{phase}:{role}", {"model": model, "reasoning_effort": reasoning_effort, "calls": 0})
+            entry["calls"] += 1
+        return model, reasoning_effort
+    
+    def budget_effort(self, phase: Optional[str], player: Optional[Player], reasoning_effort: str) -> str:
+        """Lower the effort of a low-stakes call when the game is spending faster than its budget allows.
+
+        The budget is paced over the five possible quests: by quest k the game may have spent k/5 of it.
+        Up to 1.5x that pace costs one effort level; beyond it, or past the whole budget, calls drop to
+        the floor. Every downgrade is recorded in effort_downgrades.
+        """
+        if (self.time_budget is None and self.token_budget is None) or phase in PROTECTED_PHASES:
+            return reasoning_effort
+        if reasoning_effort not in REASONING_EFFORTS or self.budget_floor not in REASONING_EFFORTS:
+            return reasoning_effort
+        
+        share = min(1.0, (self.quests_completed + 1) / 5)
+        elapsed = time.time() - self.budget_start
+        pressure = 0.0
+        over_budget = False
+        if self.time_budget:
+            pressure = max(pressure, elapsed / (self.time_budget * share))
+            over_budget = over_budget or elapsed >= self.time_budget
+        if self.token_budget:
+            pressure = max(pressure, self.tokens_used / (self.token_budget * share))
+            over_budget = over_budget or self.tokens_used >= self.token_budget
+        if pressure <= 1.0:
+            return reasoning_effort
+        
+        current = REASONING_EFFORTS.index(reasoning_effort)
+        floor = REASONING_EFFORTS.index(self.budget_floor)
+        target = floor if over_budget or pressure > 1.5 else max(floor, current - 1)
+        if target >= current:
+            return reasoning_effort
+        
+        downgraded = REASONING_EFFORTS[target]
+        with self.routing_lock:
+            self.effort_downgrades.append(EffortDowngrade(
+                call_index=self.llm_calls,
+                phase=phase,
+                player=player.name if player else None,
+                requested_effort=reasoning_effort,
+                used_effort=downgraded,
+                pressure=round(pressure, 3),
+                elapsed_seconds=round(elapsed, 2),
+                tokens_used=self.tokens_used
+            ))
+        return downgraded
+    
+    @traced("prompt")
+    def measure_prompt(self, system_prompt: Prompt, user_prompt: str, phase: Optional[str], player: Optional[Player]) -> PromptSize:
+        """Record the estimated tokens of each prompt section, trimming the prompt to prompt_token_cap."""
+        sections, trimmed = system_prompt.measure(user_prompt, self.prompt_token_cap)
+        prompt_size = PromptSize(
+            call_index=self.llm_calls,
+            phase=phase,
+            player=player.name if player else None,
+            quest=self.quests_completed + 1,
+            sections=sections,
+            total_tokens=sum(sections.values()),
+            trimmed=trimmed or None
+        )
+        with self.routing_lock:
+            self.prompt_sizes.append(prompt_size)
+        return prompt_size
     
-    def call_llm(self, system_prompt: str, user_prompt: str, response_format: str = "text") -> tuple[str, float, Optional[str]]:
-        """Call OpenAI API with reasoning effort. Returns (response, time_taken, reasoning_summary)."""
+    def call_llm(self, system_prompt, user_prompt: str, response_format: str = "text", phase: Optional[str] = None, player: Optional[Player] = None) -> tuple[str, float, Optional[str]]:
+        """Call OpenAI API with reasoning effort. `system_prompt` is a str or a sectioned Prompt.
+        Returns (response, time_taken, reasoning_summary)."""
+        if not isinstance(system_prompt, Prompt):
+            system_prompt = Prompt().add("context", system_prompt)
+        prompt_size = self.measure_prompt(system_prompt, user_prompt, phase, player)
+        model, reasoning_effort = self.route(phase, player)
+        reasoning_effort = self.budget_effort(phase, player, reasoning_effort)
+        with self.routing_lock:
+            self.llm_calls += 1
+        
+        def send(**request):
+            if self.hedger:
+                return self.hedger.create(self.client, phase, self.hedge_stats, **request)
+            return self.client.chat.completions.create(**request)
+        
         start_time = time.time()
         try:
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                reasoning_effort=self.reasoning_effort
-            )
+            with span("llm"), metrics.llm_call(phase):
+                if self.sessions and player is not None:
+                    # Only what changed since this player's last turn (see sessions.py)
+                    response, prompt_size.sent_tokens = self.sessions.create(
+                        player.name, system_prompt, user_prompt, send, model=model, reasoning_effort=reasoning_effort)
+                else:
+                    response = send(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": system_prompt.render()},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        reasoning_effort=reasoning_effort
+                    )
             elapsed_time = time.time() - start_time
             
+            usage = getattr(response, "usage", None)
+            metrics.tokens(phase, usage)
+            if usage is not None:
+                with self.routing_lock:
+                    self.tokens_used += (getattr(usage, "prompt_tokens", 0) or 0) + (getattr(usage, "completion_tokens", 0) or 0)
+            
             # Extract response content
             content = response.choices[0].message.content.strip()
             
@@ -305,34 +425,63 @@ class AvalonGame:
         except Exception as e:
             elapsed_time = time.time() - start_time
             print("API Error: {}".format(e))
+            metrics.count("avalon_llm_fallbacks_total", phase=str(phase))
             # Fallback response
             return "I need to think about this carefully...", elapsed_time, None
     
-    def generate_discussion(self, quest_num: int) -> List[Message]:
-        """Generate discussion phase with LLM agents."""
+    def generate_discussion_message(self, player: Player, quest_num: int, transcript: List[Message]) -> tuple[str, float, Optional[str]]:
+        """One player's discussion line given the transcript they can see. Returns (response, time_taken, reasoning_summary)."""
+        if player.name in self.agents:
+            start_time = time.time()
+            response = self.agents[player.name].discuss(self, player, quest_num, transcript)
+            return response, time.time() - start_time, None
+        
+        system_prompt = self.player_context(player, quest_num)
+        
+        # Add conversation history
+        if transcript:
+            context = "\nCONVERSATION SO FAR:\n"
+            for msg in transcript:
+                context += f"  {msg.player}: {msg.content}\n"
+            system_prompt.add("discussion", context)
+        
+        user_prompt = "It's your turn to speak. Provide a strategic comment about who to trust or who should be on the mission team. Be natural and conversational. Keep it to 1-2 sentences."
+        
+        if player.role == "evil" or player.role == "assassin":
+            user_prompt += " Remember to deceive and create confusion while appearing trustworthy."
+        elif player.role == "merlin":
+            user_prompt += " Subtly guide the team without revealing you know who the evil players are."
+        
+        return self.call_llm(system_prompt, user_prompt, phase="discussion", player=player)
+    
+    @traced("discussion")
+    def generate_discussion(self, quest_num: int, prefix: List[Message] = None) -> List[Message]:
+        """Generate discussion phase with LLM agents. `prefix` holds messages already spoken (resumed games)."""
         print(f"\n=== Quest {quest_num}: Discussion Phase ===")
-        messages = []
+        messages = list(prefix) if prefix else []
         
         # Each player speaks NUM_MESSAGES_PER_PLAYER times
         for round_num in range(NUM_MESSAGES_PER_PLAYER):
-            for player in self.players:
-                context = self.get_player_context(player, quest_num)
-                
-                # Add conversation history
-                if messages:
-                    context += "\nCONVERSATION SO FAR:\n"
-                    for msg in messages:
-                        context += f"  {msg.player}: {msg.content}\n"
-                
-                system_prompt = context
-                user_prompt = "It's your turn to speak. Provide a strategic comment about who to trust or who should be on the mission team. Be natural and conversational. Keep it to 1-2 sentences."
-                
-                if player.role == "evil" or player.role == "assassin":
-                    user_prompt += " Remember to deceive and create confusion while appearing trustworthy."
-                elif player.role == "merlin":
-                    user_prompt += " Subtly guide the team without revealing you know who the evil players are."
-                
-                response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt)
+            round_start = round_num * len(self.players)
+            speakers = self.players[max(0, len(messages) - round_start):]
+            if not speakers:
+                continue
+            
+            if self.discussion_mode == "simultaneous":
+                # Everyone speaks at once, conditioned only on earlier rounds
+                transcript = messages[:round_start]
+                with ThreadPoolExecutor(max_workers=len(speakers)) as pool:
+                    round_responses = list(pool.map(
+                        lambda p: self.generate_discussion_message(p, quest_num, transcript), speakers
+                    ))
+            else:
+                round_responses = None
+            
+            for idx, player in enumerate(speakers):
+                if round_responses is not None:
+                    response, thinking_time, reasoning_content = round_responses[idx]
+                else:
+                    response, thinking_time, reasoning_content = self.generate_discussion_message(player, quest_num, messages)
                 
                 message = Message(
                     player=player.name,
@@ -351,34 +500,45 @@ class AvalonGame:
         
         return messages
     
+    @traced("proposal")
     def generate_team_proposal(self, leader: Player, quest_num: int, discussion: List[Message]) -> TeamProposal:
         """Leader proposes a team using LLM."""
-        context = self.get_player_context(leader, quest_num)
+        team_size = MISSION_TEAM_SIZES[self.num_players][quest_num - 1]
+        
+        if leader.name in self.agents:
+            start_time = time.time()
+            team, reasoning = self.agents[leader.name].propose_team(self, leader, team_size)
+            thinking_time = time.time() - start_time
+            print(f"  Leader {leader.name} [heuristic] proposes: {team}")
+            return TeamProposal(leader=leader.name, team_members=team, reasoning=reasoning, thinking_time=thinking_time)
+        
+        system_prompt = self.player_context(leader, quest_num)
         
         # Add the discussion that just happened
         if discussion:
-            context += "\nDISCUSSION FROM THIS MISSION:\n"
+            context = "\nDISCUSSION FROM THIS MISSION:\n"
             for msg in discussion:
                 context += f"  {msg.player}: {msg.content}\n"
+            system_prompt.add("discussion", context)
         
-        team_size = MISSION_TEAM_SIZES[self.num_players][quest_num - 1]
         player_names = [p.name for p in self.players]
         
-        system_prompt = context
         user_prompt = "You are the mission leader. Propose a team of {} players for this mission.\n".format(team_size)
         user_prompt += "Available players: {}\n".format(', '.join(player_names))
         user_prompt += "Respond ONLY with a JSON object: {{\"team\": [\"Name1\", \"Name2\", ...], \"reasoning\": \"why you chose this team\"}}"
         
-        response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt)
+        response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt, phase="proposal", player=leader)
         
         # Parse response
         try:
-            data = json.loads(response)
+            with span("parse"):
+                data = json.loads(response)
             team = data["team"][:team_size]  # Ensure correct size
             reasoning = data["reasoning"]
         except (json.JSONDecodeError, KeyError):
+            metrics.count("avalon_parse_failures_total", phase="proposal")
             # Fallback: random team
-            team = random.sample(player_names, team_size)
+            team = self.rng.sample(player_names, team_size)
             reasoning = "Based on trust and past mission results."
         
         proposal = TeamProposal(
@@ -394,46 +554,58 @@ class AvalonGame:
         
         return proposal
     
+    @traced("vote")
     def generate_votes(self, proposal: TeamProposal, quest_num: int, discussion: List[Message], previous_proposals: List[Proposal] = None) -> List[Vote]:
         """All players vote on the team proposal."""
         votes = []
         
         for player in self.players:
-            context = self.get_player_context(player, quest_num)
+            if player.name in self.agents:
+                start_time = time.time()
+                vote_choice, comment = self.agents[player.name].vote(self, player, proposal.team_members)
+                votes.append(Vote(player=player.name, vote=vote_choice, comment=comment, thinking_time=time.time() - start_time))
+                print(f"  {player.name} [heuristic]: {vote_choice} - {comment}")
+                continue
+            
+            system_prompt = self.player_context(player, quest_num)
             
             # Add the discussion that just happened
             if discussion:
-                context += "\nDISCUSSION FROM THIS MISSION:\n"
+                context = "\nDISCUSSION FROM THIS MISSION:\n"
                 for msg in discussion:
                     context += f"  {msg.player}: {msg.content}\n"
+                system_prompt.add("discussion", context)
             
             # Add previous rejected proposals from THIS mission
             if previous_proposals:
-                context += "\nPREVIOUS PROPOSALS THIS MISSION:\n"
+                context = "\nPREVIOUS PROPOSALS THIS MISSION:\n"
                 for prev_prop in previous_proposals:
                     context += f"  Proposal {prev_prop.proposal_id + 1} by {prev_prop.leader}: {prev_prop.team_members}\n"
                     if prev_prop.votes:  # Only show vote counts if votes exist (not 5th proposal)
                         approve_count = sum(1 for v in prev_prop.votes if v.vote == "approve")
                         reject_count = len(prev_prop.votes) - approve_count
                         context += f"    Result: REJECTED ({approve_count} approve, {reject_count} reject)\n"
+                system_prompt.add("previous_proposals", context)
             
-            context += f"\nPROPOSED TEAM: {', '.join(proposal.team_members)}\n"
+            context = f"\nPROPOSED TEAM: {', '.join(proposal.team_members)}\n"
             context += f"Leader's reasoning: {proposal.reasoning}\n"
+            system_prompt.add("proposed_team", context)
             
-            system_prompt = context
             user_prompt = "Vote on this team proposal. Respond ONLY with JSON: {\"vote\": \"approve\" or \"reject\", \"comment\": \"brief reason\"}"
             
-            response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt)
+            response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt, phase="vote", player=player)
             
             try:
-                data = json.loads(response)
+                with span("parse"):
+                    data = json.loads(response)
                 vote_choice = data["vote"]
                 comment = data["comment"]
             except (json.JSONDecodeError, KeyError):
+                metrics.count("avalon_parse_failures_total", phase="vote")
                 # Strategic fallback
                 if player.role in ["evil", "assassin"]:
                     # Evil players more likely to reject good teams
-                    vote_choice = random.choice(["approve", "reject"])
+                    vote_choice = self.rng.choice(["approve", "reject"])
                 else:
                     vote_choice = "approve"
                 comment = "I trust this team." if vote_choice == "approve" else "I'm not sure about this team."
@@ -450,25 +622,28 @@ class AvalonGame:
         
         return votes
     
+    @traced("mission_action")
     def execute_mission(self, proposal: Proposal, quest_num: int) -> tuple[List[MissionAction], str, int]:
         print(f"\n=== Quest {quest_num}: Execution Phase ===")
         actions = []
         
         for player_name in proposal.team_members:
             player = next(p for p in self.players if p.name == player_name)
-            context = self.get_player_context(player, quest_num)
-            
-            system_prompt = context
             
             if player.is_good:
                 action_choice = "success"
+            elif player.name in self.agents:
+                action_choice = self.agents[player.name].mission_action(self, player, proposal.team_members)
             else:
+                system_prompt = self.player_context(player, quest_num)
                 user_prompt = "You're on the mission. As an evil player, choose 'success' or 'fail' strategically. Respond with JSON: {\"action\": \"success\" or \"fail\", \"reasoning\": \"why\"}"
-                response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt)
+                response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt, phase="mission_action", player=player)
                 try:
-                    data = json.loads(response)
+                    with span("parse"):
+                        data = json.loads(response)
                     action_choice = data["action"]
                 except (json.JSONDecodeError, KeyError):
+                    metrics.count("avalon_parse_failures_total", phase="mission_action")
                     action_choice = "fail"
             
             action = MissionAction(player=player_name, action=action_choice)
@@ -482,18 +657,26 @@ class AvalonGame:
         
         return actions, result, fail_count
     
-    def run_mission(self, mission_num: int) -> Mission:
-        """Run a complete mission round with up to 5 proposal attempts."""
+    def run_mission(self, mission_num: int, resume: Optional[Mission] = None) -> Mission:
+        """Run a complete mission round with up to 5 proposal attempts.
+        
+        `resume` is a partially played mission (from fork.py): its discussion and proposals are kept
+        and play continues from where they stop.
+        """
         MAX_PROPOSALS = 5
-        proposals = []
+        proposals = list(resume.proposals) if resume else []
         discussion = None
         
         # Discussion phase (happens once at start of mission)
-        discussion = self.generate_discussion(self.quests_completed + 1)
+        discussion = self.generate_discussion(self.quests_completed + 1, prefix=resume.discussion if resume else None)
         
         # Try up to 5 proposals
-        for proposal_id in range(MAX_PROPOSALS):
+        for proposal_id in range(len(proposals), MAX_PROPOSALS):
+            if proposals and proposals[-1].vote_result == "approved":
+                break
+            
             leader = self.players[self.current_leader_idx]
+            metrics.progress(mission=mission_num, proposal=proposal_id + 1)
             
             print(f"\n--- Proposal {proposal_id + 1}/5 (Leader: {leader.name}) ---")
             
@@ -511,6 +694,12 @@ class AvalonGame:
                 approve_count = sum(1 for v in votes if v.vote == "approve")
                 vote_result = "approved" if approve_count > len(self.players) // 2 else "rejected"
                 print(f"  Vote result: {vote_result} ({approve_count}/{len(self.players)})")
+                
+                if self.belief_tracker:
+                    self.belief_tracker.update_votes(team_proposal.team_members, {v.player: v.vote for v in votes})
+                    self.belief_posteriors.append(
+                        self.belief_tracker.snapshot(self.global_turn_counter, mission_num, proposal_id, "vote")
+                    )
             
             # Create proposal object
             proposal = Proposal(
@@ -525,9 +714,7 @@ class AvalonGame:
             )
             proposals.append(proposal)
             
-            if vote_result == "approved":
-                break
-            else:
+            if vote_result != "approved":
                 # Rotate leader for next proposal
                 self.current_leader_idx = (self.current_leader_idx + 1) % len(self.players)
         
@@ -538,6 +725,12 @@ class AvalonGame:
         # Mission execution
         quest_actions, mission_result, fail_count = self.execute_mission(approved_proposal, self.quests_completed + 1)
         
+        if self.belief_tracker:
+            self.belief_tracker.update_mission(approved_proposal.team_members, fail_count)
+            self.belief_posteriors.append(
+                self.belief_tracker.snapshot(self.global_turn_counter, mission_num, None, "mission")
+            )
+        
         # Update quest counters
         if mission_result == "success":
             self.good_wins += 1
@@ -560,7 +753,8 @@ class AvalonGame:
         
         return mission
     
-    def run_assassin_phase(self) -> AssassinPhase:
+    @traced("assassin")
+    def run_assassin_phase(self, evil_prefix: List[Message] = None) -> AssassinPhase:
         print("\n=== Assassin Phase ===")
         
         # Find the assassin (could be dedicated assassin role or a dual-role player)
@@ -570,35 +764,52 @@ class AvalonGame:
         
         print("\n🗡️  Evil team reveals themselves and discusses who Merlin might be...")
         
-        # Evil team discussion
-        evil_discussion = []
+        # Evil team discussion (a resumed game may already have part of it)
+        evil_discussion = list(evil_prefix) if evil_prefix else []
         
         for round_num in range(1):  # 1 round of discussion
-            for evil_player in evil_players:
+            for evil_player in evil_players[len(evil_discussion):]:
+                if evil_player.name in self.agents:
+                    start_time = time.time()
+                    response = self.agents[evil_player.name].evil_discussion(self, evil_player)
+                    evil_discussion.append(Message(
+                        player=evil_player.name,
+                        content=response,
+                        timestamp=len(evil_discussion),
+                        global_turn_id=self.global_turn_counter,
+                        phase="evil_discussion",
+                        thinking_time=time.time() - start_time
+                    ))
+                    self.global_turn_counter += 1
+                    print(f"  {evil_player.name} [heuristic]: {response}")
+                    continue
+                
                 # Build context for evil player
                 context = f"You are {evil_player.name}, playing The Resistance: Avalon.\n\n"
                 context += f"YOUR ROLE: {evil_player.role.upper()}\n"
                 context += f"EVIL TEAM MEMBERS: {', '.join([p.name for p in evil_players])}\n"
                 context += "The good team won 3 quests! The evil team has revealed themselves and is discussing who Merlin might be.\n"
                 context += "The Assassin will make the final decision, but everyone should share their analysis.\n\n"
+                system_prompt = Prompt().add("role", context)
                 
                 # Add all game discussions for analysis
-                context += "ALL GAME DISCUSSIONS:\n"
+                context = "ALL GAME DISCUSSIONS:\n"
                 for mission in self.missions:
                     context += f"\nMission {mission.mission_number} Discussion:\n"
                     for msg in mission.discussion:
                         context += f"  {msg.player}: {msg.content}\n"
+                system_prompt.add("all_discussions", context)
                 
                 # Add current evil discussion
                 if evil_discussion:
-                    context += "\nEVIL TEAM DISCUSSION SO FAR:\n"
+                    context = "\nEVIL TEAM DISCUSSION SO FAR:\n"
                     for msg in evil_discussion:
                         context += f"  {msg.player}: {msg.content}\n"
+                    system_prompt.add("evil_discussion", context)
                 
-                system_prompt = context
                 user_prompt = "Discuss who you think Merlin is among the good players. Analyze their behavior and statements in first person (as yourself). Be specific and analytical. Keep it to 2-3 sentences. Speak naturally as if talking to your evil teammates."
                 
-                response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt)
+                response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt, phase="evil_discussion", player=evil_player)
                 
                 message = Message(
                     player=evil_player.name,
@@ -616,36 +827,46 @@ class AvalonGame:
         # Now Assassin makes the final decision
         print("\n🗡️  Assassin makes the final decision...")
         
-        context = f"You are {assassin.name}, the Assassin in The Resistance: Avalon.\n\n"
-        context += f"EVIL TEAM MEMBERS: {', '.join([p.name for p in evil_players])}\n"
-        context += "The good team won 3 quests! You get ONE chance to identify and kill Merlin.\n"
-        context += "Your evil teammates have discussed and shared their analysis.\n\n"
-        
-        # Add all game discussions
-        context += "ALL GAME DISCUSSIONS:\n"
-        for mission in self.missions:
-            context += f"\nMission {mission.mission_number} Discussion:\n"
-            for msg in mission.discussion:
+        if assassin.name in self.agents:
+            start_time = time.time()
+            guess, reasoning = self.agents[assassin.name].assassin_guess(self, assassin)
+            thinking_time = time.time() - start_time
+            reasoning_content = None
+        else:
+            context = f"You are {assassin.name}, the Assassin in The Resistance: Avalon.\n\n"
+            context += f"EVIL TEAM MEMBERS: {', '.join([p.name for p in evil_players])}\n"
+            context += "The good team won 3 quests! You get ONE chance to identify and kill Merlin.\n"
+            context += "Your evil teammates have discussed and shared their analysis.\n\n"
+            system_prompt = Prompt().add("role", context)
+            
+            # Add all game discussions
+            context = "ALL GAME DISCUSSIONS:\n"
+            for mission in self.missions:
+                context += f"\nMission {mission.mission_number} Discussion:\n"
+                for msg in mission.discussion:
+                    context += f"  {msg.player}: {msg.content}\n"
+            system_prompt.add("all_discussions", context)
+            
+            # Add evil team discussion
+            context = "\nEVIL TEAM DISCUSSION:\n"
+            for msg in evil_discussion:
                 context += f"  {msg.player}: {msg.content}\n"
-        
-        # Add evil team discussion
-        context += "\nEVIL TEAM DISCUSSION:\n"
-        for msg in evil_discussion:
-            context += f"  {msg.player}: {msg.content}\n"
-        
-        system_prompt = context
-        user_prompt = "Based on all the discussions and your teammates' analysis, choose who you think is Merlin from the good players. Respond ONLY with JSON: {{\"guess\": \"PlayerName\", \"reasoning\": \"your analysis in 2-3 sentences\"}}"
-        
-        response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt)
-        
-        try:
-            data = json.loads(response)
-            guess = data["guess"]
-            reasoning = data["reasoning"]
-        except (json.JSONDecodeError, KeyError):
-            good_players = [p.name for p in self.players if p.is_good]
-            guess = random.choice(good_players)
-            reasoning = "Based on their behavior throughout the game."
+            system_prompt.add("evil_discussion", context)
+            
+            user_prompt = "Based on all the discussions and your teammates' analysis, choose who you think is Merlin from the good players. Respond ONLY with JSON: {{\"guess\": \"PlayerName\", \"reasoning\": \"your analysis in 2-3 sentences\"}}"
+            
+            response, thinking_time, reasoning_content = self.call_llm(system_prompt, user_prompt, phase="assassin_guess", player=assassin)
+            
+            try:
+                with span("parse"):
+                    data = json.loads(response)
+                guess = data["guess"]
+                reasoning = data["reasoning"]
+            except (json.JSONDecodeError, KeyError):
+                metrics.count("avalon_parse_failures_total", phase="assassin_guess")
+                good_players = [p.name for p in self.players if p.is_good]
+                guess = self.rng.choice(good_players)
+                reasoning = "Based on their behavior throughout the game."
         
         correct = (guess == merlin.name)
         
@@ -665,68 +886,87 @@ class AvalonGame:
     
     def play_game(self) -> GameState:
         """Play a complete game of Avalon."""
-        print(f"\n{'='*60}")
-        print(f"STARTING AVALON GAME: {self.game_id}")
-        print(f"{'='*60}")
-        
-        self.setup_game()
-        
-        # Play until 3 quests succeed or 3 quests fail (based on ACTUAL quest results)
-        mission_num = 1
-        while self.quests_completed < 5 and self.good_wins < 3 and self.evil_wins < 3:
-            self.run_mission(mission_num)
-            mission_num += 1
-        
-        # Determine winner
-        assassin_phase = None
-        
-        if self.good_wins >= 3:
-            # Assassin phase
-            assassin_phase = self.run_assassin_phase()
-            if assassin_phase.correct:
-                winner = "evil"
-                print("\n🗡️  EVIL WINS! The Assassin killed Merlin!")
+        with span("game", label=self.game_id):
+            print(f"\n{'='*60}")
+            print(f"STARTING AVALON GAME: {self.game_id}")
+            print(f"{'='*60}")
+            
+            # Forked games (fork.py) arrive with players and earlier missions already restored
+            if not self.players:
+                self.setup_game()
+            self.budget_start = time.time()
+            
+            # Play until 3 quests succeed or 3 quests fail (based on ACTUAL quest results)
+            mission_num = len(self.missions) + 1
+            while self.quests_completed < 5 and self.good_wins < 3 and self.evil_wins < 3:
+                self.run_mission(mission_num, resume=self.resume_mission)
+                self.resume_mission = None
+                mission_num += 1
+            
+            # Determine winner
+            assassin_phase = None
+            
+            if self.good_wins >= 3:
+                # Assassin phase
+                assassin_phase = self.run_assassin_phase(evil_prefix=self.resume_evil_discussion)
+                if assassin_phase.correct:
+                    winner = "evil"
+                    print("\n🗡️  EVIL WINS! The Assassin killed Merlin!")
+                else:
+                    winner = "good"
+                    print("\n✨ GOOD WINS! Merlin survived!")
             else:
-                winner = "good"
-                print("\n✨ GOOD WINS! Merlin survived!")
-        else:
-            winner = "evil"
-            print("\n🗡️  EVIL WINS! Three missions failed!")
-        
-        print(f"\nFinal Score - Good: {self.good_wins}, Evil: {self.evil_wins}")
-        
-        config = GameConfig(
-            model=self.model,
-            reasoning_effort=self.reasoning_effort,
-            mission_team_sizes=MISSION_TEAM_SIZES[self.num_players],
-            num_messages_per_player=NUM_MESSAGES_PER_PLAYER,
-            num_players=self.num_players
-        )
-        
-        game_state = GameState(
-            game_id=self.game_id,
-            config=config,
-            players=self.players,
-            missions=self.missions,
-            winner=winner,
-            assassin_phase=assassin_phase
-        )
-        
+                winner = "evil"
+                print("\n🗡️  EVIL WINS! Three missions failed!")
+            
+            print(f"\nFinal Score - Good: {self.good_wins}, Evil: {self.evil_wins}")
+            metrics.game_completed(winner)
+            if self.hedge_stats.get("hedged"):
+                print(f"🔀 Hedged {self.hedge_stats['hedged']}/{self.hedge_stats['calls']} calls "
+                      f"({self.hedge_stats.get('hedge_won', 0)} answered first by the hedge)")
+            if self.effort_downgrades:
+                print(f"⏳ {len(self.effort_downgrades)}/{self.llm_calls} calls ran at lower reasoning effort to stay within budget")
+            
+            config = GameConfig(
+                model=self.model,
+                reasoning_effort=self.reasoning_effort,
+                mission_team_sizes=MISSION_TEAM_SIZES[self.num_players],
+                num_messages_per_player=NUM_MESSAGES_PER_PLAYER,
+                num_players=self.num_players,
+                synthetic_players=sorted(self.agents) or None,
+                discussion_mode=self.discussion_mode,
+                seed=self.seed,
+                routing=self.routing or None,
+                routing_calls=self.routing_calls or None,
+                time_budget=self.time_budget,
+                token_budget=self.token_budget,
+                prompt_token_cap=self.prompt_token_cap,
+                session_mode=self.session_mode
+            )
+            
+            game_state = GameState(
+                game_id=self.game_id,
+                config=config,
+                players=self.players,
+                missions=self.missions,
+                winner=winner,
+                assassin_phase=assassin_phase,
+                belief_posteriors=self.belief_posteriors if self.belief_tracking else None,
+                effort_downgrades=self.effort_downgrades if self.effort_downgrades else None,
+                budget_spent={"seconds": round(time.time() - self.budget_start, 2), "tokens": self.tokens_used}
+                if self.time_budget or self.token_budget else None,
+                hedge_stats=self.hedge_stats if self.hedger else None,
+                prompt_sizes=self.prompt_sizes,
+                session_stats=self.sessions.summary() if self.sessions else None
+            )
+            
         return game_state
     
-    def save_game(self, game_state: GameState, filename: str):
-        def convert_to_dict(obj):
-            if hasattr(obj, '__dataclass_fields__'):
-                return {k: convert_to_dict(v) for k, v in asdict(obj).items()}
-            elif isinstance(obj, list):
-                return [convert_to_dict(item) for item in obj]
-            else:
-                return obj
+    @traced("save")
+    def save_game(self, game_state: GameState, filename: str, compact: bool = False):
+        from codec import encode_game, write_json
         
-        data = convert_to_dict(game_state)
-        
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(filename, encode_game(game_state), compact)
         
         print(f"\n📁 Game saved to: {filename}")
 
@@ -738,23 +978,112 @@ def main():
     
     import sys
     num_players = 5
+    belief_tracking = False
+    belief_hint = False
+    heuristic_players = None
+    discussion_mode = DISCUSSION_MODE
+    seed = None
+    record_trace = False
+    trace_spans = None
+    routing = {}
+    budget = {}
+    hedger = None
+    compact = False
+    metrics_port = None
+    metrics_dir = None
     for i, arg in enumerate(sys.argv[1:]):
         if arg == "--num-players" and i + 1 < len(sys.argv) - 1:
             num_players = int(sys.argv[i + 2])
+        elif arg == "--belief-tracking":
+            belief_tracking = True
+        elif arg == "--belief-hint":
+            belief_hint = True
+        elif arg == "--heuristic-players" and i + 1 < len(sys.argv) - 1:
+            heuristic_players = [p.strip() for p in sys.argv[i + 2].split(',')]
+        elif arg == "--discussion-mode" and i + 1 < len(sys.argv) - 1:
+            discussion_mode = sys.argv[i + 2]
+        elif arg == "--seed" and i + 1 < len(sys.argv) - 1:
+            seed = int(sys.argv[i + 2])
+        elif arg == "--record-trace":
+            record_trace = True
+        elif arg == "--trace-spans" and i + 1 < len(sys.argv) - 1:
+            trace_spans = sys.argv[i + 2]
+        elif arg == "--route" and i + 1 < len(sys.argv) - 1:
+            key, route = parse_route(sys.argv[i + 2])
+            routing[key] = route
+        elif arg == "--time-budget" and i + 1 < len(sys.argv) - 1:
+            budget["time_budget"] = float(sys.argv[i + 2])
+        elif arg == "--token-budget" and i + 1 < len(sys.argv) - 1:
+            budget["token_budget"] = int(sys.argv[i + 2])
+        elif arg == "--budget-floor" and i + 1 < len(sys.argv) - 1:
+            budget["budget_floor"] = sys.argv[i + 2]
+        elif arg == "--prompt-token-cap" and i + 1 < len(sys.argv) - 1:
+            budget["prompt_token_cap"] = int(sys.argv[i + 2])
+        elif arg == "--session-mode" and i + 1 < len(sys.argv) - 1:
+            budget["session_mode"] = sys.argv[i + 2]
+        elif arg == "--hedge":
+            from hedging import Hedger
+            percentile = sys.argv[i + 2] if i + 1 < len(sys.argv) - 1 and not sys.argv[i + 2].startswith("--") else None
+            hedger = Hedger(percentile=float(percentile)) if percentile else Hedger()
+        elif arg == "--compact-json":
+            compact = True
+        elif arg == "--metrics-port" and i + 1 < len(sys.argv) - 1:
+            metrics_port = int(sys.argv[i + 2])
+        elif arg == "--metrics-dir" and i + 1 < len(sys.argv) - 1:
+            metrics_dir = sys.argv[i + 2]
+    
+    if trace_spans:
+        import tracing
+        tracing.enable()
+    if metrics_port:
+        metrics.serve(metrics_port, directory=metrics_dir)
+    elif metrics_dir:
+        metrics.enable(metrics_dir)
+    if "time_budget" in budget or "token_budget" in budget:
+        warning = budget_warning(REASONING_EFFORT, routing, budget.get("budget_floor", BUDGET_FLOOR))
+        if warning:
+            print(f"⚠️  Warning: {warning}")
     
     for i in range(20):
-        game = AvalonGame(num_players=num_players)
+        metrics.progress(game=i + 1, games=20)
+        llm_client = None
+        if record_trace:
+            from replay import RecordingClient
+            llm_client = RecordingClient(client)
+        
+        game = AvalonGame(num_players=num_players, belief_tracking=belief_tracking, belief_hint=belief_hint,
+                          heuristic_players=heuristic_players, discussion_mode=discussion_mode,
+                          seed=None if seed is None else seed + i, llm_client=llm_client, routing=routing, hedger=hedger, **budget)
         game_state = game.play_game()
     
         output_dir = os.path.dirname(os.path.abspath(__file__))
         game_dir = os.path.join(output_dir, "individual_games_new", f"{num_players}")
         os.makedirs(game_dir, exist_ok=True)
         output_file = os.path.join(game_dir, f"game_{i:02d}.json")
-        game.save_game(game_state, output_file)
+        game.save_game(game_state, output_file, compact)
+        
+        if record_trace:
+            from replay import save_trace
+            save_trace(output_file.replace(".json", ".trace.json"), {
+                "kind": "game",
+                "num_players": num_players,
+                "model": game.model,
+                "reasoning_effort": game.reasoning_effort,
+                "belief_tracking": belief_tracking,
+                "belief_hint": belief_hint,
+                "heuristic_players": heuristic_players,
+                "discussion_mode": discussion_mode,
+                "seed": game.seed,
+                "routing": routing,
+                **budget
+            }, llm_client.calls)
     
     print(f"\n{'='*60}")
     print("DATASET GENERATION COMPLETE!")
     print(f"{'='*60}")
+    
+    if trace_spans:
+        tracing.write_report(trace_spans)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,373 @@
+import os
+import sys
+import glob
+import json
+import time
+import atexit
+import tempfile
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9108
+# Worker processes inherit this and report into the same directory as the process serving /metrics
+DIR_ENV = "AVALON_METRICS_DIR"
+FLUSH_SECONDS = 1.0
+# Reasoning models answer in seconds to minutes
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+# name -> (type, help). Progress gauges are reported per process; the in-flight gauge is summed
+METRICS = {
+    "avalon_llm_in_flight": ("gauge", "LLM calls waiting for a response"),
+    "avalon_llm_calls_total": ("counter", "Finished LLM calls by phase"),
+    "avalon_llm_call_seconds": ("histogram", "LLM call latency by phase"),
+    "avalon_llm_fallbacks_total": ("counter", "LLM calls that raised and were answered by the canned fallback reply"),
+    "avalon_parse_failures_total": ("counter", "Responses that were not the requested JSON, replaced by a fallback decision"),
+    "avalon_tokens_total": ("counter", "Tokens reported by the API by phase and kind (prompt, completion)"),
+    "avalon_games_completed_total": ("counter", "Finished games by winner"),
+    "avalon_tournament_game": ("gauge", "Game number the process is playing"),
+    "avalon_tournament_games": ("gauge", "Games the process will play at most"),
+    "avalon_game_mission": ("gauge", "Mission of the current game"),
+    "avalon_game_proposal": ("gauge", "Proposal attempt (1-5) of the current mission"),
+    "avalon_last_progress_timestamp_seconds": ("gauge", "Unix time of the process's last finished LLM call or phase"),
+}
+PER_PROCESS = {"avalon_tournament_game", "avalon_tournament_games", "avalon_game_mission", "avalon_game_proposal",
+               "avalon_last_progress_timestamp_seconds"}
+
+_enabled = bool(os.environ.get(DIR_ENV))
+_directory: Optional[str] = os.environ.get(DIR_ENV)
+_lock = threading.Lock()
+_pid = None
+_counters: Dict[Tuple[str, tuple], float] = {}
+_histograms: Dict[Tuple[str, tuple], list] = {}
+_gauges: Dict[Tuple[str, tuple], float] = {}
+_dirty = threading.Event()
+
+
+def enable(directory: Optional[str] = None) -> str:
+    """Start recording into `directory` (a fresh temp dir by default); child processes follow."""
+    global _enabled, _directory
+    _directory = directory or os.environ.get(DIR_ENV) or tempfile.mkdtemp(prefix="avalon_metrics_")
+    os.makedirs(_directory, exist_ok=True)
+    os.environ[DIR_ENV] = _directory
+    _enabled = True
+    return _directory
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _state():
+    """Per-process state; a forked worker starts from zero rather than re-reporting its parent's counts."""
+    global _pid
+    if _pid != os.getpid():
+        _pid = os.getpid()
+        _counters.clear()
+        _histograms.clear()
+        _gauges.clear()
+        threading.Thread(target=_writer, daemon=True).start()
+        atexit.register(flush, final=True)
+
+
+def _key(name: str, labels: dict) -> Tuple[str, tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def count(name: str, value: float = 1, **labels):
+    if not _enabled:
+        return
+    with _lock:
+        _state()
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+    _dirty.set()
+
+
+def observe(name: str, value: float, **labels):
+    if not _enabled:
+        return
+    with _lock:
+        _state()
+        key = _key(name, labels)
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * len(LATENCY_BUCKETS), 0.0, 0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                histogram[0][i] += 1
+                break
+        histogram[1] += value
+        histogram[2] += 1
+    _dirty.set()
+
+
+def _gauge(name: str, value: float, add: bool = False):
+    key = (name, ())
+    _gauges[key] = _gauges.get(key, 0) + value if add else value
+
+
+def progress(**values):
+    """Set progress gauges: game, games, mission, proposal (see METRICS)."""
+    if not _enabled:
+        return
+    names = {"game": "avalon_tournament_game", "games": "avalon_tournament_games",
+             "mission": "avalon_game_mission", "proposal": "avalon_game_proposal"}
+    with _lock:
+        _state()
+        for field, value in values.items():
+            _gauge(names[field], value)
+        _gauge("avalon_last_progress_timestamp_seconds", time.time())
+    _dirty.set()
+
+
+def game_completed(winner: str):
+    count("avalon_games_completed_total", winner=winner)
+
+
+def tokens(phase: Optional[str], usage):
+    if not _enabled or usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        value = getattr(usage, f"{kind}_tokens", 0) or 0
+        if value:
+            count("avalon_tokens_total", value, phase=str(phase), kind=kind)
+
+
+class _Call:
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase: Optional[str]):
+        self.phase = str(phase)
+
+    def __enter__(self):
+        with _lock:
+            _state()
+            _gauge("avalon_llm_in_flight", 1, add=True)
+        self.start = time.perf_counter()
+        _dirty.set()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            _gauge("avalon_llm_in_flight", -1, add=True)
+            _gauge("avalon_last_progress_timestamp_seconds", time.time())
+        observe("avalon_llm_call_seconds", elapsed, phase=self.phase)
+        count("avalon_llm_calls_total", phase=self.phase)
+        return False
+
+
+class _NoopCall:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopCall()
+
+
+def llm_call(phase: Optional[str]):
+    """Context manager around one LLM request: in-flight gauge, latency histogram and call count."""
+    if not _enabled:
+        return _NOOP
+    return _Call(phase)
+
+
+def snapshot(final: bool = False) -> dict:
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "updated": time.time(),
+            "counters": [[name, dict(labels), value] for (name, labels), value in _counters.items()],
+            "histograms": [[name, dict(labels), *h] for (name, labels), h in _histograms.items()],
+            # An exiting process no longer has calls in flight or a game in progress
+            "gauges": [] if final else [[name, dict(labels), value] for (name, labels), value in _gauges.items()]
+        }
+
+
+def flush(final: bool = False):
+    """Write this process's snapshot now (workers that exit via os._exit call it themselves)."""
+    if not _directory or _pid != os.getpid():
+        return
+    path = os.path.join(_directory, f"{os.getpid()}.json")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot(final), f)
+    os.replace(tmp_path, path)
+
+
+def _writer():
+    while True:
+        _dirty.wait()
+        _dirty.clear()
+        try:
+            flush()
+        except OSError:
+            pass
+        time.sleep(FLUSH_SECONDS)
+
+
+def _alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect(directory: str) -> dict:
+    """Merge every process's snapshot: counters and histograms summed, the in-flight gauge summed over
+    live processes, progress gauges kept per live process."""
+    counters = defaultdict(float)
+    histograms = {}
+    gauges = defaultdict(float)
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in data["counters"]:
+            counters[_key(name, labels)] += value
+        for name, labels, buckets, total, calls in data["histograms"]:
+            merged = histograms.setdefault(_key(name, labels), [[0] * len(LATENCY_BUCKETS), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += calls
+        if not _alive(data["pid"]):
+            continue
+        for name, labels, value in data["gauges"]:
+            if name in PER_PROCESS:
+                gauges[_key(name, {**labels, "process": str(data["pid"])})] = value
+            else:
+                gauges[_key(name, labels)] += value
+    return {"counters": counters, "histograms": histograms, "gauges": gauges}
+
+
+def _labels(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(merged: dict) -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    series = defaultdict(list)
+    for kind in ("counters", "gauges", "histograms"):
+        for (name, labels), value in merged[kind].items():
+            series[name].append((labels, value))
+    if not series.get("avalon_llm_in_flight"):
+        series["avalon_llm_in_flight"].append(((), 0))
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        if name not in series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series[name]):
+            if kind != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            buckets, total, calls = value
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, buckets):
+                cumulative += n
+                le = f'le="{bound:g}"'
+                lines.append(f"{name}_bucket{_labels(labels, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{name}_bucket{_labels(labels, le)} {calls}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {calls}")
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    directory: str = None
+
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("/metrics", ""):
+            self.send_error(404)
+            return
+        if self.directory == _directory:
+            flush()
+        data = render(collect(self.directory)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = DEFAULT_PORT, host: str = DEFAULT_HOST, directory: Optional[str] = None) -> ThreadingHTTPServer:
+    """Enable recording and serve /metrics for this process and every worker reporting into the same
+    directory, from a background thread."""
+    directory = enable(directory)
+    handler = type("MetricsHandler", (_Handler,), {"directory": directory})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📈 Metrics on http://{host}:{port}/metrics (workers report into {directory})")
+    return server
+
+
+def main():
+    """
+    python metrics.py serve --dir DIR [--port 9108] [--host 127.0.0.1]
+    python metrics.py show --dir DIR
+
+    Runs with --metrics-port N serve /metrics themselves; runs started with --metrics-dir DIR
+    (or AVALON_METRICS_DIR=DIR) only report, and `serve` aggregates them from a separate process.
+    """
+    args = sys.argv[1:]
+    if not args or args[0] not in ("serve", "show"):
+        print(main.__doc__)
+        return
+
+    directory = None
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    for i, arg in enumerate(args):
+        if arg == "--dir" and i + 1 < len(args):
+            directory = args[i + 1]
+        elif arg == "--port" and i + 1 < len(args):
+            port = int(args[i + 1])
+        elif arg == "--host" and i + 1 < len(args):
+            host = args[i + 1]
+    if not directory:
+        print("Error: --dir is required")
+        return
+
+    if args[0] == "show":
+        print(render(collect(directory)), end="")
+        return
+
+    server = serve(port, host, directory)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,24 @@
 import os
 import json
+import random
+import textwrap
 from datetime import datetime
 from typing import List, Dict
-from dataclasses import dataclass, asdict
-from main import AvalonGame, Player, GameState
-
-@dataclass
-class PlayerReflection:
-    game_number: int
-    player_name: str
-    role_played: str
-    game_result: str
-    self_assessment: str
-    player_observations: Dict[str, str]
-    thinking_time: float
+from dataclasses import dataclass
+from main import AvalonGame, Player, GameState, PromptSize, resolve_route
+from schema import PlayerReflection
+from prompts import Prompt
+from codec import SCHEMA_VERSION, dumps, encode, encode_game, write_json
+import metrics
+import tracing
+from tracing import span, traced
 
 @dataclass
 class PlayerMemory:
     player_name: str
     reflections: List[PlayerReflection]
     
-    def get_context_string(self) -> str:
+    def get_context_string(self, include_observations: bool = True) -> str:
         if not self.reflections:
             return ""
         
@@ -32,6 +30,9 @@ class PlayerMemory:
             context += f"  Game {reflection.game_number} (as {reflection.role_played}, {reflection.game_result}):\n"
             context += f"    {reflection.self_assessment}\n"
         
+        if not include_observations:
+            return context + "=== END OF MEMORY ===\n\n"
+        
         context += "\nYOUR OBSERVATIONS ABOUT OTHER PLAYERS:\n"
         player_notes = {}
         for reflection in self.reflections:
@@ -49,70 +50,158 @@ class PlayerMemory:
         return context
 
 
+class GameSummary:
+    """What the tournament statistics need from a finished game. The full GameState is spilled to
+    individual_games/ as soon as the game is saved; MultiGameRunner.load_game reads it back."""
+    __slots__ = ("game_number", "game_id", "winner", "assassin_correct", "roles", "good_players", "effort_downgrades")
+    
+    def __init__(self, game_state: GameState, game_number: int):
+        self.game_number = game_number
+        self.game_id = game_state.game_id
+        self.winner = game_state.winner
+        self.assassin_correct = game_state.assassin_phase.correct if game_state.assassin_phase else None
+        self.roles = {p.name: p.role for p in game_state.players}
+        self.good_players = frozenset(p.name for p in game_state.players if p.is_good)
+        self.effort_downgrades = len(game_state.effort_downgrades or [])
+
+
 class LearningAvalonGame(AvalonGame):
-    def __init__(self, player_memories: Dict[str, PlayerMemory], num_players: int = 5, model: str = None, reasoning_effort: str = None):
+    def __init__(self, player_memories: Dict[str, PlayerMemory], num_players: int = 5, model: str = None, reasoning_effort: str = None, belief_tracking: bool = False, belief_hint: bool = False, heuristic_players: List[str] = None, discussion_mode: str = None, seed: int = None, llm_client=None, routing: Dict[str, dict] = None, time_budget: float = None, token_budget: int = None, budget_floor: str = None, hedger=None, prompt_token_cap: int = None, session_mode: str = None, trust_matrix=None, trust_memory: str = None):
         if model is None:
             from main import MODEL as DEFAULT_MODEL
             model = DEFAULT_MODEL
         if reasoning_effort is None:
             from main import REASONING_EFFORT as DEFAULT_REASONING_EFFORT
             reasoning_effort = DEFAULT_REASONING_EFFORT
+        if discussion_mode is None:
+            from main import DISCUSSION_MODE as DEFAULT_DISCUSSION_MODE
+            discussion_mode = DEFAULT_DISCUSSION_MODE
+        if budget_floor is None:
+            from main import BUDGET_FLOOR as DEFAULT_BUDGET_FLOOR
+            budget_floor = DEFAULT_BUDGET_FLOOR
         
-        super().__init__(num_players=num_players, model=model, reasoning_effort=reasoning_effort)
+        super().__init__(num_players=num_players, model=model, reasoning_effort=reasoning_effort,
+                         belief_tracking=belief_tracking, belief_hint=belief_hint, heuristic_players=heuristic_players,
+                         discussion_mode=discussion_mode, seed=seed, llm_client=llm_client, routing=routing,
+                         time_budget=time_budget, token_budget=token_budget, budget_floor=budget_floor, hedger=hedger,
+                         prompt_token_cap=prompt_token_cap, session_mode=session_mode)
         self.player_memories = player_memories
+        # Tournament-wide trust_matrix.TrustMatrix; trust_memory "augment" adds its rendering to the
+        # memory block, "replace" also drops the prose observations
+        self.trust_matrix = trust_matrix
+        self.trust_memory = trust_memory
     
-    def get_player_context(self, player: Player, mission_num: int) -> str:
-        context = super().get_player_context(player, mission_num)
+    @traced("prompt")
+    def player_context(self, player: Player, mission_num: int) -> Prompt:
+        prompt = super().player_context(player, mission_num)
         
         if player.name in self.player_memories:
-            memory_context = self.player_memories[player.name].get_context_string()
-            parts = context.split("\nALL PLAYERS:")
-            if len(parts) == 2:
-                context = parts[0] + memory_context + "\nALL PLAYERS:" + parts[1]
+            memory = self.player_memories[player.name]
+            prompt.insert_before("players", "memory", memory.get_context_string(include_observations=self.trust_memory != "replace"))
+            if self.trust_memory and self.trust_matrix is not None:
+                prompt.insert_before("players", "trust_matrix", self.trust_matrix.render(player.name))
         
-        return context
+        return prompt
 
 
 class MultiGameRunner:
-    def __init__(self, num_games: int = 10, num_players: int = 5, model: str = None, reasoning_effort: str = None, memory_enabled_players: List[str] = None):
+    def __init__(self, num_games: int = 10, num_players: int = 5, model: str = None, reasoning_effort: str = None, memory_enabled_players: List[str] = None, belief_tracking: bool = False, belief_hint: bool = False, heuristic_players: List[str] = None, discussion_mode: str = None, tournament_dir: str = None, store_path: str = None, seed: int = None, llm_client=None, record_trace: bool = False, trace_spans: bool = False, stopping_rule=None, routing: Dict[str, dict] = None, budget: Dict[str, object] = None, hedge_percentile: float = None, compact_output: bool = False, trust_matrix: bool = False, trust_memory: str = None):
         if model is None:
             from main import MODEL as DEFAULT_MODEL
             model = DEFAULT_MODEL
         if reasoning_effort is None:
             from main import REASONING_EFFORT as DEFAULT_REASONING_EFFORT
             reasoning_effort = DEFAULT_REASONING_EFFORT
+        if discussion_mode is None:
+            from main import DISCUSSION_MODE as DEFAULT_DISCUSSION_MODE
+            discussion_mode = DEFAULT_DISCUSSION_MODE
         
-        from main import ROLE_CONFIGS
+        from rules import ROLE_CONFIGS
         
         self.num_games = num_games
         self.num_players = num_players
         self.model = model
         self.reasoning_effort = reasoning_effort
+        self.belief_tracking = belief_tracking
+        self.belief_hint = belief_hint
+        self.discussion_mode = discussion_mode
+        self.routing = routing or {}
+        # Per-game time_budget / token_budget / budget_floor (see AvalonGame.budget_effort) and prompt_token_cap
+        self.budget = budget or {}
+        if "time_budget" in self.budget or "token_budget" in self.budget:
+            from main import BUDGET_FLOOR, budget_warning
+            warning = budget_warning(reasoning_effort, self.routing, self.budget.get("budget_floor", BUDGET_FLOOR))
+            if warning:
+                print(f"⚠️  Warning: {warning}")
+        # One Hedger for the whole tournament so its per-phase latency history carries over
+        self.hedger = None
+        if hedge_percentile:
+            from hedging import Hedger
+            self.hedger = Hedger(percentile=hedge_percentile)
+        self.store_path = store_path
+        self.compact_output = compact_output
+        # Optional sequential test (early_stopping.StoppingRule); num_games is then the maximum
+        self.stopping_rule = stopping_rule
+        self.stopping_decision = None
+        
+        # Per-game seeds are drawn from the tournament seed so the whole run is reproducible
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        if llm_client is None:
+            from main import client as llm_client
+        if record_trace:
+            from replay import RecordingClient
+            llm_client = RecordingClient(llm_client)
+        self.client = llm_client
+        self.record_trace = record_trace
+        self.trace_spans = trace_spans
+        if trace_spans:
+            tracing.enable()
         self.player_names = ROLE_CONFIGS[num_players]["names"]
         
+        # Seats filled by rule-based agents (no LLM calls, no reflections)
+        self.heuristic_players = list(heuristic_players or [])
+        unknown = [p for p in self.heuristic_players if p not in self.player_names]
+        if unknown:
+            raise ValueError(f"Unknown player(s) {', '.join(unknown)} for heuristic seats (players: {', '.join(self.player_names)})")
+        
         # Only create memories for specified players
         if memory_enabled_players is None:
-            # Default: all players have memory
-            self.memory_enabled_players = self.player_names
+            # Default: all LLM players have memory
+            self.memory_enabled_players = [p for p in self.player_names if p not in self.heuristic_players]
         else:
             # Only specified players have memory
-            self.memory_enabled_players = [p for p in memory_enabled_players if p in self.player_names]
+            self.memory_enabled_players = [p for p in memory_enabled_players if p in self.player_names and p not in self.heuristic_players]
         
         self.player_memories: Dict[str, PlayerMemory] = {
             name: PlayerMemory(player_name=name, reflections=[])
             for name in self.memory_enabled_players
         }
-        self.game_results: List[GameState] = []
+        # Numeric reputation over revealed roles (trust_matrix.py), updated after every game
+        self.trust_memory = trust_memory
+        self.trust_matrix = None
+        if trust_memory not in (None, "augment", "replace"):
+            raise ValueError(f"Unknown trust memory mode '{trust_memory}' (choose augment or replace)")
+        if trust_matrix or trust_memory:
+            from trust_matrix import TrustMatrix
+            self.trust_matrix = TrustMatrix(self.player_names)
+        # Finished games live on disk; only their summaries (and the first game's config) stay in memory
+        self.game_summaries: List[GameSummary] = []
+        self.game_config = None
         self.game_reflections: Dict[int, List[PlayerReflection]] = {}
+        self._all_games_end = None
         self.session_id = f"avalon_tournament_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
-        self.tournament_dir = os.path.join(self.base_dir, self.session_id)
+        self.tournament_dir = tournament_dir or os.path.join(self.base_dir, self.session_id)
         os.makedirs(self.tournament_dir, exist_ok=True)
         print(f"Tournament folder created: {self.tournament_dir}")
-        print(f"Players: {self.num_players}, Model: {self.model}, Reasoning: {self.reasoning_effort}")
+        print(f"Players: {self.num_players}, Model: {self.model}, Reasoning: {self.reasoning_effort}, Seed: {self.seed}")
         print(f"Memory-enabled players: {', '.join(self.memory_enabled_players)}")
+        if self.heuristic_players:
+            print(f"Heuristic players: {', '.join(self.heuristic_players)}")
     
+    @traced("reflection")
     def run_post_game_reflection(self, game_state: GameState, game_number: int):
         print(f"\n{'='*60}")
         print(f"POST-GAME REFLECTION - Game {game_number}")
@@ -138,28 +227,30 @@ class MultiGameRunner:
             context = f"You are {player.name}. You just finished Game {game_number} of Avalon.\n\n"
             context += f"YOUR ROLE: {player.role.upper()}\n"
             context += f"GAME RESULT: You {result} (Team {game_state.winner} won)\n\n"
+            prompt = Prompt().add("role", context)
             
-            context += "GAME SUMMARY:\n"
+            context = "GAME SUMMARY:\n"
             for mission in game_state.missions:
                 final_proposal = mission.proposals[mission.final_team_index]
                 context += f"  Mission {mission.mission_number}: Leader {final_proposal.leader}, Team {final_proposal.team_members}\n"
                 if mission.mission_result:
                     context += f"    Result: {mission.mission_result} ({mission.fail_count} FAIL cards)\n"
+            prompt.add("game_summary", context)
             
             if game_state.assassin_phase:
-                context += "\nASSASSIN PHASE:\n"
+                context = "\nASSASSIN PHASE:\n"
                 context += f"  Assassin guessed: {game_state.assassin_phase.guess}\n"
                 context += f"  Correct: {game_state.assassin_phase.correct}\n"
                 context += f"  Actual Merlin was: {next(p.name for p in game_state.players if p.role == 'merlin')}\n"
+                prompt.add("assassin_phase", context)
             
-            context += "\nACTUAL ROLES (NOW REVEALED):\n"
+            context = "\nACTUAL ROLES (NOW REVEALED):\n"
             for p in game_state.players:
                 context += f"  {p.name}: {p.role}\n"
+            prompt.add("revealed_roles", context)
             
-            from main import client
             import time
             
-            system_prompt = context
             user_prompt = (
                 "Reflect on your performance in this game. Respond with JSON:\n"
                 "{\n"
@@ -173,26 +264,55 @@ class MultiGameRunner:
                 "Make observations about ALL other players (not yourself)."
             )
             
+            model, reasoning_effort = resolve_route(self.routing, "reflection", player.role, self.model, self.reasoning_effort)
+            routing_calls = game_state.config.routing_calls or {}
+            entry = routing_calls.setdefault(f"reflection:{player.role}", {"model": model, "reasoning_effort": reasoning_effort, "calls": 0})
+            entry["calls"] += 1
+            game_state.config.routing_calls = routing_calls
+            
+            sections, trimmed = prompt.measure(user_prompt, self.budget.get("prompt_token_cap"))
+            game_state.prompt_sizes = game_state.prompt_sizes or []
+            game_state.prompt_sizes.append(PromptSize(
+                call_index=len(game_state.prompt_sizes),
+                phase="reflection",
+                player=player.name,
+                quest=len(game_state.missions),
+                sections=sections,
+                total_tokens=sum(sections.values()),
+                trimmed=trimmed or None
+            ))
+            system_prompt = prompt.render()
+            
             start_time = time.time()
+            response_text = None
             try:
-                response = client.chat.completions.create(
-                    model=self.model,
+                request = dict(
+                    model=model,
                     messages=[
                         {"role": "system", "content": system_prompt},
                         {"role": "user", "content": user_prompt}
                     ],
-                    reasoning_effort=self.reasoning_effort
+                    reasoning_effort=reasoning_effort
                 )
+                with span("llm"), metrics.llm_call("reflection"):
+                    if self.hedger:
+                        response = self.hedger.create(self.client, "reflection", **request)
+                    else:
+                        response = self.client.chat.completions.create(**request)
                 thinking_time = time.time() - start_time
+                metrics.tokens("reflection", getattr(response, "usage", None))
                 response_text = response.choices[0].message.content.strip()
                 
-                data = json.loads(response_text)
+                with span("parse"):
+                    data = json.loads(response_text)
                 self_assessment = data.get("self_assessment", "No reflection provided.")
                 player_observations = data.get("player_observations", {})
                 
             except Exception as e:
                 thinking_time = time.time() - start_time
                 print(f"    Error during reflection: {e}")
+                metrics.count("avalon_llm_fallbacks_total" if response_text is None else "avalon_parse_failures_total",
+                              phase="reflection")
                 self_assessment = "Unable to reflect on this game."
                 player_observations = {}
             
@@ -217,34 +337,124 @@ class MultiGameRunner:
     def run_tournament(self):
         print(f"\n{'='*60}")
         print(f"STARTING AVALON TOURNAMENT: {self.session_id}")
-        print(f"Playing {self.num_games} games with {self.num_players} players")
+        print(f"Playing {'up to ' if self.stopping_rule else ''}{self.num_games} games with {self.num_players} players")
+        if self.stopping_rule:
+            print(f"Early stopping: {self.stopping_rule.describe()}")
         print(f"{'='*60}")
         
-        for game_num in range(1, self.num_games + 1):
-            print(f"\n\n{'#'*60}")
-            print(f"# GAME {game_num}/{self.num_games}")
-            print(f"{'#'*60}")
-            
-            game = LearningAvalonGame(
-                player_memories=self.player_memories,
-                num_players=self.num_players,
-                model=self.model,
-                reasoning_effort=self.reasoning_effort
-            )
-            game_state = game.play_game()
-            self.game_results.append(game_state)
-            self.run_post_game_reflection(game_state, game_num)
-            self.save_progress()
+        with span("tournament", label=self.session_id):
+            for game_num in range(len(self.game_summaries) + 1, self.num_games + 1):
+                print(f"\n\n{'#'*60}")
+                print(f"# GAME {game_num}/{self.num_games}")
+                print(f"{'#'*60}")
+                metrics.progress(game=game_num, games=self.num_games)
+                
+                game = LearningAvalonGame(
+                    player_memories=self.player_memories,
+                    num_players=self.num_players,
+                    model=self.model,
+                    reasoning_effort=self.reasoning_effort,
+                    belief_tracking=self.belief_tracking,
+                    belief_hint=self.belief_hint,
+                    heuristic_players=self.heuristic_players,
+                    discussion_mode=self.discussion_mode,
+                    seed=self.rng.randrange(2**32),
+                    llm_client=self.client,
+                    routing=self.routing,
+                    hedger=self.hedger,
+                    trust_matrix=self.trust_matrix,
+                    trust_memory=self.trust_memory,
+                    **self.budget
+                )
+                game_state = game.play_game()
+                self.run_post_game_reflection(game_state, game_num)
+                if self.trust_matrix is not None:
+                    self.trust_matrix.update(game_state)
+                self.save_progress(game_state, game_num)
+                if self.store_path:
+                    self.add_to_store(game_state, game_num)
+                self.game_summaries.append(GameSummary(game_state, game_num))
+                if self.game_config is None:
+                    self.game_config = game_state.config
+                del self.game_reflections[game_num]
+                
+                if self.stopping_rule:
+                    llm_players = [p for p in self.player_names if p not in self.heuristic_players]
+                    self.stopping_decision = self.stopping_rule.check(self.game_summaries, self.memory_enabled_players, llm_players)
+                    print(f"\n📐 Early stopping: {self.stopping_decision.reason}")
+                    if self.stopping_decision.stop:
+                        print(f"   Metric resolved after {game_num} games, stopping early")
+                        break
         
         print("\n\n" + "="*60)
         print("TOURNAMENT COMPLETE!")
         print("="*60)
         self.print_statistics()
         self.save_tournament_summary()
+        if self.trace_spans:
+            tracing.write_report(os.path.join(self.tournament_dir, "spans.json"))
+    
+    @traced("save")
+    def add_to_store(self, game_state: GameState, game_number: int):
+        """Index the finished game and its reflections in the SQLite game store and its full-text
+        index (see game_store.py, text_index.py)."""
+        from game_store import GameStore
+        from text_index import TextIndex
+        
+        source = os.path.join(self.tournament_dir, "individual_games", f"game_{game_number:02d}.json")
+        game = encode(game_state)
+        reflections = encode(self.game_reflections.get(game_number, []))
+        for store in (GameStore(self.store_path), TextIndex(self.store_path)):
+            store.add_game(game, source=source, reflections=reflections)
+            store.close()
     
+    def load_game(self, game_number: int) -> dict:
+        """Full record of a finished game (with its reflections), read back from individual_games/."""
+        from dataset_loader import load_game
+        return load_game(os.path.join(self.tournament_dir, "individual_games", f"game_{game_number:02d}.json"))
+
+    def resume(self) -> int:
+        """Continue a tournament an earlier run left in tournament_dir instead of overwriting it.
+
+        Finished games (individual_games/game_01.json onwards, with no gaps) are reloaded into the
+        summaries, all_games.json and the trust matrix, and each memory keeps the reflections from
+        those games only. Returns how many games were reloaded; run_tournament plays the rest.
+        """
+        from codec import decode_game
+        from fork import load_memories_before
+
+        memories_file = os.path.join(self.tournament_dir, "player_memories.json")
+        done = 0
+        while os.path.exists(os.path.join(self.tournament_dir, "individual_games", f"game_{done + 1:02d}.json")):
+            done += 1
+        if done == 0 or not os.path.exists(memories_file):
+            return 0
+
+        with open(memories_file) as f:
+            self.session_id = json.load(f)["session_id"]
+        # player_memories.json is written before the game file, so it may hold one game too many
+        restored = load_memories_before(memories_file, done + 1)
+        for name in self.player_memories:
+            if name in restored:
+                self.player_memories[name] = restored[name]
+
+        self._all_games_end = None
+        for game_num in range(1, done + 1):
+            game_state, _ = decode_game(self.load_game(game_num))
+            self.append_to_all_games(encode_game(game_state), game_num)
+            if self.trust_matrix is not None:
+                self.trust_matrix.update(game_state)
+            self.game_summaries.append(GameSummary(game_state, game_num))
+            if self.game_config is None:
+                self.game_config = game_state.config
+            # Keep the per-game seeds of the remaining games where a seeded run would have them
+            self.rng.randrange(2**32)
+        print(f"Resuming {self.session_id}: {done} finished game(s) reloaded from {self.tournament_dir}")
+        return done
+
     def print_statistics(self):
-        total_games = len(self.game_results)
-        good_wins = sum(1 for g in self.game_results if g.winner == "good")
+        total_games = len(self.game_summaries)
+        good_wins = sum(1 for g in self.game_summaries if g.winner == "good")
         evil_wins = total_games - good_wins
         
         print("\nTOURNAMENT STATISTICS:")
@@ -252,13 +462,13 @@ class MultiGameRunner:
         print(f"  Good Wins: {good_wins} ({good_wins/total_games*100:.1f}%)")
         print(f"  Evil Wins: {evil_wins} ({evil_wins/total_games*100:.1f}%)")
         
-        assassin_games = [g for g in self.game_results if g.assassin_phase]
+        assassin_games = [g for g in self.game_summaries if g.assassin_correct is not None]
         if assassin_games:
-            assassin_correct = sum(1 for g in assassin_games if g.assassin_phase.correct)
+            assassin_correct = sum(1 for g in assassin_games if g.assassin_correct)
             print(f"  Assassin Success: {assassin_correct}/{len(assassin_games)} ({assassin_correct/len(assassin_games)*100:.1f}%)")
         
         print("\nPLAYER REFLECTION SUMMARY:")
-        for player_name in self.player_names:
+        for player_name in self.memory_enabled_players:
             reflections = self.player_memories[player_name].reflections
             wins = sum(1 for r in reflections if r.game_result == "won")
             print(f"  {player_name}: {wins}/{len(reflections)} games won ({wins/len(reflections)*100:.1f}%)")
@@ -266,8 +476,8 @@ class MultiGameRunner:
     def save_tournament_summary(self):
         summary_file = os.path.join(self.tournament_dir, "tournament_summary.txt")
         
-        total_games = len(self.game_results)
-        good_wins = sum(1 for g in self.game_results if g.winner == "good")
+        total_games = len(self.game_summaries)
+        good_wins = sum(1 for g in self.game_summaries if g.winner == "good")
         evil_wins = total_games - good_wins
         
         with open(summary_file, 'w') as f:
@@ -284,33 +494,65 @@ class MultiGameRunner:
                 f.write(f"  Memory-enabled players: {', '.join(self.memory_enabled_players)}\n")
                 no_memory = [p for p in self.player_names if p not in self.memory_enabled_players]
                 f.write(f"  No-memory players: {', '.join(no_memory)}\n")
+            if self.heuristic_players:
+                f.write(f"  Heuristic (non-LLM) players: {', '.join(self.heuristic_players)}\n")
             f.write("\n")
             
-            if self.game_results:
-                config = self.game_results[0].config
+            if self.game_config:
+                config = self.game_config
                 f.write("GAME CONFIGURATION:\n")
                 f.write(f"  Model: {config.model}\n")
                 f.write(f"  Reasoning Effort: {config.reasoning_effort}\n")
                 f.write(f"  Mission Team Sizes: {config.mission_team_sizes}\n")
-                f.write(f"  Messages Per Player: {config.num_messages_per_player}\n\n")
+                f.write(f"  Messages Per Player: {config.num_messages_per_player}\n")
+                f.write(f"  Discussion Mode: {config.discussion_mode}\n")
+                if self.routing:
+                    f.write("  Routing:\n")
+                    for key, route in sorted(self.routing.items()):
+                        f.write(f"    {key}: {route.get('model', config.model)} / {route.get('reasoning_effort', config.reasoning_effort)}\n")
+                if self.budget:
+                    downgraded = sum(g.effort_downgrades for g in self.game_summaries)
+                    f.write(f"  Per-Game Budget: {', '.join(f'{k}={v}' for k, v in self.budget.items())}"
+                            f" ({downgraded} calls downgraded)\n")
+                if self.hedger:
+                    f.write(f"  Hedging: at p{self.hedger.percentile * 100:g} of recent per-phase latency\n")
+                    for phase, stats in sorted(self.hedger.summary().items()):
+                        f.write(f"    {phase}: hedged {stats['hedged']}/{stats['calls']} ({stats['hedge_rate']:.1%}),"
+                                f" hedge won {stats['hedge_won']}, {stats['wasted_tokens']} tokens wasted\n")
+                f.write("\n")
             
             f.write("TOURNAMENT STATISTICS:\n")
             f.write(f"  Total Games: {total_games}\n")
             f.write(f"  Good Wins: {good_wins} ({good_wins/total_games*100:.1f}%)\n")
             f.write(f"  Evil Wins: {evil_wins} ({evil_wins/total_games*100:.1f}%)\n\n")
             
-            assassin_games = [g for g in self.game_results if g.assassin_phase]
+            assassin_games = [g for g in self.game_summaries if g.assassin_correct is not None]
             if assassin_games:
-                assassin_correct = sum(1 for g in assassin_games if g.assassin_phase.correct)
+                assassin_correct = sum(1 for g in assassin_games if g.assassin_correct)
                 f.write(f"  Assassin Phase Triggered: {len(assassin_games)} times\n")
                 f.write(f"  Assassin Success Rate: {assassin_correct}/{len(assassin_games)} ({assassin_correct/len(assassin_games)*100:.1f}%)\n\n")
             
+            if self.stopping_rule:
+                decision = self.stopping_decision
+                f.write("EARLY STOPPING:\n")
+                f.write(f"  Rule: {self.stopping_rule.describe()}\n")
+                f.write(f"  Games Played: {total_games} of at most {self.num_games}"
+                        f" ({'stopped early' if decision and decision.stop else 'ran to the cap'})\n")
+                if decision and decision.estimate is not None:
+                    f.write(f"  Final Estimate: {decision.estimate:.3f} from {decision.observations} observations\n")
+                    f.write(f"  Final Interval ({self.stopping_rule.confidence:.0%}): [{decision.interval[0]:.3f}, {decision.interval[1]:.3f}]\n")
+                if decision:
+                    f.write(f"  Last Check: {decision.reason}\n")
+                f.write("\n")
+            
             f.write("PLAYER STATISTICS:\n")
             for player_name in self.player_names:
                 f.write(f"  {player_name}:")
                 
                 # Indicate if player has memory
-                if player_name in self.memory_enabled_players:
+                if player_name in self.heuristic_players:
+                    f.write(" [HEURISTIC]\n")
+                elif player_name in self.memory_enabled_players:
                     f.write(" [MEMORY ENABLED]\n")
                 else:
                     f.write(" [NO MEMORY]\n")
@@ -337,64 +579,92 @@ class MultiGameRunner:
         
         print("\n📊 Tournament summary saved to: tournament_summary.txt")
     
-    def save_progress(self):
+    @traced("save")
+    def save_progress(self, game_state: GameState, game_number: int):
+        """Write the finished game to disk. Earlier games are already there and are not rewritten."""
         memories_data = {
+            "schema_version": SCHEMA_VERSION,
             "session_id": self.session_id,
-            "num_games": len(self.game_results),
+            "num_games": game_number,
             "memory_enabled_players": self.memory_enabled_players,
             "all_players": self.player_names,
             "player_memories": {
                 name: {
                     "player_name": memory.player_name,
-                    "reflections": [asdict(r) for r in memory.reflections]
+                    "reflections": encode(memory.reflections)
                 }
                 for name, memory in self.player_memories.items()
             }
         }
         
         memories_file = os.path.join(self.tournament_dir, "player_memories.json")
-        with open(memories_file, 'w') as f:
-            json.dump(memories_data, f, indent=2)
-        
-        def convert_to_dict(obj):
-            if hasattr(obj, '__dataclass_fields__'):
-                return {k: convert_to_dict(v) for k, v in asdict(obj).items()}
-            elif isinstance(obj, list):
-                return [convert_to_dict(item) for item in obj]
-            else:
-                return obj
+        write_json(memories_file, memories_data, self.compact_output)
+        if self.trust_matrix is not None:
+            write_json(os.path.join(self.tournament_dir, "trust_matrix.json"), self.trust_matrix.to_dict(), self.compact_output)
         
-        games_data = {
-            "session_id": self.session_id,
-            "total_games": len(self.game_results),
-            "memory_enabled_players": self.memory_enabled_players,
-            "all_players": self.player_names,
-            "games": [convert_to_dict(game) for game in self.game_results]
-        }
-        
-        games_file = os.path.join(self.tournament_dir, "all_games.json")
-        with open(games_file, 'w') as f:
-            json.dump(games_data, f, indent=2)
+        game_dict = encode_game(game_state)
+        self.append_to_all_games(game_dict, game_number)
         
         games_dir = os.path.join(self.tournament_dir, "individual_games")
         os.makedirs(games_dir, exist_ok=True)
         
-        for idx, game in enumerate(self.game_results, 1):
-            game_dict = convert_to_dict(game)
-            
-            if idx in self.game_reflections:
-                game_dict["post_game_reflections"] = [
-                    asdict(reflection) for reflection in self.game_reflections[idx]
-                ]
-            
-            individual_game_file = os.path.join(games_dir, f"game_{idx:02d}.json")
-            with open(individual_game_file, 'w') as f:
-                json.dump(game_dict, f, indent=2)
+        if self.game_reflections.get(game_number):
+            game_dict["post_game_reflections"] = encode(self.game_reflections[game_number])
+        
+        individual_game_file = os.path.join(games_dir, f"game_{game_number:02d}.json")
+        write_json(individual_game_file, game_dict, self.compact_output)
+        
+        if self.record_trace:
+            from replay import save_trace
+            save_trace(os.path.join(self.tournament_dir, "trace.json"), {
+                "kind": "tournament",
+                "num_games": game_number,
+                "num_players": self.num_players,
+                "model": self.model,
+                "reasoning_effort": self.reasoning_effort,
+                "memory_enabled_players": self.memory_enabled_players,
+                "belief_tracking": self.belief_tracking,
+                "belief_hint": self.belief_hint,
+                "heuristic_players": self.heuristic_players,
+                "discussion_mode": self.discussion_mode,
+                "seed": self.seed,
+                "routing": self.routing,
+                "budget": self.budget,
+                "trust_matrix": self.trust_matrix is not None,
+                "trust_memory": self.trust_memory
+            }, self.client.calls)
         
         print(f"\n📁 Progress saved to: {self.tournament_dir}")
         print("    - player_memories.json")
         print("    - all_games.json")
-        print(f"    - individual_games/ (game_01.json - game_{len(self.game_results):02d}.json)")
+        print(f"    - individual_games/ (game_01.json - game_{game_number:02d}.json)")
+    
+    def append_to_all_games(self, game_dict: dict, game_number: int):
+        """Add one game to all_games.json in place: the closing brackets are overwritten by the new
+        game, so the file stays valid JSON after every game without re-serializing earlier ones."""
+        games_file = os.path.join(self.tournament_dir, "all_games.json")
+        if self.compact_output:
+            entry = dumps(game_dict, compact=True)
+            separator, opening, closing = ",", ',"games":[', f'],"total_games":{game_number}}}'
+        else:
+            entry = textwrap.indent(dumps(game_dict), "    ")
+            separator, opening, closing = ",\n", ',\n  "games": [\n', f'\n  ],\n  "total_games": {game_number}\n}}\n'
+        with open(games_file, 'r+' if self._all_games_end else 'w') as f:
+            if self._all_games_end:
+                f.seek(self._all_games_end)
+                f.truncate()
+                f.write(separator)
+            else:
+                header = dumps({
+                    "schema_version": SCHEMA_VERSION,
+                    "session_id": self.session_id,
+                    "memory_enabled_players": self.memory_enabled_players,
+                    "all_players": self.player_names
+                }, self.compact_output)
+                f.write(header.rstrip("}").rstrip() + opening)
+            f.write(entry)
+            self._all_games_end = f.tell()
+            f.write(closing)
 
 
 def main():
@@ -414,6 +684,23 @@ def main():
     model = None  # Will use default from main.py
     reasoning_effort = None  # Will use default from main.py
     memory_enabled_players = None  # Default: all players have memory
+    belief_tracking = False
+    belief_hint = False
+    heuristic_players = None
+    discussion_mode = None  # Will use default from main.py
+    store_path = None
+    seed = None
+    record_trace = False
+    trace_spans = False
+    stopping_options = {}
+    routing = {}
+    budget = {}
+    hedge_percentile = None
+    compact_output = False
+    trust_matrix = False
+    trust_memory = None
+    metrics_port = None
+    metrics_dir = None
     
     # Simple argument parsing
     for i, arg in enumerate(sys.argv[1:]):
@@ -428,6 +715,86 @@ def main():
         elif arg == "--memory-players" and i + 1 < len(sys.argv) - 1:
             # Comma-separated list of player names
             memory_enabled_players = [p.strip() for p in sys.argv[i + 2].split(',')]
+        elif arg == "--belief-tracking":
+            belief_tracking = True
+        elif arg == "--belief-hint":
+            belief_hint = True
+        elif arg == "--heuristic-players" and i + 1 < len(sys.argv) - 1:
+            # Comma-separated list of seats played by rule-based agents
+            heuristic_players = [p.strip() for p in sys.argv[i + 2].split(',')]
+        elif arg == "--discussion-mode" and i + 1 < len(sys.argv) - 1:
+            discussion_mode = sys.argv[i + 2]
+        elif arg == "--store" and i + 1 < len(sys.argv) - 1:
+            # SQLite game store to index each game into as it finishes
+            store_path = sys.argv[i + 2]
+        elif arg == "--seed" and i + 1 < len(sys.argv) - 1:
+            seed = int(sys.argv[i + 2])
+        elif arg == "--record-trace":
+            # Save every request/response to trace.json for offline replay (see replay.py)
+            record_trace = True
+        elif arg == "--trace-spans":
+            # Time every phase and LLM call; writes spans.json (Chrome trace) and spans.summary.txt
+            trace_spans = True
+        elif arg == "--stop-metric" and i + 1 < len(sys.argv) - 1:
+            # Sequential testing: good_win_rate, assassin_success or memory_gap; --num-games becomes the cap
+            stopping_options["metric"] = sys.argv[i + 2]
+        elif arg == "--stop-ci-width" and i + 1 < len(sys.argv) - 1:
+            stopping_options["ci_width"] = float(sys.argv[i + 2])
+        elif arg == "--stop-sprt" and i + 1 < len(sys.argv) - 1:
+            # p0,p1 for Wald's SPRT instead of a CI-width target
+            p0, p1 = sys.argv[i + 2].split(',')
+            stopping_options.update(method="sprt", p0=float(p0), p1=float(p1))
+        elif arg == "--stop-min-games" and i + 1 < len(sys.argv) - 1:
+            stopping_options["min_games"] = int(sys.argv[i + 2])
+        elif arg == "--confidence" and i + 1 < len(sys.argv) - 1:
+            stopping_options["confidence"] = float(sys.argv[i + 2])
+        elif arg == "--route" and i + 1 < len(sys.argv) - 1:
+            # Per-phase/role model and effort, e.g. assassin_guess=high or discussion=gpt-5-mini:minimal (repeatable)
+            from main import parse_route
+            key, route = parse_route(sys.argv[i + 2])
+            routing[key] = route
+        elif arg == "--time-budget" and i + 1 < len(sys.argv) - 1:
+            # Seconds per game; low-stakes calls lose reasoning effort when a game runs behind
+            budget["time_budget"] = float(sys.argv[i + 2])
+        elif arg == "--token-budget" and i + 1 < len(sys.argv) - 1:
+            budget["token_budget"] = int(sys.argv[i + 2])
+        elif arg == "--budget-floor" and i + 1 < len(sys.argv) - 1:
+            budget["budget_floor"] = sys.argv[i + 2]
+        elif arg == "--prompt-token-cap" and i + 1 < len(sys.argv) - 1:
+            # Estimated tokens per prompt; memory, history and old discussion are trimmed first (see prompts.py)
+            budget["prompt_token_cap"] = int(sys.argv[i + 2])
+        elif arg == "--session-mode" and i + 1 < len(sys.argv) - 1:
+            # local or responses: each player keeps one conversation and gets only new context per turn (see sessions.py)
+            budget["session_mode"] = sys.argv[i + 2]
+        elif arg == "--hedge":
+            # Duplicate calls slower than this percentile of recent latency for their phase (default 0.9)
+            has_value = i + 1 < len(sys.argv) - 1 and not sys.argv[i + 2].startswith("--")
+            hedge_percentile = float(sys.argv[i + 2]) if has_value else 0.9
+        elif arg == "--compact-json":
+            # Minified game and memory files (no indentation)
+            compact_output = True
+        elif arg == "--trust-matrix":
+            # Keep trust_matrix.json: per-pair counts from revealed roles, updated after every game (needs numpy)
+            trust_matrix = True
+        elif arg == "--trust-memory" and i + 1 < len(sys.argv) - 1:
+            # augment: show the matrix to memory-enabled players; replace: instead of their prose observations
+            trust_memory = sys.argv[i + 2]
+        elif arg == "--metrics-port" and i + 1 < len(sys.argv) - 1:
+            # Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while the tournament runs (see metrics.py)
+            metrics_port = int(sys.argv[i + 2])
+        elif arg == "--metrics-dir" and i + 1 < len(sys.argv) - 1:
+            # Only report into DIR; `python metrics.py serve --dir DIR` aggregates several runs
+            metrics_dir = sys.argv[i + 2]
+    
+    if metrics_port:
+        metrics.serve(metrics_port, directory=metrics_dir)
+    elif metrics_dir:
+        metrics.enable(metrics_dir)
+    
+    stopping_rule = None
+    if stopping_options:
+        from early_stopping import StoppingRule
+        stopping_rule = StoppingRule(**stopping_options)
     
     # Create and run tournament
     runner = MultiGameRunner(
@@ -435,7 +802,22 @@ def main():
         num_players=num_players,
         model=model,
         reasoning_effort=reasoning_effort,
-        memory_enabled_players=memory_enabled_players
+        memory_enabled_players=memory_enabled_players,
+        belief_tracking=belief_tracking,
+        belief_hint=belief_hint,
+        heuristic_players=heuristic_players,
+        discussion_mode=discussion_mode,
+        store_path=store_path,
+        seed=seed,
+        record_trace=record_trace,
+        trace_spans=trace_spans,
+        stopping_rule=stopping_rule,
+        routing=routing,
+        budget=budget,
+        hedge_percentile=hedge_percentile,
+        compact_output=compact_output,
+        trust_matrix=trust_matrix,
+        trust_memory=trust_memory
     )
     runner.run_tournament()
     
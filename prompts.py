@@ -0,0 +1,240 @@
+import os
+import re
+import sys
+import json
+from collections import defaultdict
+from statistics import mean, quantiles
+from typing import Dict, List, Optional, Tuple
+
+from dataset_loader import find_game_files, load_game
+
+# Order in which a prompt_token_cap trims sections: lowest first. None = never trimmed
+SECTION_PRIORITIES: Dict[str, Optional[int]] = {
+    "role": None,
+    "instructions": None,
+    "proposed_team": None,
+    "revealed_roles": None,
+    "players": 90,
+    "quest": 80,
+    "evil_discussion": 70,
+    "assassin_phase": 70,
+    "discussion": 60,
+    "game_summary": 60,
+    "previous_proposals": 50,
+    "previous_missions": 40,
+    "all_discussions": 35,
+    "trust_matrix": 45,
+    "memory": 30,
+    "belief_hint": 20,
+}
+DEFAULT_PRIORITY = 50
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_encoding = None
+
+
+def _tiktoken_encoding():
+    """tiktoken's o200k_base when installed (loaded on first use), else False."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoding = False
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count with tiktoken when installed; otherwise one token per word (plus one per further
+    8 characters of long words) and per punctuation mark, which tracks BPE counts on these prompts."""
+    encoding = _tiktoken_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    return sum(1 + (len(piece) - 1) // 8 for piece in _PIECE_RE.findall(text))
+
+
+class Prompt:
+    """A system prompt assembled from named sections; render() concatenates them in order."""
+
+    def __init__(self):
+        self.sections: List[List[str]] = []
+
+    def add(self, name: str, text: str) -> "Prompt":
+        if text:
+            self.sections.append([name, text])
+        return self
+
+    def insert_before(self, before: str, name: str, text: str) -> "Prompt":
+        """Insert a section ahead of the first `before` section (at the end if there is none)."""
+        for idx, (section, _) in enumerate(self.sections):
+            if section == before:
+                if text:
+                    self.sections.insert(idx, [name, text])
+                return self
+        return self.add(name, text)
+
+    def render(self) -> str:
+        return "".join(text for _, text in self.sections)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def sizes(self) -> Dict[str, int]:
+        sizes = defaultdict(int)
+        for name, text in self.sections:
+            sizes[name] += estimate_tokens(text)
+        return dict(sizes)
+
+    def trim(self, cap: int, reserved: int = 0) -> Dict[str, int]:
+        """Cut the lowest-priority sections until the estimate (plus `reserved`) fits in `cap`.
+
+        History sections lose their oldest lines first (the header line stays); a section is
+        dropped once nothing but its header is left. Returns tokens removed per section.
+        """
+        removed = defaultdict(int)
+        total = sum(self.sizes().values()) + reserved
+        trimmable = sorted({name for name, _ in self.sections if SECTION_PRIORITIES.get(name, DEFAULT_PRIORITY) is not None},
+                           key=lambda name: SECTION_PRIORITIES.get(name, DEFAULT_PRIORITY))
+        for name in trimmable:
+            for section in [s for s in self.sections if s[0] == name]:
+                if total <= cap:
+                    return dict(removed)
+                before = estimate_tokens(section[1])
+                lines = section[1].splitlines(keepends=True)
+                header = next((i for i, line in enumerate(lines) if line.strip()), 0) + 1
+                while len(lines) > header and total - before + estimate_tokens("".join(lines)) > cap:
+                    del lines[header]
+                if len(lines) <= header:
+                    self.sections.remove(section)
+                    after = 0
+                else:
+                    section[1] = "".join(lines)
+                    after = estimate_tokens(section[1])
+                removed[name] += before - after
+                total -= before - after
+        return dict(removed)
+
+    def measure(self, user_prompt: str, cap: Optional[int] = None) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """(tokens per section incl. "instructions" for the user prompt, tokens trimmed per section)."""
+        instructions = estimate_tokens(user_prompt)
+        trimmed = self.trim(cap, reserved=instructions) if cap else {}
+        sizes = self.sizes()
+        sizes["instructions"] = instructions
+        return sizes, trimmed
+
+
+def _percentile(values: List[float], p: int) -> float:
+    if len(values) < 2:
+        return float(values[0]) if values else 0.0
+    return quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def report(paths: List[str]) -> dict:
+    """Prompt-size distribution per player count and phase, and section growth per quest, from the
+    prompt_sizes recorded in game files."""
+    calls = defaultdict(list)
+    by_quest = defaultdict(lambda: defaultdict(list))
+    games = 0
+    for path in find_game_files(paths):
+        game = load_game(path)
+        records = game.get("prompt_sizes")
+        if not records:
+            continue
+        games += 1
+        num_players = len(game["players"])
+        for record in records:
+            calls[(num_players, record["phase"])].append(record)
+            by_quest[num_players][record["quest"]].append(record)
+
+    phases = {}
+    for (num_players, phase), records in sorted(calls.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        totals = [r["total_tokens"] for r in records]
+        sent = [r["sent_tokens"] for r in records if r.get("sent_tokens") is not None]
+        sections = defaultdict(list)
+        for r in records:
+            for name, tokens in r["sections"].items():
+                sections[name].append(tokens)
+        phases.setdefault(str(num_players), {})[str(phase)] = {
+            "calls": len(records),
+            "mean_tokens": round(mean(totals), 1),
+            "p50_tokens": round(_percentile(totals, 50), 1),
+            "p90_tokens": round(_percentile(totals, 90), 1),
+            "max_tokens": max(totals),
+            "trimmed_calls": sum(1 for r in records if r.get("trimmed")),
+            # Session mode: tokens of the new turn actually sent (see sessions.py)
+            "mean_sent_tokens": round(mean(sent), 1) if sent else None,
+            # Mean over all calls of the phase (0 where the section was absent)
+            "sections": {name: round(sum(values) / len(records), 1)
+                         for name, values in sorted(sections.items(), key=lambda item: -sum(item[1]))}
+        }
+
+    growth = {}
+    for num_players, quests in sorted(by_quest.items()):
+        growth[str(num_players)] = {}
+        for quest, records in sorted(quests.items()):
+            sections = defaultdict(int)
+            for r in records:
+                for name, tokens in r["sections"].items():
+                    sections[name] += tokens
+            growth[str(num_players)][str(quest)] = {name: round(tokens / len(records), 1)
+                                                     for name, tokens in sorted(sections.items(), key=lambda item: -item[1])}
+
+    return {"games": games, "estimator": "tiktoken o200k_base" if _tiktoken_encoding() else "word-piece heuristic",
+            "by_phase": phases, "growth_by_quest": growth}
+
+
+def main():
+    """
+    python prompts.py [paths...] [--output report.json]
+
+    Per-section prompt token estimates recorded before every LLM call (GameState.prompt_sizes):
+    distribution per player count and phase, and how each section grows quest by quest.
+    Cap prompts during play with --prompt-token-cap N (main.py / multi_game_runner.py).
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    paths = []
+    output_file = None
+    i = 0
+    while i < len(args):
+        if args[i] == "--output" and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 2
+        else:
+            paths.append(args[i])
+            i += 1
+    if not paths:
+        paths = [os.path.dirname(os.path.abspath(__file__))]
+
+    result = report(paths)
+    if not result["games"]:
+        print("No games with prompt_sizes found (they are recorded by games played since prompts were sectioned)")
+        return
+
+    print(f"Prompt sizes from {result['games']} games ({result['estimator']})\n")
+    for num_players, phases in result["by_phase"].items():
+        print(f"{num_players} PLAYERS:")
+        for phase, stats in phases.items():
+            top = ", ".join(f"{name} {tokens:.0f}" for name, tokens in list(stats["sections"].items())[:4])
+            trimmed = f", {stats['trimmed_calls']} trimmed" if stats["trimmed_calls"] else ""
+            if stats["mean_sent_tokens"] is not None:
+                trimmed += f", sent {stats['mean_sent_tokens']:.0f}"
+            print(f"  {phase:<16} {stats['calls']:>5} calls  mean {stats['mean_tokens']:>6.0f}  p90 {stats['p90_tokens']:>6.0f}"
+                  f"  max {stats['max_tokens']:>6}{trimmed}  [{top}]")
+        print("  growth by quest (mean tokens per call):")
+        for quest, sections in result["growth_by_quest"][num_players].items():
+            print(f"    quest {quest}: " + ", ".join(f"{name} {tokens:.0f}" for name, tokens in list(sections.items())[:5]))
+        print()
+
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"📁 Report saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import os
+import sys
+import json
+import time
+import difflib
+import tempfile
+import threading
+from types import SimpleNamespace
+from typing import List, Optional
+
+TRACE_VERSION = 1
+
+
+class RecordingClient:
+    """Wraps an OpenAI client and records every chat (and Responses API) request and its response,
+    in call order."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls: List[dict] = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        if hasattr(inner, "responses"):
+            self.responses = SimpleNamespace(create=self.create_response)
+
+    def _record(self, entry: dict, call, **kwargs):
+        try:
+            response = call(**kwargs)
+        except Exception as e:
+            # Record failures too, so the replay takes the same fallback path
+            entry["error"] = repr(e)
+            with self.lock:
+                self.calls.append(entry)
+            raise
+        return response
+
+    def create(self, **kwargs):
+        return self.record(self.inner.chat.completions.create, **kwargs)
+
+    def record(self, call, **kwargs):
+        """Record one logical chat call answered by `call(**kwargs)`. Hedging.create routes through
+        this with the inner client, so only the answer that was used is recorded, not every copy."""
+        entry = {
+            "model": kwargs.get("model"),
+            "reasoning_effort": kwargs.get("reasoning_effort"),
+            "messages": kwargs.get("messages")
+        }
+        response = self._record(entry, call, **kwargs)
+
+        message = response.choices[0].message
+        entry["content"] = message.content
+        entry["reasoning_content"] = getattr(message, "reasoning_content", None)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            entry["usage"] = {
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "completion_tokens": getattr(usage, "completion_tokens", None)
+            }
+        with self.lock:
+            self.calls.append(entry)
+        return response
+
+    def create_response(self, **kwargs):
+        entry = {
+            "api": "responses",
+            "model": kwargs.get("model"),
+            "reasoning_effort": (kwargs.get("reasoning") or {}).get("effort"),
+            "messages": kwargs.get("input"),
+            "previous_response_id": kwargs.get("previous_response_id")
+        }
+        response = self._record(entry, self.inner.responses.create, **kwargs)
+
+        entry["response_id"] = response.id
+        entry["content"] = response.output_text
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            entry["usage"] = {
+                "prompt_tokens": getattr(usage, "input_tokens", None),
+                "completion_tokens": getattr(usage, "output_tokens", None)
+            }
+        with self.lock:
+            self.calls.append(entry)
+        return response
+
+
+class ReplayError(Exception):
+    pass
+
+
+class ReplayClient:
+    """Offline stand-in for the OpenAI client that serves responses from a recorded trace.
+
+    Calls are matched in order; if the next recorded request differs (e.g. concurrent
+    discussion calls finishing in another order) an unused identical request is used
+    instead. A request with no identical recording is flagged in `mismatches` and
+    answered with the next recorded response so the game can continue. Responses API
+    calls also match on previous_response_id, which replays as the recorded ids.
+    """
+
+    def __init__(self, calls: List[dict]):
+        self.calls = calls
+        self.used = [False] * len(calls)
+        self.cursor = 0
+        self.num_requests = 0
+        self.mismatches: List[dict] = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.responses = SimpleNamespace(create=self.create_response)
+
+    def _take(self, messages: list, api: str = "chat", previous_response_id: Optional[str] = None) -> Optional[dict]:
+        while self.cursor < len(self.calls) and self.used[self.cursor]:
+            self.cursor += 1
+
+        for idx in range(self.cursor, len(self.calls)):
+            call = self.calls[idx]
+            if (not self.used[idx] and call["messages"] == messages and call.get("api", "chat") == api
+                    and call.get("previous_response_id") == previous_response_id):
+                self.used[idx] = True
+                return self.calls[idx]
+
+        if self.cursor >= len(self.calls):
+            self.mismatches.append({"call_index": self.num_requests, "diff": "trace exhausted"})
+            return None
+
+        expected = self.calls[self.cursor]
+        self.used[self.cursor] = True
+        self.mismatches.append({
+            "call_index": self.num_requests,
+            "diff": _prompt_diff(expected["messages"], messages)
+        })
+        return expected
+
+    def unused_calls(self) -> int:
+        return self.used.count(False)
+
+    def _next(self, messages: list, api: str = "chat", previous_response_id: Optional[str] = None) -> dict:
+        with self.lock:
+            entry = self._take(messages, api, previous_response_id)
+            self.num_requests += 1
+
+        if entry is None:
+            raise ReplayError("No recorded response left in trace")
+        if "error" in entry:
+            raise ReplayError(entry["error"])
+        return entry
+
+    def create(self, **kwargs):
+        entry = self._next(kwargs.get("messages"))
+
+        message = SimpleNamespace(content=entry["content"])
+        if entry.get("reasoning_content") is not None:
+            message.reasoning_content = entry["reasoning_content"]
+        usage = entry.get("usage") or {}
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            usage=SimpleNamespace(
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens")
+            )
+        )
+
+    def create_response(self, **kwargs):
+        entry = self._next(kwargs.get("input"), "responses", kwargs.get("previous_response_id"))
+        usage = entry.get("usage") or {}
+        return SimpleNamespace(
+            id=entry.get("response_id"),
+            output_text=entry["content"],
+            usage=SimpleNamespace(
+                input_tokens=usage.get("prompt_tokens"),
+                output_tokens=usage.get("completion_tokens")
+            )
+        )
+
+
+def _prompt_diff(expected: list, actual: list) -> str:
+    def flatten(messages):
+        lines = []
+        for m in messages or []:
+            lines.append(f"--- {m['role']} ---")
+            lines.extend(m["content"].splitlines())
+        return lines
+    return "\n".join(difflib.unified_diff(flatten(expected), flatten(actual), "recorded", "replayed", lineterm="", n=1))
+
+
+def save_trace(filename: str, header: dict, calls: List[dict]):
+    data = {"trace_version": TRACE_VERSION, **header, "calls": calls}
+    with open(filename, 'w') as f:
+        json.dump(data, f)
+
+
+def load_trace(filename: str) -> dict:
+    with open(filename) as f:
+        return json.load(f)
+
+
+def replay_game(trace: dict) -> tuple:
+    """Re-run a single recorded AvalonGame. Returns (game_state, replay_client)."""
+    from main import AvalonGame, BUDGET_FLOOR
+
+    replay_client = ReplayClient(trace["calls"])
+    game = AvalonGame(
+        num_players=trace["num_players"],
+        model=trace["model"],
+        reasoning_effort=trace["reasoning_effort"],
+        belief_tracking=trace.get("belief_tracking", False),
+        belief_hint=trace.get("belief_hint", False),
+        heuristic_players=trace.get("heuristic_players"),
+        discussion_mode=trace.get("discussion_mode", "sequential"),
+        seed=trace["seed"],
+        llm_client=replay_client,
+        routing=trace.get("routing"),
+        time_budget=trace.get("time_budget"),
+        token_budget=trace.get("token_budget"),
+        budget_floor=trace.get("budget_floor", BUDGET_FLOOR),
+        prompt_token_cap=trace.get("prompt_token_cap"),
+        session_mode=trace.get("session_mode")
+    )
+    return game.play_game(), replay_client
+
+
+def replay_tournament(trace: dict, output_dir: str = None) -> tuple:
+    """Re-run a recorded tournament into a scratch folder. Returns (runner, replay_client)."""
+    from multi_game_runner import MultiGameRunner
+
+    replay_client = ReplayClient(trace["calls"])
+    runner = MultiGameRunner(
+        num_games=trace["num_games"],
+        num_players=trace["num_players"],
+        model=trace["model"],
+        reasoning_effort=trace["reasoning_effort"],
+        memory_enabled_players=trace.get("memory_enabled_players"),
+        belief_tracking=trace.get("belief_tracking", False),
+        belief_hint=trace.get("belief_hint", False),
+        heuristic_players=trace.get("heuristic_players"),
+        discussion_mode=trace.get("discussion_mode", "sequential"),
+        tournament_dir=output_dir or tempfile.mkdtemp(prefix="avalon_replay_"),
+        seed=trace["seed"],
+        llm_client=replay_client,
+        routing=trace.get("routing"),
+        budget=trace.get("budget"),
+        trust_matrix=trace.get("trust_matrix", False),
+        trust_memory=trace.get("trust_memory")
+    )
+    runner.run_tournament()
+    return runner, replay_client
+
+
+def main():
+    """Replay a recorded game or tournament offline: python replay.py <game.trace.json | tournament_dir/trace.json>"""
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return
+
+    path = sys.argv[1]
+    if os.path.isdir(path):
+        path = os.path.join(path, "trace.json")
+    trace = load_trace(path)
+
+    start_time = time.time()
+    if trace.get("kind") == "tournament":
+        _, replay_client = replay_tournament(trace)
+    else:
+        _, replay_client = replay_game(trace)
+    elapsed = time.time() - start_time
+
+    print(f"\n{'='*60}")
+    print(f"REPLAY COMPLETE ({elapsed:.2f}s, {replay_client.num_requests}/{len(trace['calls'])} recorded calls)")
+    print(f"{'='*60}")
+    if replay_client.unused_calls():
+        print(f"⚠️  {replay_client.unused_calls()} recorded calls were never requested")
+    if replay_client.mismatches:
+        print(f"⚠️  {len(replay_client.mismatches)} prompts differ from the recording:")
+        for mismatch in replay_client.mismatches[:5]:
+            print(f"\n  Call {mismatch['call_index']}:")
+            print("    " + mismatch["diff"].replace("\n", "\n    "))
+        sys.exit(1)
+    if replay_client.unused_calls():
+        sys.exit(1)
+    print("✅ All prompts match the recording")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Avalon rules tables shared by the engine, agents and analysis tools (no third-party imports)
+
+MISSION_TEAM_SIZES = {
+    5: [2, 3, 2, 3, 3],
+    6: [2, 3, 4, 3, 4],
+    7: [2, 3, 3, 4, 4],
+    8: [3, 4, 4, 5, 5],
+    9: [3, 4, 4, 5, 5],
+    10: [3, 4, 4, 5, 5]
+}
+
+ROLE_CONFIGS = {
+    5: {
+        "roles": ["merlin", "good", "good", "assassin", "evil"],
+        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve"]
+    },
+    6: {
+        "roles": ["merlin", "percival", "good", "good", "morgana", "mordred"],
+        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank"],
+        "assassin_role": "mordred"
+    },
+    7: {
+        "roles": ["merlin", "percival", "good", "good", "morgana", "mordred", "oberon"],
+        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace"],
+        "assassin_role": "morgana"
+    },
+    8: {
+        "roles": ["merlin", "percival", "good", "good", "good", "morgana", "mordred", "assassin"],
+        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"]
+    },
+    9: {
+        "roles": ["merlin", "percival", "good", "good", "good", "good", "morgana", "mordred", "assassin"],
+        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry", "Iris"]
+    },
+    10: {
+        "roles": ["merlin", "percival", "good", "good", "good", "good", "morgana", "mordred", "oberon", "assassin"],
+        "names": ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry", "Iris", "Jack"]
+    }
+}
+
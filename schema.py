@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Saved-game records. Kept free of engine and SDK imports so analysis code can load them cheaply;
+# main.py and multi_game_runner.py re-export them.
+
+@dataclass
+class Player:
+    name: str
+    role: str
+    is_good: bool
+    special_knowledge: List[str]
+    
+@dataclass
+class Message:
+    player: str
+    content: str
+    timestamp: int
+    global_turn_id: int
+    phase: str
+    thinking_time: float
+    reasoning_content: Optional[str] = None
+    
+@dataclass
+class TeamProposal:
+    leader: str
+    team_members: List[str]
+    reasoning: str
+    thinking_time: float
+    reasoning_content: Optional[str] = None
+    
+@dataclass
+class Vote:
+    player: str
+    vote: str
+    comment: str
+    thinking_time: float
+    reasoning_content: Optional[str] = None
+    
+@dataclass
+class MissionAction:
+    player: str
+    action: str
+
+@dataclass
+class Proposal:
+    proposal_id: int
+    leader: str
+    team_members: List[str]
+    reasoning: str
+    thinking_time: float
+    reasoning_content: Optional[str]
+    votes: List[Vote]
+    vote_result: str
+    
+@dataclass
+class Mission:
+    mission_number: int
+    proposals: List[Proposal]
+    final_team_index: int
+    discussion: List[Message]
+    quest_actions: Optional[List[MissionAction]]
+    mission_result: Optional[str]
+    fail_count: Optional[int]
+    
+@dataclass
+class AssassinPhase:
+    assassin: str
+    evil_discussion: List[Message]
+    guess: str
+    reasoning: str
+    correct: bool
+    thinking_time: float
+    reasoning_content: Optional[str] = None
+
+@dataclass
+class BeliefSnapshot:
+    global_turn_id: int
+    mission_number: int
+    proposal_id: Optional[int]
+    event: str
+    evil_probability: Dict[str, float]
+    merlin_probability: Dict[str, float]
+    entropy_bits: float
+
+@dataclass
+class EffortDowngrade:
+    call_index: int
+    phase: str
+    player: Optional[str]
+    requested_effort: str
+    used_effort: str
+    pressure: float  # spend so far / budget allowed by this point of the game
+    elapsed_seconds: float
+    tokens_used: int
+
+@dataclass
+class PromptSize:
+    call_index: int
+    phase: Optional[str]
+    player: Optional[str]
+    quest: int
+    sections: Dict[str, int]  # estimated tokens per named section; "instructions" is the user prompt
+    total_tokens: int
+    trimmed: Optional[Dict[str, int]] = None  # tokens cut per section by prompt_token_cap
+    sent_tokens: Optional[int] = None  # session mode: estimated input tokens the call actually sent (local mode resends the history)
+
+@dataclass
+class GameConfig:
+    model: str
+    reasoning_effort: str
+    mission_team_sizes: List[int]
+    num_messages_per_player: int
+    num_players: int
+    synthetic_players: Optional[List[str]] = None
+    discussion_mode: str = "sequential"
+    seed: Optional[int] = None
+    routing: Optional[Dict[str, dict]] = None  # policy: "phase" / "phase:role" / "*:role" -> model, reasoning_effort
+    routing_calls: Optional[Dict[str, dict]] = None  # what each "phase:role" actually ran with, and how often
+    time_budget: Optional[float] = None  # seconds per game
+    token_budget: Optional[int] = None
+    prompt_token_cap: Optional[int] = None  # estimated tokens; lowest-priority sections are trimmed to fit
+    session_mode: Optional[str] = None  # "local" / "responses": per-player conversations sending only new context
+    
+@dataclass
+class GameState:
+    game_id: str
+    config: GameConfig
+    players: List[Player]
+    missions: List[Mission]
+    winner: Optional[str]
+    assassin_phase: Optional[AssassinPhase]
+    belief_posteriors: Optional[List[BeliefSnapshot]] = None
+    effort_downgrades: Optional[List[EffortDowngrade]] = None
+    budget_spent: Optional[Dict[str, float]] = None
+    hedge_stats: Optional[Dict[str, int]] = None  # calls, hedged, hedge_won, wasted_tokens
+    prompt_sizes: Optional[List[PromptSize]] = None
+    session_stats: Optional[Dict] = None  # session mode: calls, delta_calls, rebuilds, fallbacks, full_tokens, sent_tokens, new_tokens
+
+
+@dataclass
+class PlayerReflection:
+    game_number: int
+    player_name: str
+    role_played: str
+    game_result: str
+    self_assessment: str
+    player_observations: Dict[str, str]
+    thinking_time: float
@@ -0,0 +1,174 @@
+import threading
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from prompts import Prompt, estimate_tokens
+
+# "responses": the provider keeps each player's conversation and each call sends only the new turn
+# with previous_response_id (Responses API). "local": the conversation is kept here and resent as chat
+# messages, so it saves money only through the provider's prefix cache (the history is append-only);
+# it is rebuilt whenever resending it would cost more than a fresh full prompt.
+SESSION_MODES = ("local", "responses")
+# Sections describing the current mission; a new quest section means they start over
+MISSION_SECTIONS = ("discussion", "proposed_team", "previous_proposals", "evil_discussion")
+
+
+def section_delta(prompt: Prompt, sent: Dict[str, str]) -> str:
+    """What a player has not seen yet: sections that changed since `sent` (name -> text last sent).
+
+    A section that only grew (discussion, mission history) contributes its header and the new lines;
+    a replaced one is sent whole; an unchanged one is left out. `sent` is updated in place.
+    """
+    parts = []
+    for name, text in prompt.sections:
+        previous = sent.get(name)
+        if previous == text:
+            continue
+        if name == "quest":
+            for stale in MISSION_SECTIONS:
+                sent.pop(stale, None)
+        if previous and text.startswith(previous) and previous.endswith("\n"):
+            header = next((line for line in previous.splitlines() if line.strip()), "")
+            parts.append(f"\n{header.strip().rstrip(':')} (continued):\n{text[len(previous):]}")
+        else:
+            parts.append(text)
+        sent[name] = text
+    return "".join(parts)
+
+
+class PlayerSession:
+    __slots__ = ("sent", "messages", "response_id", "history_tokens", "lock")
+
+    def __init__(self):
+        self.sent: Dict[str, str] = {}
+        self.messages: List[dict] = []
+        self.response_id: Optional[str] = None
+        self.history_tokens = 0
+        self.lock = threading.Lock()
+
+
+class SessionManager:
+    """One persistent conversation per player for a game; calls send only what changed since the
+    player's last turn.
+
+    A session starts with the full system prompt. It is rebuilt from scratch (a fresh conversation
+    carrying the full current context) when its history would outgrow `max_history_tokens`, in local
+    mode when the history to resend would be larger than the full prompt, and when a delta call
+    fails, e.g. an expired previous_response_id.
+    """
+
+    def __init__(self, client, mode: str = "local", max_history_tokens: Optional[int] = None):
+        if mode not in SESSION_MODES:
+            raise ValueError(f"Unknown session mode '{mode}' (choose from {', '.join(SESSION_MODES)})")
+        if mode == "responses" and not hasattr(client, "responses"):
+            print("Session mode 'responses' needs a client with the Responses API; keeping sessions locally")
+            mode = "local"
+        self.client = client
+        self.mode = mode
+        self.max_history_tokens = max_history_tokens
+        self.sessions: Dict[str, PlayerSession] = {}
+        self.lock = threading.Lock()
+        # sent_tokens: what the calls carried (in local mode the whole history each time);
+        # new_tokens: content the player had not been sent before (in local mode the rest is a
+        # repeated prefix the provider can serve from its cache)
+        self.stats = {"mode": mode, "calls": 0, "delta_calls": 0, "rebuilds": 0, "fallbacks": 0,
+                      "full_tokens": 0, "sent_tokens": 0, "new_tokens": 0}
+
+    def _session(self, player: str) -> PlayerSession:
+        with self.lock:
+            session = self.sessions.get(player)
+            if session is None:
+                session = self.sessions[player] = PlayerSession()
+            return session
+
+    def _count(self, **amounts):
+        with self.lock:
+            for key, amount in amounts.items():
+                self.stats[key] += amount
+
+    def create(self, player: str, prompt: Prompt, user_prompt: str, send: Callable, **request):
+        """Answer one call for `player`. `send(**request)` makes a chat completions call (hedged or not);
+        returns a chat-completions-shaped response and the estimated input tokens the call sent
+        (the new turn in responses mode, the whole resent history plus the new turn in local mode)."""
+        session = self._session(player)
+        full_tokens = estimate_tokens(prompt.render()) + estimate_tokens(user_prompt)
+        with session.lock:
+            if session.messages or session.response_id:
+                sent = dict(session.sent)
+                delta = section_delta(prompt, sent) + user_prompt
+                delta_tokens = estimate_tokens(delta)
+                over_cap = self.max_history_tokens and session.history_tokens + delta_tokens > self.max_history_tokens
+                # Local mode resends the history, so past the size of a fresh prompt it only costs more
+                outgrown = self.mode == "local" and session.history_tokens + delta_tokens > full_tokens
+                if over_cap or outgrown:
+                    self._count(rebuilds=1)
+                else:
+                    try:
+                        response = self._continue(session, delta, send, request)
+                    except Exception as e:
+                        print(f"Session call for {player} failed ({e!r}); rebuilding the full context")
+                        self._count(fallbacks=1)
+                    else:
+                        sent_tokens = delta_tokens if self.mode == "responses" else session.history_tokens + delta_tokens
+                        session.sent = sent
+                        session.history_tokens += delta_tokens + _completion_tokens(response)
+                        self._count(calls=1, delta_calls=1, full_tokens=full_tokens, sent_tokens=sent_tokens,
+                                    new_tokens=delta_tokens)
+                        return response, sent_tokens
+
+            # First turn, or a rebuild: a fresh conversation carrying the full current context
+            session.sent = {}
+            section_delta(prompt, session.sent)
+            session.messages = []
+            session.response_id = None
+            response = self._start(session, prompt.render(), user_prompt, send, request)
+            session.history_tokens = full_tokens + _completion_tokens(response)
+            self._count(calls=1, full_tokens=full_tokens, sent_tokens=full_tokens, new_tokens=full_tokens)
+            return response, full_tokens
+
+    def _start(self, session: PlayerSession, system_prompt: str, user_prompt: str, send: Callable, request: dict):
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+        if self.mode == "responses":
+            return self._respond(session, messages, None, request)
+        response = send(messages=messages, **request)
+        session.messages = messages + [{"role": "assistant", "content": response.choices[0].message.content}]
+        return response
+
+    def _continue(self, session: PlayerSession, delta: str, send: Callable, request: dict):
+        turn = [{"role": "user", "content": delta}]
+        if self.mode == "responses":
+            return self._respond(session, turn, session.response_id, request)
+        response = send(messages=session.messages + turn, **request)
+        session.messages = session.messages + turn + [{"role": "assistant", "content": response.choices[0].message.content}]
+        return response
+
+    def _respond(self, session: PlayerSession, turn: List[dict], previous_response_id: Optional[str], request: dict):
+        kwargs = dict(model=request["model"], input=turn)
+        if request.get("reasoning_effort"):
+            kwargs["reasoning"] = {"effort": request["reasoning_effort"]}
+        if previous_response_id:
+            kwargs["previous_response_id"] = previous_response_id
+        response = self.client.responses.create(**kwargs)
+        session.response_id = response.id
+        usage = getattr(response, "usage", None)
+        # Shaped like a chat completion so call_llm handles both modes the same way
+        return SimpleNamespace(
+            id=response.id,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=response.output_text))],
+            usage=SimpleNamespace(
+                prompt_tokens=getattr(usage, "input_tokens", 0) if usage else 0,
+                completion_tokens=getattr(usage, "output_tokens", 0) if usage else 0
+            )
+        )
+
+    def summary(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+        stats["players"] = len(self.sessions)
+        for key in ("sent", "new"):
+            stats[f"{key}_share"] = round(stats[f"{key}_tokens"] / stats["full_tokens"], 3) if stats["full_tokens"] else None
+        return stats
+
+
+def _completion_tokens(response) -> int:
+    return estimate_tokens(response.choices[0].message.content or "")
@@ -0,0 +1,352 @@
+import os
+import re
+import sys
+import time
+import sqlite3
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from dataset_loader import find_game_files, load_game
+from game_store import DEFAULT_DB
+
+FIELDS = ["content", "reasoning_content", "vote_comment", "proposal_reasoning", "observation"]
+SNIPPET_CHARS = 60
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS text_games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT UNIQUE NOT NULL,
+    collection TEXT NOT NULL,
+    game_number INTEGER,
+    game_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS text_docs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game INTEGER NOT NULL REFERENCES text_games(id),
+    mission_number INTEGER,
+    phase TEXT NOT NULL,
+    field TEXT NOT NULL,
+    speaker TEXT NOT NULL,
+    role TEXT,
+    is_good INTEGER,
+    subject TEXT,
+    subject_role TEXT,
+    subject_is_good INTEGER,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS text_terms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    term TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS text_postings (
+    term INTEGER NOT NULL REFERENCES text_terms(id),
+    doc INTEGER NOT NULL REFERENCES text_docs(id),
+    positions TEXT NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_text_docs_game ON text_docs(game);
+"""
+
+
+@dataclass
+class HitRecord:
+    source: str
+    game_id: str
+    mission_number: Optional[int]
+    phase: str
+    field: str
+    speaker: str
+    role: Optional[str]
+    subject: Optional[str]
+    subject_role: Optional[str]
+    count: int
+    snippet: str
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """'subtle "too quiet"' -> [["subtle"], ["too", "quiet"]]: every term and quoted phrase must match."""
+    clauses = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', query):
+        tokens = tokenize(phrase if phrase else word)
+        if tokens:
+            clauses.append(tokens)
+    return clauses
+
+
+def _team(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    if value not in ("good", "evil"):
+        raise ValueError(f"Unknown team '{value}' (choose 'good' or 'evil')")
+    return int(value == "good")
+
+
+class TextIndex:
+    """Positional inverted index over discussion, reasoning, vote comments and reflection observations.
+
+    Lives in SQLite next to the GameStore tables (same file by default) and is built incrementally:
+    games whose source is already indexed are skipped, so re-running an import only adds new tournaments.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        self.term_ids = dict(self.conn.execute("SELECT term, id FROM text_terms"))
+
+    def close(self):
+        self.conn.close()
+
+    def has_source(self, source: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM text_games WHERE source = ?", (source,)).fetchone() is not None
+
+    def _term_id(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = self.conn.execute("INSERT INTO text_terms (term) VALUES (?)", (term,)).lastrowid
+            self.term_ids[term] = term_id
+        return term_id
+
+    def _add_doc(self, game_pk: int, players: Dict[str, dict], mission_number: Optional[int], phase: str, field: str,
+                 speaker: str, text: Optional[str], subject: Optional[str] = None):
+        if not text:
+            return
+        speaker_info = players.get(speaker, {})
+        subject_info = players.get(subject, {}) if subject else {}
+        doc = self.conn.execute(
+            "INSERT INTO text_docs (game, mission_number, phase, field, speaker, role, is_good, subject, subject_role, "
+            "subject_is_good, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (game_pk, mission_number, phase, field, speaker, speaker_info.get("role"),
+             None if not speaker_info else int(speaker_info["is_good"]), subject, subject_info.get("role"),
+             None if not subject_info else int(subject_info["is_good"]), text)
+        ).lastrowid
+        positions = defaultdict(list)
+        for position, token in enumerate(tokenize(text)):
+            positions[token].append(position)
+        self.conn.executemany(
+            "INSERT INTO text_postings VALUES (?, ?, ?)",
+            [(self._term_id(term), doc, " ".join(map(str, offsets))) for term, offsets in positions.items()]
+        )
+
+    def add_game(self, game: dict, source: str, reflections: List[dict] = None, commit: bool = True) -> bool:
+        """Index one game dict (GameState layout). Returns False if the source was already indexed."""
+        if self.has_source(source):
+            return False
+
+        collection = os.path.dirname(source)
+        if os.path.basename(collection) == "individual_games":
+            collection = os.path.dirname(collection)
+        match = re.search(r"game_(\d+)\.json$", source)
+        game_pk = self.conn.execute(
+            "INSERT INTO text_games (source, collection, game_number, game_id) VALUES (?, ?, ?, ?)",
+            (source, collection, int(match.group(1)) if match else None, game["game_id"])
+        ).lastrowid
+        players = {p["name"]: p for p in game["players"]}
+
+        for mission in game["missions"]:
+            number = mission["mission_number"]
+            for message in mission["discussion"]:
+                self._add_doc(game_pk, players, number, message["phase"], "content", message["player"], message["content"])
+                self._add_doc(game_pk, players, number, message["phase"], "reasoning_content", message["player"],
+                              message.get("reasoning_content"))
+            for proposal in mission["proposals"]:
+                self._add_doc(game_pk, players, number, "proposal", "proposal_reasoning", proposal["leader"], proposal["reasoning"])
+                self._add_doc(game_pk, players, number, "proposal", "reasoning_content", proposal["leader"],
+                              proposal.get("reasoning_content"))
+                for vote in proposal["votes"]:
+                    self._add_doc(game_pk, players, number, "vote", "vote_comment", vote["player"], vote["comment"])
+                    self._add_doc(game_pk, players, number, "vote", "reasoning_content", vote["player"],
+                                  vote.get("reasoning_content"))
+
+        assassin_phase = game.get("assassin_phase")
+        if assassin_phase:
+            for message in assassin_phase["evil_discussion"]:
+                phase = message.get("phase", "evil_discussion")
+                self._add_doc(game_pk, players, None, phase, "content", message["player"], message["content"])
+                self._add_doc(game_pk, players, None, phase, "reasoning_content", message["player"], message.get("reasoning_content"))
+            self._add_doc(game_pk, players, None, "assassin", "reasoning_content", assassin_phase["assassin"],
+                          assassin_phase.get("reasoning_content"), subject=assassin_phase["guess"])
+
+        reflections = reflections if reflections is not None else game.get("post_game_reflections", [])
+        for reflection in reflections:
+            for subject, text in (reflection.get("player_observations") or {}).items():
+                self._add_doc(game_pk, players, None, "reflection", "observation", reflection["player_name"], text, subject=subject)
+
+        if commit:
+            self.conn.commit()
+        return True
+
+    def import_paths(self, paths: List[str]) -> int:
+        added = 0
+        for path in find_game_files(paths):
+            if self.has_source(path):
+                continue
+            if self.add_game(load_game(path), source=path, commit=False):
+                added += 1
+        self.conn.commit()
+        return added
+
+    def _postings(self, term: str, where: str, params: list) -> Dict[int, List[int]]:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return {}
+        rows = self.conn.execute(
+            "SELECT p.doc, p.positions FROM text_postings p JOIN text_docs d ON d.id = p.doc "
+            f"JOIN text_games g ON g.id = d.game WHERE p.term = ?{where}",
+            [term_id] + params
+        )
+        return {doc: [int(x) for x in positions.split()] for doc, positions in rows}
+
+    def search(self, query: str, role: str = None, team: str = None, speaker: str = None, subject: str = None,
+               subject_role: str = None, subject_team: str = None, field: str = None, phase: str = None,
+               collection: str = None, limit: int = None) -> List[HitRecord]:
+        """Documents containing every term and quoted phrase of `query`, e.g.
+        index.search('"too quiet"', subject="Bob", subject_team="good", field="observation")"""
+        if field is not None and field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}' (choose from {', '.join(FIELDS)})")
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+
+        filters = {"d.role": role, "d.is_good": _team(team), "d.speaker": speaker, "d.subject": subject,
+                   "d.subject_role": subject_role, "d.subject_is_good": _team(subject_team), "d.field": field,
+                   "d.phase": phase, "g.collection": collection}
+        where = "".join(f" AND {column} = ?" for column, value in filters.items() if value is not None)
+        params = [value for value in filters.values() if value is not None]
+
+        # Rarest terms first so the candidate set shrinks as fast as possible
+        postings = {term: self._postings(term, where, params) for term in {t for clause in clauses for t in clause}}
+        docs = None
+        for term in sorted(postings, key=lambda t: len(postings[t])):
+            docs = set(postings[term]) if docs is None else docs & postings[term].keys()
+            if not docs:
+                return []
+
+        counts = {}
+        for doc in docs:
+            occurrences = []
+            for clause in clauses:
+                starts = postings[clause[0]][doc]
+                for offset, term in enumerate(clause[1:], 1):
+                    following = set(postings[term][doc])
+                    starts = [s for s in starts if s + offset in following]
+                if not starts:
+                    break
+                occurrences.append(len(starts))
+            else:
+                counts[doc] = min(occurrences)
+
+        hits = []
+        for doc in sorted(counts)[:limit]:
+            row = self.conn.execute(
+                "SELECT g.source, g.game_id, d.mission_number, d.phase, d.field, d.speaker, d.role, d.subject, "
+                "d.subject_role, d.text FROM text_docs d JOIN text_games g ON g.id = d.game WHERE d.id = ?", (doc,)
+            ).fetchone()
+            hits.append(HitRecord(*row[:9], count=counts[doc], snippet=_snippet(row[9], clauses[0])))
+        return hits
+
+    def counts(self, query: str, by: str = "subject", **filters) -> Dict[str, int]:
+        """Term frequency: occurrences of `query` per speaker/subject/role/..., summed over matching documents,
+        e.g. counts("subtle", by="subject", field="observation")"""
+        if by not in ("speaker", "role", "subject", "subject_role", "field", "phase", "game_id", "source"):
+            raise ValueError(f"Cannot group by '{by}'")
+        totals = Counter()
+        for hit in self.search(query, **filters):
+            totals[getattr(hit, by)] += hit.count
+        return dict(totals.most_common())
+
+    def stats(self) -> dict:
+        return {
+            "games": self.conn.execute("SELECT COUNT(*) FROM text_games").fetchone()[0],
+            "documents": self.conn.execute("SELECT COUNT(*) FROM text_docs").fetchone()[0],
+            "terms": len(self.term_ids),
+            "postings": self.conn.execute("SELECT COUNT(*) FROM text_postings").fetchone()[0]
+        }
+
+
+def _snippet(text: str, clause: List[str]) -> str:
+    """Text around the first occurrence of the clause's first term."""
+    for match in TOKEN_RE.finditer(text.lower()):
+        if match.group() == clause[0]:
+            start = max(0, match.start() - SNIPPET_CHARS)
+            end = min(len(text), match.end() + SNIPPET_CHARS)
+            return ("..." if start else "") + text[start:end].replace("\n", " ") + ("..." if end < len(text) else "")
+    return text[:2 * SNIPPET_CHARS]
+
+
+def main():
+    """
+    python text_index.py build [paths...] [--db FILE]
+    python text_index.py search QUERY [--role R] [--team good|evil] [--speaker P] [--subject P]
+                         [--subject-role R] [--subject-team good|evil] [--field F] [--phase P] [--limit N] [--db FILE]
+    python text_index.py count QUERY --by subject|speaker|role|subject_role|field|phase [filters...] [--db FILE]
+
+    Example: python text_index.py count subtle --by subject --field observation
+             python text_index.py search '"too quiet"' --subject Bob --subject-team good
+    Fields: content, reasoning_content, vote_comment, proposal_reasoning, observation
+    """
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return
+
+    command = sys.argv[1]
+    db_path = DEFAULT_DB
+    positional = []
+    filters = {}
+
+    args = sys.argv[2:]
+    i = 0
+    while i < len(args):
+        if args[i] == "--db" and i + 1 < len(args):
+            db_path = args[i + 1]
+            i += 2
+        elif args[i].startswith("--") and i + 1 < len(args):
+            value = args[i + 1]
+            filters[args[i][2:].replace("-", "_")] = int(value) if value.isdigit() else value
+            i += 2
+        else:
+            positional.append(args[i])
+            i += 1
+
+    index = TextIndex(db_path)
+
+    if command == "build":
+        paths = positional or [os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset")]
+        start_time = time.time()
+        added = index.import_paths(paths)
+        stats = index.stats()
+        print(f"Indexed {added} new games into {db_path} ({time.time() - start_time:.2f}s): "
+              f"{stats['games']} games, {stats['documents']} documents, {stats['terms']} terms")
+    elif command in ("search", "count") and positional:
+        query = " ".join(positional)
+        start_time = time.time()
+        if command == "search":
+            hits = index.search(query, **filters)
+            elapsed = time.time() - start_time
+            for hit in hits:
+                about = f" about {hit.subject}" if hit.subject else ""
+                # Reflections and the assassin phase belong to no mission
+                mission = f" m{hit.mission_number}" if hit.mission_number is not None else ""
+                print(f"{hit.source}{mission} {hit.phase}/{hit.field} {hit.speaker} ({hit.role}){about}: {hit.snippet}")
+            print(f"\n{len(hits)} hits ({elapsed * 1000:.1f} ms)")
+        else:
+            counts = index.counts(query, **filters)
+            elapsed = time.time() - start_time
+            for key, count in counts.items():
+                print(f"  {key}: {count}")
+            print(f"\n{sum(counts.values())} occurrences ({elapsed * 1000:.1f} ms)")
+    else:
+        print(main.__doc__)
+
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
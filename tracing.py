@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import time
+import functools
+import threading
+from typing import Dict, List
+
+# Span names that make up a game's critical path, and the leaf work done inside them
+PHASES = ["discussion", "proposal", "vote", "mission_action", "assassin", "reflection", "save"]
+KINDS = ["prompt", "llm", "parse"]
+
+_enabled = False
+_events: List[dict] = []
+_origin_ns = time.perf_counter_ns()
+_pid = os.getpid()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        # list.append is atomic, so worker threads (simultaneous discussion) can record freely
+        _events.append({
+            "name": self.name,
+            "ph": "X",
+            "ts": (self.start - _origin_ns) / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": _pid,
+            "tid": threading.get_ident(),
+            "args": self.args
+        })
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **args):
+    """Context manager timing a block. Returns a shared no-op object when tracing is off."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name, args)
+
+
+def traced(name: str):
+    """Decorator form of span() for engine methods."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def export(filename: str):
+    """Write recorded spans as a Chrome trace (open in chrome://tracing or ui.perfetto.dev)."""
+    with open(filename, 'w') as f:
+        json.dump({"traceEvents": list(_events), "displayTimeUnit": "ms"}, f)
+
+
+def breakdown(events: List[dict]) -> List[dict]:
+    """Per game span: wall time by phase, and within each phase the self time by leaf kind.
+
+    Only spans on the game's own thread count toward the critical path; time a phase spends
+    waiting on worker threads (simultaneous discussion) shows up as its 'other' time.
+    """
+    by_thread: Dict[int, List[dict]] = {}
+    for e in events:
+        by_thread.setdefault(e["tid"], []).append(e)
+
+    reports = []
+    for tid, thread_events in by_thread.items():
+        thread_events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        for game in (e for e in thread_events if e["name"] in ("game", "tournament")):
+            game_end = game["ts"] + game["dur"]
+            inside = [e for e in thread_events if e is not game and game["ts"] <= e["ts"] and e["ts"] + e["dur"] <= game_end]
+
+            phases = {phase: {"wall": 0.0, **{kind: 0.0 for kind in KINDS}, "other": 0.0} for phase in PHASES}
+            phases["untracked"] = {"wall": 0.0, **{kind: 0.0 for kind in KINDS}, "other": 0.0}
+
+            # Walk the span tree with a stack to get self times and the enclosing phase
+            stack = []
+            for e in inside + [None]:
+                while stack and (e is None or e["ts"] >= stack[-1]["end"]):
+                    done = stack.pop()
+                    self_time = done["event"]["dur"] - done["children"]
+                    kind = done["event"]["name"] if done["event"]["name"] in KINDS else "other"
+                    phases[done["phase"]][kind] += self_time
+                if e is None:
+                    break
+                parent_phase = stack[-1]["phase"] if stack else "untracked"
+                phase = e["name"] if e["name"] in PHASES else parent_phase
+                if stack:
+                    stack[-1]["children"] += e["dur"]
+                if e["name"] in PHASES and parent_phase == "untracked":
+                    phases[phase]["wall"] += e["dur"]
+                stack.append({"event": e, "end": e["ts"] + e["dur"], "children": 0.0, "phase": phase})
+
+            tracked = sum(p["wall"] for p in phases.values())
+            phases["untracked"]["wall"] = game["dur"] - tracked
+            reports.append({
+                "span": game["name"],
+                "label": game["args"].get("label", ""),
+                "wall": game["dur"],
+                "phases": {k: v for k, v in phases.items() if v["wall"] > 0}
+            })
+    reports.sort(key=lambda r: (r["span"] != "tournament", r["label"]))
+    return reports
+
+
+def format_report(reports: List[dict]) -> str:
+    lines = []
+    for report in reports:
+        lines.append(f"{report['span'].upper()} {report['label']}: {report['wall'] / 1e6:.2f}s wall")
+        lines.append(f"  {'phase':<16}{'wall(s)':>9}{'%':>7}" + "".join(f"{k + '(s)':>10}" for k in KINDS + ["other"]))
+        for phase, stats in sorted(report["phases"].items(), key=lambda kv: -kv[1]["wall"]):
+            share = stats["wall"] / report["wall"] * 100 if report["wall"] else 0.0
+            lines.append(
+                f"  {phase:<16}{stats['wall'] / 1e6:>9.2f}{share:>6.1f}%"
+                + "".join(f"{stats[k] / 1e6:>10.3f}" for k in KINDS + ["other"])
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_report(filename: str):
+    """Export the trace to `filename` and a wall-time breakdown next to it (.summary.txt)."""
+    export(filename)
+    report = format_report(breakdown(_events))
+    summary_file = os.path.splitext(filename)[0] + ".summary.txt"
+    with open(summary_file, 'w') as f:
+        f.write(report)
+    print(f"\n⏱️  Trace saved to: {filename}")
+    print(report)
+
+
+def main():
+    """Summarize an exported trace: python tracing.py trace.json"""
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return
+    with open(sys.argv[1]) as f:
+        events = json.load(f)["traceEvents"]
+    print(format_report(breakdown(events)))
+
+
+if __name__ == "__main__":
+    main()
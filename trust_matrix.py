@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+from dataset_loader import find_game_files, load_game
+
+# Entry [i, j] of each matrix; the diagonal holds player i's own total where noted
+COUNTS = {
+    "same_side": "games i and j played on the same team (diagonal: games played)",
+    "same_side_wins": "games i and j won together",
+    "evil_together": "games i and j were both evil (diagonal: games i was evil)",
+    "missions_together": "missions i and j were both sent on (diagonal: missions i went on)",
+    "failed_together": "missions i and j were both sent on that failed",
+    "evil_missions": "missions i went on while evil with j on the team (diagonal: missions i went on while evil)",
+    "fails_played": "FAIL cards i played on a team with j (diagonal: FAIL cards i played)",
+    "votes_on_evil": "votes good player i cast on a proposal that included evil player j",
+    "approved_evil": "approvals good player i gave a proposal that included evil player j",
+    "assassin_guesses": "times assassin i named j as Merlin",
+}
+
+
+class TrustMatrix:
+    """Player-by-player reputation counts over a tournament, updated from each finished game's
+    revealed roles in O(players^2) per mission and proposal (at most 5 and 25 per game)."""
+
+    def __init__(self, players: List[str]):
+        self.players = list(players)
+        self.index = {name: i for i, name in enumerate(self.players)}
+        self.games = 0
+        size = len(self.players)
+        self.counts: Dict[str, np.ndarray] = {name: np.zeros((size, size), dtype=np.int32) for name in COUNTS}
+
+    def _mask(self, names) -> np.ndarray:
+        mask = np.zeros(len(self.players), dtype=bool)
+        # Proposals can name players that do not exist (LLM output); those are skipped
+        mask[[self.index[n] for n in names if n in self.index]] = True
+        return mask
+
+    def update(self, game_state):
+        """Add one finished GameState."""
+        c = self.counts
+        good = self._mask(p.name for p in game_state.players if p.is_good)
+        evil = self._mask(p.name for p in game_state.players if not p.is_good)
+        won = good if game_state.winner == "good" else evil
+
+        same = np.outer(good, good) | np.outer(evil, evil)
+        c["same_side"] += same
+        c["same_side_wins"] += same & np.outer(won, won)
+        c["evil_together"] += np.outer(evil, evil)
+
+        for mission in game_state.missions:
+            for proposal in mission.proposals:
+                evil_in_team = self._mask(proposal.team_members) & evil
+                if evil_in_team.any() and proposal.votes:
+                    voted = self._mask(v.player for v in proposal.votes) & good
+                    approved = self._mask(v.player for v in proposal.votes if v.vote == "approve") & good
+                    c["votes_on_evil"] += np.outer(voted, evil_in_team)
+                    c["approved_evil"] += np.outer(approved, evil_in_team)
+
+            if not mission.mission_result:
+                continue
+            team = self._mask(mission.proposals[mission.final_team_index].team_members)
+            c["missions_together"] += np.outer(team, team)
+            if mission.mission_result == "fail":
+                c["failed_together"] += np.outer(team, team)
+            c["evil_missions"] += np.outer(team & evil, team)
+            fails = self._mask(a.player for a in mission.quest_actions or [] if a.action == "fail")
+            c["fails_played"] += np.outer(fails, team)
+
+        assassin = game_state.assassin_phase
+        if assassin and assassin.assassin in self.index and assassin.guess in self.index:
+            c["assassin_guesses"][self.index[assassin.assassin], self.index[assassin.guess]] += 1
+        self.games += 1
+
+    def summary(self) -> Dict[str, dict]:
+        """Per player: games, evil games, FAIL cards / missions while evil, good players' approvals /
+        votes on teams they were on while evil, and times the assassin picked them."""
+        c = self.counts
+        return {
+            name: {
+                "games": int(c["same_side"][i, i]),
+                "evil_games": int(c["evil_together"][i, i]),
+                "evil_missions": int(c["evil_missions"][i, i]),
+                "fails_played": int(c["fails_played"][i, i]),
+                "good_votes_while_evil": int(c["votes_on_evil"][:, i].sum()),
+                "good_approvals_while_evil": int(c["approved_evil"][:, i].sum()),
+                "assassin_guesses": int(c["assassin_guesses"][:, i].sum())
+            }
+            for i, name in enumerate(self.players)
+        }
+
+    def render(self, viewer: str) -> str:
+        """Compact prompt block: one line per other player, plus the viewer's record alongside them."""
+        if not self.games:
+            return ""
+        v = self.index.get(viewer)
+        lines = [
+            f"\n=== TRACK RECORD ({self.games} previous games, roles revealed afterwards) ===\n",
+            "evil = games evil/played; fails = FAIL cards/missions while evil; approvals = good players' "
+            "approvals/votes for teams they were on while evil; same side = wins-losses with you; "
+            "guessed = times the Assassin named them as Merlin\n"
+        ]
+        c = self.counts
+        for name, stats in self.summary().items():
+            if name == viewer or not stats["games"]:
+                continue
+            line = f"  {name}: evil {stats['evil_games']}/{stats['games']}"
+            if stats["evil_missions"]:
+                line += f", fails {stats['fails_played']}/{stats['evil_missions']}"
+            if stats["good_votes_while_evil"]:
+                line += f", approvals {stats['good_approvals_while_evil']}/{stats['good_votes_while_evil']}"
+            if v is not None:
+                j = self.index[name]
+                wins = int(c["same_side_wins"][v, j])
+                line += f", same side {wins}-{int(c['same_side'][v, j]) - wins}"
+            if stats["assassin_guesses"]:
+                line += f", guessed {stats['assassin_guesses']}"
+            lines.append(line + "\n")
+        lines.append("=== END OF TRACK RECORD ===\n\n")
+        return "".join(lines)
+
+    def to_dict(self) -> dict:
+        return {"players": self.players, "games": self.games,
+                "counts": {name: matrix.tolist() for name, matrix in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TrustMatrix":
+        matrix = cls(data["players"])
+        matrix.games = data["games"]
+        for name, values in data["counts"].items():
+            if name in matrix.counts:
+                matrix.counts[name] = np.array(values, dtype=np.int32)
+        return matrix
+
+
+def build(paths: List[str]) -> Dict[str, TrustMatrix]:
+    """One matrix per tournament folder, replaying its game files in game order."""
+    from codec import decode_game
+    from analytics import game_number_of, tournament_of
+
+    by_tournament = defaultdict(list)
+    for path in find_game_files(paths):
+        if game_number_of(path) is not None:
+            by_tournament[tournament_of(path)].append(path)
+
+    matrices = {}
+    for tournament, files in sorted(by_tournament.items()):
+        matrix = None
+        for path in sorted(files, key=game_number_of):
+            game_state, _ = decode_game(load_game(path))
+            if matrix is None:
+                matrix = TrustMatrix([p.name for p in game_state.players])
+            matrix.update(game_state)
+        matrices[tournament] = matrix
+    return matrices
+
+
+def main():
+    """
+    python trust_matrix.py [paths...] [--output trust.json]
+
+    Rebuilds the per-tournament trust matrix (see COUNTS) from game files and prints each
+    player's record. Tournaments run with --trust-matrix keep it up to date in trust_matrix.json.
+    """
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(main.__doc__)
+        return
+
+    paths = []
+    output_file = None
+    i = 0
+    while i < len(args):
+        if args[i] == "--output" and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 2
+        else:
+            paths.append(args[i])
+            i += 1
+    if not paths:
+        paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset")]
+
+    matrices = build(paths)
+    for tournament, matrix in matrices.items():
+        print(f"{os.path.relpath(tournament)} ({matrix.games} games)")
+        for name, stats in matrix.summary().items():
+            print(f"  {name:<8} evil {stats['evil_games']:>2}/{stats['games']:<2}  fails {stats['fails_played']:>2}/{stats['evil_missions']:<2}"
+                  f"  approvals while evil {stats['good_approvals_while_evil']:>3}/{stats['good_votes_while_evil']:<3}"
+                  f"  guessed {stats['assassin_guesses']}")
+        print()
+
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump({tournament: matrix.to_dict() for tournament, matrix in matrices.items()}, f)
+        print(f"📁 Matrices saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()